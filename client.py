@@ -0,0 +1,95 @@
+"""
+This module sends describe, predict and accuracy requests to the `serve.py` daemon.
+
+It only imports the standard library, so that each request starts in a
+fraction of the time the scripts take to import NumPy and pandas.
+"""
+
+import argparse
+import csv
+import os
+import sys
+
+from dslr.client import ServerError, request, socket_path
+
+
+MODELS = ['batch', 'stochastic', 'minibatch', 'sharded', 'newton', 'lbfgs']
+
+
+def save_houses(index: list, houses: list) -> None:
+    """
+    Save predictions to `houses.csv`, like `Parser.save_houses`.
+
+    Args:
+        index (list): The index of each prediction.
+        houses (list): The predicted houses.
+    """
+
+    with open('houses.csv', 'w', encoding='utf-8', newline='') as file:
+        writer = csv.writer(file, lineterminator='\n')
+        writer.writerow(['Index', 'Hogwarts House'])
+        writer.writerows(zip(index, houses))
+
+
+def main() -> None:
+    """
+    The main function to send a request to the daemon.
+    """
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--socket', type=str, default=socket_path(),
+                        help='The path of the Unix socket of the daemon')
+
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    describe = commands.add_parser('describe', help='Describe a dataset')
+    describe.add_argument('file', type=str, help='Path to the dataset file')
+    describe.add_argument('--quantiles', type=str, choices=['exact', 'sketch'], default='exact',
+                          help='How the percentiles are calculated')
+    describe.add_argument('--unique', type=str, choices=['exact', 'sketch'], default='exact',
+                          help='How the number of unique values is calculated')
+    describe.add_argument('--by', type=str, help='The column to group the statistics by')
+
+    for name, description in [('predict', 'Predict the houses of a dataset to houses.csv'),
+                              ('accuracy', 'Compute the accuracy of a model on a dataset')]:
+        command = commands.add_parser(name, help=description)
+        command.add_argument('file', type=str, help='Path to the dataset file')
+        command.add_argument('model_path', type=str, help='The path to the model file')
+        command.add_argument('--model', type=str, choices=MODELS, default='batch',
+                             help='The model used')
+
+    commands.add_parser('stats', help='Describe the datasets and models in memory')
+    commands.add_parser('stop', help='Stop the daemon')
+
+    args = parser.parse_args()
+    arguments = {}
+
+    if args.command in ['describe', 'predict', 'accuracy']:
+        arguments['dataset'] = os.path.abspath(args.file)
+
+    if args.command == 'describe':
+        arguments.update(quantiles=args.quantiles, unique=args.unique, by=args.by)
+
+    if args.command in ['predict', 'accuracy']:
+        arguments.update(model=os.path.abspath(args.model_path), model_type=args.model)
+
+    try:
+        response = request(args.command, args.socket, **arguments)
+    except ServerError as e:
+        print(f'Error: {e}', file=sys.stderr)
+        sys.exit(1)
+
+    match args.command:
+        case 'describe':
+            print(response['output'])
+        case 'predict':
+            save_houses(response['index'], response['houses'])
+        case 'accuracy':
+            print(f'Accuracy: {response["accuracy"]:.4f}')
+        case 'stats':
+            for key, value in response.items():
+                print(f'{key}: {value}')
+
+
+if __name__ == '__main__':
+    main()
@@ -2,20 +2,35 @@
 This module contains the describe implementation.
 """
 
+import logging
+import sys
+from typing import Dict, Iterable
+
 import pandas as pd
 import numpy as np
 
 from dslr.parser import Parser
 from dslr.math import (
-    ft_len,
-    ft_min,
-    ft_max,
-    ft_mean,
-    ft_variance,
-    ft_percentile,
-    ft_std,
-    ft_unique
+    StatisticsAccumulator,
+    ft_grouped_statistics,
+    ft_parallel_statistics,
+    percentile_label
 )
+from dslr.sketch import HLL_PRECISION, SKETCH_SIZE
+
+
+PERCENTILES = [.25, .50, .75]
+
+STATISTICS = [
+    'count',
+    'mean',
+    'std',
+    'min',
+    *[percentile_label(percentile) for percentile in PERCENTILES],
+    'max',
+    'unique',
+    'variance',
+]
 
 
 def format_df(df: pd.Series) -> pd.Series:
@@ -32,12 +47,45 @@ def format_df(df: pd.Series) -> pd.Series:
     return df.map(lambda x: f"{x:.6f}")
 
 
-def describe(df: pd.DataFrame) -> pd.DataFrame:
+def format_statistics(statistics: Dict[str, np.ndarray], columns: pd.Index) -> pd.DataFrame:
+    """
+    Arrange the statistics in a formatted DataFrame.
+
+    Args:
+        statistics (Dict[str, np.ndarray]): The statistics of each column.
+        columns (pd.Index): The names of the columns.
+
+    Returns:
+        pd.DataFrame: The descriptive statistics, in the order of `STATISTICS`.
+    """
+
+    names = [name for name in STATISTICS if name in statistics]
+
+    df = pd.DataFrame(
+        [statistics[name] for name in names],
+        index=pd.Index(names),
+        columns=columns
+    )
+
+    return df.apply(format_df)
+
+
+def describe(
+    df: pd.DataFrame,
+    sketch_size: int | None = None,
+    unique_precision: int | None = None,
+    jobs: int = 1
+) -> pd.DataFrame:
     """
     Calculate descriptive statistics for the dataset.
 
     Args:
         df (pd.DataFrame): The dataset.
+        sketch_size (int | None): If set, the percentiles are estimated
+            with quantile sketches of this size.
+        unique_precision (int | None): If set, the number of unique values is
+            estimated with HyperLogLogs of this precision.
+        jobs (int): The number of worker processes the columns are spread across.
 
     Returns:
         pd.DataFrame: The descriptive statistics.
@@ -47,44 +95,146 @@ def describe(df: pd.DataFrame) -> pd.DataFrame:
     if df.empty:
         return pd.DataFrame()
 
-    df = df.agg([
-        ft_len,
-        ft_mean,
-        ft_std,
-        ft_min,
-        lambda x: ft_percentile(x, .25),
-        lambda x: ft_percentile(x, .50),
-        lambda x: ft_percentile(x, .75),
-        ft_max,
-        ft_unique,
-        ft_variance,
-    ], axis=0)
-
-    df.index = pd.Index([
-        'count',
-        'mean',
-        'std',
-        'min',
-        '25%',
-        '50%',
-        '75%',
-        'max',
-        'unique',
-        'variance',
-    ])
+    statistics = ft_parallel_statistics(
+        df.to_numpy(dtype=np.float64),
+        jobs,
+        percentiles=PERCENTILES,
+        unique=True,
+        sketch_size=sketch_size,
+        unique_precision=unique_precision
+    )
+    return format_statistics(statistics, df.columns)
+
+
+def describe_grouped(df: pd.DataFrame, by: str) -> pd.DataFrame:
+    """
+    Calculate descriptive statistics for every group of the dataset.
+
+    Args:
+        df (pd.DataFrame): The dataset.
+        by (str): The column to group the rows by (e.g. `Hogwarts House`).
+            Rows with a missing value are ignored.
+
+    Returns:
+        pd.DataFrame: The descriptive statistics, with one row per
+            (group, feature) pair and one column per statistic.
+    """
+
+    groups, labels = pd.factorize(df[by], sort=True)
+
+    df = df.select_dtypes(include=np.number).drop(columns=by, errors='ignore')
+    if df.empty or labels.empty:
+        return pd.DataFrame()
+
+    statistics = ft_grouped_statistics(
+        df.to_numpy(dtype=np.float64),
+        groups,
+        PERCENTILES,
+        unique=True
+    )
+
+    names = [name for name in STATISTICS if name in statistics]
+
+    df = pd.DataFrame(
+        {name: statistics[name].ravel() for name in names},
+        index=pd.MultiIndex.from_product([labels, df.columns], names=[by, 'Feature'])
+    )
 
     return df.apply(format_df)
 
 
+def describe_chunks(
+    chunks: Iterable[pd.DataFrame],
+    sketch_size: int | None = None,
+    unique_precision: int | None = None
+) -> pd.DataFrame:
+    """
+    Calculate descriptive statistics for a dataset read in chunks.
+
+    Only one chunk is held in memory at a time: each one is folded into
+    a `StatisticsAccumulator`. The numeric columns are the ones of the first chunk.
+
+    Args:
+        chunks (Iterable[pd.DataFrame]): The chunks of the dataset.
+        sketch_size (int | None): If set, the percentiles are estimated
+            with quantile sketches of this size. Otherwise they are not reported.
+        unique_precision (int | None): If set, the number of unique values is
+            estimated with HyperLogLogs of this precision. Otherwise it is not reported.
+
+    Returns:
+        pd.DataFrame: The descriptive statistics.
+    """
+
+    columns = None
+    accumulator = None
+
+    for chunk in chunks:
+        if columns is None:
+            columns = chunk.select_dtypes(include=np.number).columns
+            accumulator = StatisticsAccumulator(
+                len(columns),
+                PERCENTILES if sketch_size else (),
+                sketch_size or SKETCH_SIZE,
+                unique_precision is not None,
+                unique_precision or HLL_PRECISION
+            )
+
+        accumulator.update(chunk[columns].to_numpy(dtype=np.float64)) # type: ignore
+
+    if columns is None or columns.empty:
+        return pd.DataFrame()
+
+    return format_statistics(accumulator.statistics(), columns) # type: ignore
+
+
 def main() -> None:
     """
     The main function of the describe module.
     """
 
-    df = Parser().read_dataset()
+    parser = Parser()
+    parser.add_arg('--chunksize', int, 'Read the dataset in chunks of this many rows',
+                   required=False)
+    parser.add_arg('--quantiles', str, 'How the percentiles are calculated',
+                   required=False, choices=['exact', 'sketch'], default='exact')
+    parser.add_arg('--unique', str, 'How the number of unique values is calculated',
+                   required=False, choices=['exact', 'sketch'], default='exact')
+    parser.add_arg('--jobs', int, 'The number of worker processes', required=False, default=1)
+    parser.add_arg('--by', str, 'The column to group the statistics by', required=False)
+
+    chunksize = parser.read_arg('chunksize')
+    sketch_size = SKETCH_SIZE if parser.read_arg('quantiles') == 'sketch' else None
+    unique_precision = HLL_PRECISION if parser.read_arg('unique') == 'sketch' else None
+    jobs = parser.read_arg('jobs')
+    by = parser.read_arg('by')
+
+    if chunksize and by:
+        logging.error('`--by` cannot be used with `--chunksize`.')
+        sys.exit(1)
+
+    if jobs != 1 and (chunksize or by):
+        logging.error('`--jobs` cannot be used with `--chunksize` or `--by`.')
+        sys.exit(1)
+
+    if chunksize:
+        chunks = parser.read_dataset_chunks(chunksize)
+
+        print('Our Describe')
+        print(describe_chunks(chunks, sketch_size, unique_precision))
+        return
+
+    df = parser.read_dataset()
+
+    if by:
+        if by not in df.columns:
+            logging.error('`%s` is not a valid column.', by)
+            sys.exit(1)
+
+        print(describe_grouped(df, by))
+        return
 
     print('Our Describe')
-    print(f'{describe(df)}\n')
+    print(f'{describe(df, sketch_size, unique_precision, jobs)}\n')
 
     print('Pandas\' Describe')
     print(df.describe())
@@ -0,0 +1,243 @@
+"""
+This module coalesces concurrent single-row predictions into micro-batches.
+
+Scoring one row costs about as much as scoring a few dozen, since most of the
+time goes to the overhead around the matrix multiplication. Rows waiting to be
+scored are therefore collected until the batch is full or the oldest row has
+waited long enough, and the whole batch is scored with one `predict_batch`.
+"""
+
+import asyncio
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+
+from dslr.model.ovr import OvrClassifier
+
+
+LATENCY_WINDOW = 100_000
+
+
+class LatencyStats:
+    """
+    This class records the latency of the latest requests, and the size of every batch.
+
+    Attributes:
+        latencies (np.ndarray): The latency of the latest requests, in seconds.
+        batch_sizes (np.ndarray): The number of batches of each size, indexed by size.
+        count (int): The number of requests recorded.
+    """
+
+    latencies: np.ndarray
+    batch_sizes: np.ndarray
+    count: int
+
+
+    def __init__(self, max_batch_size: int, window: int = LATENCY_WINDOW) -> None:
+        """
+        Initialize empty statistics.
+
+        Args:
+            max_batch_size (int): The size of the largest batch.
+            window (int): The number of latest requests the percentiles are computed on.
+        """
+
+        self.latencies = np.zeros(window)
+        self.batch_sizes = np.zeros(max_batch_size + 1, dtype=np.int64)
+        self.count = 0
+
+
+    def add_latency(self, seconds: float) -> None:
+        """
+        Record the latency of a request.
+
+        Args:
+            seconds (float): The latency of the request.
+        """
+
+        self.latencies[self.count % len(self.latencies)] = seconds
+        self.count += 1
+
+
+    def add_batch(self, size: int) -> None:
+        """
+        Record the size of a batch.
+
+        Args:
+            size (int): The number of rows of the batch.
+        """
+
+        self.batch_sizes[size] += 1
+
+
+    def summary(self) -> Dict[str, Any]:
+        """
+        Summarize the statistics.
+
+        Returns:
+            Dict[str, Any]: The number of requests, the percentiles of their latency
+                in milliseconds, and the number of batches of each size.
+        """
+
+        latencies = self.latencies[:min(self.count, len(self.latencies))] * 1000
+        percentiles = np.percentile(latencies, [50, 90, 99]) if len(latencies) else [np.nan] * 3
+
+        return {
+            'requests': self.count,
+            'batches': int(self.batch_sizes.sum()),
+            'latency_ms': {
+                'p50': float(percentiles[0]),
+                'p90': float(percentiles[1]),
+                'p99': float(percentiles[2]),
+                'max': float(latencies.max()) if len(latencies) else float('nan'),
+            },
+            'batch_sizes': {
+                str(size): int(count) for size, count in enumerate(self.batch_sizes) if count
+            },
+        }
+
+
+class MicroBatcher:
+    """
+    This class scores rows submitted one at a time in micro-batches.
+
+    Attributes:
+        ovr (OvrClassifier): The classifier the rows are scored with.
+        max_batch_size (int): The largest number of rows scored at once.
+        max_wait (float): The longest time a row waits for other rows, in seconds.
+        stats (LatencyStats): The latency of the requests, and the size of every batch scored.
+    """
+
+    ovr: OvrClassifier
+    max_batch_size: int
+    max_wait: float
+    stats: LatencyStats
+
+
+    def __init__(self, ovr: OvrClassifier, max_batch_size: int, max_wait: float) -> None:
+        """
+        Initialize the batcher, which must be started from the event loop before rows are submitted.
+
+        Args:
+            ovr (OvrClassifier): The classifier the rows are scored with.
+            max_batch_size (int): The largest number of rows scored at once.
+            max_wait (float): The longest time a row waits for other rows, in seconds.
+
+        Raises:
+            ValueError: If the batches have no rows, or the rows do not wait.
+        """
+
+        if max_batch_size < 1:
+            raise ValueError(f'The batches must have at least 1 row, not {max_batch_size}.')
+
+        if max_wait <= 0:
+            raise ValueError(f'The rows must wait for a positive time, not {max_wait}.')
+
+        self.ovr = ovr
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self.stats = LatencyStats(max_batch_size)
+
+        self._queue: asyncio.Queue[Tuple[np.ndarray, asyncio.Future]] | None = None
+        self._task: asyncio.Task | None = None
+
+
+    def start(self) -> None:
+        """
+        Start scoring the submitted rows.
+        """
+
+        self._queue = asyncio.Queue()
+        self._task = asyncio.create_task(self._run())
+
+
+    async def stop(self) -> None:
+        """
+        Stop scoring the submitted rows.
+        """
+
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+
+    async def predict(self, x: np.ndarray) -> np.ndarray:
+        """
+        Predict the probability of each class for one row.
+
+        Args:
+            x (np.ndarray): The input values of the row.
+
+        Returns:
+            np.ndarray: The probability of each class.
+
+        Raises:
+            RuntimeError: If the batcher stopped.
+        """
+
+        assert self._queue is not None, 'The batcher is not started.'
+
+        if self._task is None or self._task.done():
+            raise RuntimeError('The batcher stopped.')
+
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((x, future))
+
+        return await future
+
+
+    async def _run(self) -> None:
+        assert self._queue is not None
+
+        try:
+            while True:
+                batch = await self._collect(self._queue)
+
+                try:
+                    self.stats.add_batch(len(batch))
+                    probabilities = self.ovr.predict_batch(np.stack([x for x, _ in batch]))
+                # The error is sent to every request of the batch, and the next batches are scored.
+                # pylint: disable=broad-except
+                except Exception as e:
+                    for _, future in batch:
+                        if not future.done():
+                            future.set_exception(e)
+                    continue
+
+                for (_, future), row in zip(batch, probabilities):
+                    # The request may have been cancelled while it was waiting.
+                    if not future.done():
+                        future.set_result(row)
+        finally:
+            # The rows left in the queue would never be scored.
+            while not self._queue.empty():
+                _, future = self._queue.get_nowait()
+                if not future.done():
+                    future.set_exception(RuntimeError('The batcher stopped.'))
+
+
+    async def _collect(
+        self,
+        queue: asyncio.Queue[Tuple[np.ndarray, asyncio.Future]]
+    ) -> List[Tuple[np.ndarray, asyncio.Future]]:
+        batch = [await queue.get()]
+
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.max_wait
+
+        while len(batch) < self.max_batch_size:
+            if not queue.empty():
+                batch.append(queue.get_nowait())
+                continue
+
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+
+            try:
+                batch.append(await asyncio.wait_for(queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+
+        return batch
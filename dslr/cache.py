@@ -0,0 +1,393 @@
+"""
+This module contains a columnar binary cache of parsed datasets.
+
+The first time a CSV file is read, each column of the parsed frame is saved
+to its own `.npy` file. Later reads memory-map these files instead of parsing
+the CSV again, as long as the file has not changed since.
+
+It also contains the in-memory cache long-running processes keep their
+datasets and models in.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+import tempfile
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Any, BinaryIO, Callable, Dict, Hashable, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+CACHE_FORMAT_VERSION = 3
+CACHE_DIRECTORY_VARIABLE = 'DSLR_CACHE_DIR'
+HASH_CHUNK_SIZE = 1 << 20
+
+
+class LruCache:
+    """
+    This class implements an in-memory cache bounded by the size of its values.
+    Once it is full, the least recently used values are evicted first.
+
+    Attributes:
+        max_bytes (int): The total size of the values the cache may hold.
+        size (int): The total size of the values the cache holds.
+        hits (int): The number of values found in the cache.
+        misses (int): The number of values loaded.
+    """
+
+    max_bytes: int
+    size: int
+    hits: int
+    misses: int
+
+
+    def __init__(self, max_bytes: int) -> None:
+        """
+        Initialize an empty cache.
+
+        Args:
+            max_bytes (int): The total size of the values the cache may hold.
+        """
+
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+
+        self._entries: OrderedDict[Hashable, Tuple[Any, int]] = OrderedDict()
+        self._loading: Dict[Hashable, Future] = {}
+        self._lock = threading.Lock()
+
+
+    def get(self, key: Hashable, load: Callable[[], Tuple[Any, int]]) -> Any:
+        """
+        Get a value from the cache, loading it if it is not there.
+
+        Values larger than the cache are loaded every time they are asked for.
+
+        The value is loaded outside of the lock of the cache, so that other
+        values can be read meanwhile. A value asked for while it is being
+        loaded is waited for instead of being loaded twice.
+
+        Args:
+            key (Hashable): The key of the value.
+            load (Callable[[], Tuple[Any, int]]): The function loading the value,
+                which returns it with its size in bytes.
+
+        Returns:
+            Any: The value.
+        """
+
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key][0]
+
+            loading = self._loading.get(key)
+            if loading is None:
+                self.misses += 1
+                future: Future = Future()
+                self._loading[key] = future
+            else:
+                self.hits += 1
+
+        if loading is not None:
+            return loading.result()
+
+        try:
+            value, size = load()
+        except BaseException as e:
+            with self._lock:
+                del self._loading[key]
+            future.set_exception(e)
+            raise
+
+        with self._lock:
+            del self._loading[key]
+
+            if size <= self.max_bytes:
+                self._entries[key] = (value, size)
+                self.size += size
+
+                while self.size > self.max_bytes:
+                    _, (_, evicted) = self._entries.popitem(last=False)
+                    self.size -= evicted
+
+        future.set_result(value)
+        return value
+
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+def cache_directory() -> str:
+    """
+    Get the directory datasets are cached in: `$DSLR_CACHE_DIR`, or `~/.cache/dslr`.
+
+    Returns:
+        str: The path of the cache directory.
+    """
+
+    default = os.path.join(os.path.expanduser('~'), '.cache', 'dslr')
+    return os.environ.get(CACHE_DIRECTORY_VARIABLE, default)
+
+
+# pylint: disable=too-many-arguments,too-many-positional-arguments
+def read_csv_cached(
+    path: str,
+    refresh: bool = False,
+    directory: str | None = None,
+    columns: List[str] | None = None,
+    dtype: Dict[str, Any] | None = None
+) -> pd.DataFrame:
+    """
+    Read a CSV file with `pd.read_csv`, through the cache.
+
+    An entry is keyed by the path of the file, its size, its modification
+    time and the SHA-256 of its content. If the size or the modification time
+    changed, the content is hashed again: the entry is reused if the content
+    is the same, and rebuilt otherwise.
+
+    A file rewritten with the same size and modification time is not hashed
+    again, so its stale entry is reused. Modification times are kept to the
+    nanosecond, but a coarse file system clock or a restored timestamp can
+    hide a change: refresh the entry in that case.
+
+    An entry holds the columns of the file read so far, parsed with `dtype`.
+    Only the columns it does not hold yet are parsed, with `usecols`, and then
+    added to it. The returned frame is backed by the memory-mapped columns of
+    the entry, so it is read-only.
+
+    Args:
+        path (str): The path of the CSV file.
+        refresh (bool): Whether to rebuild the entry even if it is valid.
+        directory (str | None): The cache directory, `cache_directory()` by default.
+        columns (List[str] | None): The columns to read, every column by default.
+        dtype (Dict[str, Any] | None): The type of the columns, as accepted by `pd.read_csv`.
+
+    Returns:
+        pd.DataFrame: The dataset, with its columns in the order of the file.
+
+    Raises:
+        ValueError: If one of the columns is not in the file.
+    """
+
+    try:
+        stat = os.stat(path)
+    except OSError:
+        # Let pandas report why the file cannot be read.
+        return pd.read_csv(path, usecols=columns, dtype=dtype) # type: ignore
+
+    entry = _entry_path(path, directory, dtype)
+    meta = None if refresh else _read_meta(entry)
+    digest, df = None, None
+
+    if meta is not None and (meta['size'], meta['mtime']) != (stat.st_size, stat.st_mtime_ns):
+        digest = _hash_file(path)
+
+        if meta['sha256'] == digest:
+            meta.update(size=stat.st_size, mtime=stat.st_mtime_ns)
+            try:
+                _write_meta(entry, meta)
+            except OSError as e:
+                logging.warning('Could not update the cached dataset: %s', e)
+        else:
+            meta = None
+
+    if meta is None:
+        meta = {
+            'path': os.path.abspath(path),
+            'size': stat.st_size,
+            'mtime': stat.st_mtime_ns,
+            'sha256': digest or _hash_file(path),
+            'columns': [],
+        }
+
+        # Reading every column gives the header, otherwise it is read on its own.
+        if columns is None:
+            df = pd.read_csv(path, dtype=dtype) # type: ignore
+            meta['names'] = list(df.columns)
+        else:
+            meta['names'] = list(pd.read_csv(path, nrows=0).columns)
+
+    names = _select(meta['names'], meta['names'] if columns is None else columns)
+    cached = {column['name'] for column in meta['columns']}
+    missing = [name for name in names if name not in cached]
+
+    if missing:
+        if df is None:
+            df = pd.read_csv(path, usecols=missing, dtype=dtype) # type: ignore
+
+        try:
+            _save(entry, df, meta)
+        except OSError as e:
+            logging.warning('Could not cache the dataset: %s', e)
+
+            if len(missing) < len(names):
+                df = pd.concat([_load(entry, meta, [name for name in names if name in cached]), df],
+                               axis=1)
+            return df[names]
+
+    return _load(entry, meta, names)
+
+
+def clear_cache(path: str | None = None, directory: str | None = None) -> None:
+    """
+    Remove the cached entry of a file, or every cached entry.
+
+    Args:
+        path (str | None): The path of the CSV file, every file by default.
+        directory (str | None): The cache directory, `cache_directory()` by default.
+    """
+
+    directory = directory or cache_directory()
+    if path is None:
+        shutil.rmtree(directory, ignore_errors=True)
+        return
+
+    # A file has one entry per set of column types it was read with.
+    prefix = _entry_path(path, directory, None).rsplit('-', 1)[0]
+    for name in os.listdir(directory) if os.path.isdir(directory) else []:
+        entry = os.path.join(directory, name)
+        if entry.rsplit('-', 1)[0] == prefix:
+            shutil.rmtree(entry, ignore_errors=True)
+
+
+def _hash_file(path: str) -> str:
+    # Hash the file a chunk at a time, so that it is never held in memory twice.
+    digest = hashlib.sha256()
+    with open(path, 'rb') as file:
+        while chunk := file.read(HASH_CHUNK_SIZE):
+            digest.update(chunk)
+
+    return digest.hexdigest()
+
+
+def _entry_path(path: str, directory: str | None, dtype: Dict[str, Any] | None) -> str:
+    key = hashlib.sha256(os.path.abspath(path).encode()).hexdigest()[:32]
+
+    schema = json.dumps({str(name): repr(value) for name, value in (dtype or {}).items()},
+                        sort_keys=True)
+    schema_key = hashlib.sha256(schema.encode()).hexdigest()[:16]
+
+    return os.path.join(directory or cache_directory(), f'{key}-{schema_key}')
+
+
+def _select(names: List[str], columns: List[str]) -> List[str]:
+    missing = [column for column in columns if column not in names]
+    if missing:
+        raise ValueError(f'Usecols do not match columns, columns expected but not found: {missing}')
+
+    return [name for name in names if name in columns]
+
+
+def _read_meta(entry: str) -> Dict[str, Any] | None:
+    try:
+        with open(os.path.join(entry, 'meta.json'), 'r', encoding='utf-8') as file:
+            meta = json.load(file)
+    except (OSError, ValueError):
+        return None
+
+    return meta if meta.get('format') == CACHE_FORMAT_VERSION else None
+
+
+def _write_meta(entry: str, meta: Dict[str, Any]) -> None:
+    content = json.dumps({**meta, 'format': CACHE_FORMAT_VERSION}).encode()
+    _write_file(os.path.join(entry, 'meta.json'), lambda file: file.write(content))
+
+
+def _write_file(path: str, write: Callable[[BinaryIO], Any]) -> None:
+    # The file is written aside, then moved in place, so that it is never seen half written.
+    descriptor, staging = tempfile.mkstemp(dir=os.path.dirname(path))
+
+    try:
+        with os.fdopen(descriptor, 'wb') as file:
+            write(file)
+        os.replace(staging, path)
+    except BaseException:
+        os.unlink(staging)
+        raise
+
+
+def _save(entry: str, df: pd.DataFrame, meta: Dict[str, Any]) -> None:
+    # The columns are added to an entry before the metadata which lists them.
+    if meta['columns']:
+        _save_columns(entry, df, meta)
+        _write_meta(entry, meta)
+        return
+
+    parent = os.path.dirname(entry)
+    os.makedirs(parent, exist_ok=True)
+
+    # A new entry is written aside, then moved in place, so that it is never seen half written.
+    staging = tempfile.mkdtemp(dir=parent)
+
+    try:
+        _save_columns(staging, df, meta)
+        _write_meta(staging, meta)
+
+        shutil.rmtree(entry, ignore_errors=True)
+        os.replace(staging, entry)
+    except BaseException:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+
+
+def _save_columns(directory: str, df: pd.DataFrame, meta: Dict[str, Any]) -> None:
+    # Each column is saved under its position in the file.
+    for name, column in df.items():
+        index = meta['names'].index(name)
+        values = column.to_numpy()
+        description: Dict[str, Any] = {'name': name, 'index': index, 'kind': 'array'}
+
+        if isinstance(column.dtype, pd.CategoricalDtype):
+            values = column.cat.codes.to_numpy()
+            description.update(
+                kind='category',
+                categories=column.cat.categories.tolist(),
+                ordered=bool(column.cat.ordered)
+            )
+
+        elif values.dtype == object:
+            missing = column.isna().to_numpy()
+            _write_file(os.path.join(directory, f'{index}.mask.npy'),
+                        lambda file, missing=missing: np.save(file, missing))
+            values = np.where(missing, '', values).astype(str)
+            description.update(kind='object')
+
+        _write_file(os.path.join(directory, f'{index}.npy'),
+                    lambda file, values=values: np.save(file, values))
+        meta['columns'].append(description)
+
+
+def _load(entry: str, meta: Dict[str, Any], names: List[str]) -> pd.DataFrame:
+    descriptions = {column['name']: column for column in meta['columns']}
+
+    data = {}
+    for name in names:
+        column = descriptions[name]
+        # A plain view of the mapping, since indexing a memmap wraps every row in a new memmap.
+        values = np.asarray(np.load(os.path.join(entry, f"{column['index']}.npy"), mmap_mode='r'))
+
+        if column['kind'] == 'category':
+            categories = pd.CategoricalDtype(column['categories'], column['ordered'])
+            values = pd.Categorical.from_codes(values, dtype=categories)
+
+        # Text columns go back to Python strings, with NaN where values were missing.
+        if column['kind'] == 'object':
+            missing = np.load(os.path.join(entry, f"{column['index']}.mask.npy"))
+            values = values.astype(object)
+            values[missing] = np.nan
+
+        data[name] = values
+
+    # The numeric columns stay memory-mapped, instead of being copied into one block.
+    return pd.DataFrame(data, copy=False)
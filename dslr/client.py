@@ -0,0 +1,101 @@
+"""
+This module contains the protocol spoken with the `serve.py` daemon.
+
+Each connection to the Unix socket of the daemon carries one request and
+its response, both encoded as a single line of JSON. This module only uses
+the standard library, so that clients start without importing NumPy or pandas.
+"""
+
+import json
+import os
+import socket
+import tempfile
+from typing import Any, Dict
+
+
+SOCKET_VARIABLE = 'DSLR_SOCKET'
+
+
+class ServerError(Exception):
+    """
+    This exception is raised when the daemon could not answer a request.
+    """
+
+
+def socket_path() -> str:
+    """
+    Get the path of the socket of the daemon: `$DSLR_SOCKET`, or one per user
+    in the temporary directory.
+
+    Returns:
+        str: The path of the socket.
+    """
+
+    default = os.path.join(tempfile.gettempdir(), f'dslr-{os.getuid()}.sock')
+    return os.environ.get(SOCKET_VARIABLE, default)
+
+
+def send(connection: socket.socket, message: Dict[str, Any]) -> None:
+    """
+    Send a message over a connection.
+
+    Args:
+        connection (socket.socket): The connection.
+        message (Dict[str, Any]): The message.
+    """
+
+    connection.sendall(json.dumps(message).encode() + b'\n')
+
+
+def receive(connection: socket.socket) -> Dict[str, Any]:
+    """
+    Receive a message from a connection.
+
+    Args:
+        connection (socket.socket): The connection.
+
+    Returns:
+        Dict[str, Any]: The message.
+
+    Raises:
+        ServerError: If the connection was closed before a whole message was received.
+    """
+
+    with connection.makefile('rb') as file:
+        line = file.readline()
+
+    if not line.endswith(b'\n'):
+        raise ServerError('The connection was closed before the response was received.')
+
+    return json.loads(line)
+
+
+def request(command: str, path: str | None = None, **arguments: Any) -> Dict[str, Any]:
+    """
+    Send a request to the daemon, and wait for its response.
+
+    Args:
+        command (str): The command to run.
+        path (str | None): The path of the socket, `socket_path()` by default.
+        **arguments (Any): The arguments of the command.
+
+    Returns:
+        Dict[str, Any]: The response.
+
+    Raises:
+        ServerError: If the daemon is not running, or could not run the command.
+    """
+
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as connection:
+            connection.connect(path or socket_path())
+
+            send(connection, {'command': command, **arguments})
+            response = receive(connection)
+    except (FileNotFoundError, ConnectionRefusedError) as e:
+        raise ServerError(f'The daemon is not running: {e}') from e
+
+    if 'error' in response:
+        raise ServerError(response['error'])
+
+    return response
@@ -4,6 +4,15 @@ This module contains the constants for the Hogwarts dataset.
 
 HOGWARTS_HOUSE = 'Hogwarts House'
 
+HOGWARTS_STUDENT = [
+    'Index',
+    'Hogwarts House',
+    'First Name',
+    'Last Name',
+    'Birthday',
+    'Best Hand'
+]
+
 HOGWARTS_HOUSES = [
     'Gryffindor',
     'Hufflepuff',
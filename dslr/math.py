@@ -1,34 +1,549 @@
 """
 This module contains functions to calculate statistics of a given column.
 """
-from typing import Callable, Iterable, Any
-from math import ceil, floor, inf, sqrt
-from functools import wraps
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, Any, List, Sequence
+from math import inf
+from functools import partial
 
+import numpy as np
 import pandas as pd
 
+from dslr.parallel import SharedArray, attach, attached
+from dslr.sketch import HLL_PRECISION, SKETCH_SIZE, HyperLogLog, QuantileSketch
 
-def dropna(func: Callable) -> Callable:
+
+def percentile_label(percentile: float) -> str:
+    """
+    Build the label under which a percentile is reported.
+
+    Args:
+        percentile (float): The percentile, between 0 and 1.
+
+    Returns:
+        str: The label of the percentile (e.g. `25%`).
+    """
+
+    return f'{percentile * 100:g}%'
+
+
+def to_block(data: pd.DataFrame | pd.Series | np.ndarray | Iterable) -> np.ndarray:
     """
-    Decorator to drop NaN values from a column before applying a function.
+    Convert a column or a set of columns to a 2D float block.
 
     Args:
-        func (Callable): The function to apply.
-        *args: The positional arguments to pass to the function.
-        **kwargs: The keyword arguments to pass to the function.
+        data (pd.DataFrame | pd.Series | np.ndarray | Iterable): The data to convert.
 
     Returns:
-        Callable: The wrapper function.
+        np.ndarray: A (rows x columns) float64 block, in column-major order so
+            that every column is contiguous and reduced the same way on its own.
     """
 
-    @wraps(func)
-    def wrapper(column: pd.Series, *args, **kwargs) -> Any:
-        return func(column.dropna(), *args, **kwargs)
+    if isinstance(data, (pd.DataFrame, pd.Series)):
+        data = data.to_numpy(dtype=np.float64, na_value=np.nan)
+
+    block = np.asarray(data, dtype=np.float64)
+    if block.ndim == 1:
+        block = block.reshape(-1, 1)
+
+    return np.asfortranarray(block)
+
+
+def ft_statistics(
+    block: np.ndarray,
+    percentiles: Sequence[float] = (),
+    unique: bool = False,
+    sketch_size: int | None = None,
+    unique_precision: int | None = None
+) -> Dict[str, np.ndarray]:
+    """
+    Calculate the statistics of every column of a block in one vectorized pass.
+
+    NaN values are ignored, except by `count` and `unique` which, like
+    `ft_len` and `ft_unique` always did, count every row.
+
+    The block is sorted once, and only when the number of unique values is
+    requested. Otherwise exact percentiles are served by a single partition
+    of each column around every index they need.
+
+    Args:
+        block (np.ndarray): A (rows x columns) float block.
+        percentiles (Sequence[float]): The percentiles to calculate, between 0 and 1.
+        unique (bool): Whether to calculate the number of unique values.
+        sketch_size (int | None): If set, the percentiles are estimated with a
+            `QuantileSketch` of this size instead of being calculated exactly.
+        unique_precision (int | None): If set, the number of unique values is
+            estimated with a `HyperLogLog` of this precision instead of being counted exactly.
+
+    Returns:
+        Dict[str, np.ndarray]: The statistics, one value per column, keyed by
+            `count`, `sum`, `mean`, `variance`, `std`, `min`, `max`,
+            `unique` and the percentile labels.
+    """
+
+    block = to_block(block)
+    moments = _moments(block)
+    size = moments['size']
+
+    statistics = _finalize_moments(moments)
+
+    if sketch_size is not None:
+        sketches = [QuantileSketch(sketch_size) for _ in range(block.shape[1])]
+        for column, sketch in enumerate(sketches):
+            sketch.update(block[:, column])
+
+        statistics.update(_sketch_percentiles(sketches, percentiles))
+        percentiles = ()
+
+    if unique and unique_precision is not None:
+        estimators = [HyperLogLog(unique_precision) for _ in range(block.shape[1])]
+        for column, estimator in enumerate(estimators):
+            estimator.update(block[:, column])
+
+        statistics['unique'] = _estimate_unique(estimators)
+        unique = False
+
+    if unique:
+        # NaN values are sorted to the end of every column.
+        values = np.sort(block, axis=0)
+
+        statistics['unique'] = _sorted_unique(values, size)
+        for percentile in percentiles:
+            statistics[percentile_label(percentile)] = _sorted_percentile(values, size, percentile)
+
+    elif percentiles:
+        statistics.update(_partitioned_percentiles(block, size, percentiles))
+
+    return statistics
+
+
+def ft_parallel_statistics(block: np.ndarray, jobs: int, **options: Any) -> Dict[str, np.ndarray]:
+    """
+    Calculate the statistics of every column of a block across worker processes.
+
+    The block is copied once to shared memory, and each worker calculates
+    the statistics of single columns with `ft_statistics`. Columns are
+    reduced independently, so the result is identical to the serial one.
+
+    Args:
+        block (np.ndarray): A (rows x columns) float block.
+        jobs (int): The number of worker processes.
+        **options (Any): The options of `ft_statistics`.
+
+    Returns:
+        Dict[str, np.ndarray]: The statistics, keyed like `ft_statistics`' result.
+    """
+
+    block = to_block(block)
+
+    if jobs <= 1 or block.shape[1] <= 1:
+        return ft_statistics(block, **options)
+
+    with SharedArray(block) as shared:
+        with ProcessPoolExecutor(
+            max_workers=min(jobs, block.shape[1]),
+            initializer=attach,
+            initargs=({'block': shared.spec},)
+        ) as executor:
+            results = list(executor.map(
+                partial(_column_statistics, options=options),
+                range(block.shape[1])
+            ))
+
+    return {
+        name: np.concatenate([result[name] for result in results])
+        for name in results[0]
+    }
+
+
+def _column_statistics(column: int, options: Dict[str, Any]) -> Dict[str, np.ndarray]:
+    return ft_statistics(attached('block')[:, column:column + 1], **options)
+
+
+def ft_grouped_statistics(
+    block: np.ndarray,
+    groups: np.ndarray,
+    percentiles: Sequence[float] = (),
+    unique: bool = False
+) -> Dict[str, np.ndarray]:
+    """
+    Calculate the statistics of every column of a block, for every group of rows, in one pass.
+
+    The rows are sorted by group once, so that every group is a contiguous
+    segment reduced with `reduceat`. Percentiles and unique counts sort every
+    column by group then value once, and read all the groups at their offsets.
+
+    Args:
+        block (np.ndarray): A (rows x columns) float block.
+        groups (np.ndarray): The group code of each row, from 0 to the number of groups.
+            Rows with a negative code (e.g. a missing label) are ignored.
+        percentiles (Sequence[float]): The percentiles to calculate, between 0 and 1.
+        unique (bool): Whether to calculate the number of unique values.
+
+    Returns:
+        Dict[str, np.ndarray]: The statistics, one (groups x columns) array
+            per statistic, keyed like `ft_statistics`' result.
+    """
+
+    block = to_block(block)
+    groups = np.asarray(groups, dtype=np.intp)
+
+    kept = groups >= 0
+    order = np.argsort(groups[kept], kind='stable')
+    block, groups = block[kept][order], groups[kept][order]
+
+    count = np.bincount(groups, minlength=0)
+    starts = np.cumsum(count) - count
+
+    moments = _grouped_moments(block, groups, starts, count)
+    statistics = _finalize_moments(moments)
+
+    if not percentiles and not unique:
+        return statistics
+
+    # Every column is sorted by group then by value, with NaN values at the end of each group.
+    rows = np.argsort(block, axis=0, kind='stable')
+    rows = np.take_along_axis(rows, np.argsort(groups[rows], axis=0, kind='stable'), axis=0)
+    values = np.take_along_axis(block, rows, axis=0)
+
+    size = moments['size']
+
+    for percentile in percentiles:
+        statistics[percentile_label(percentile)] = _grouped_percentile(
+            values, starts, size, percentile
+        )
+
+    if unique:
+        statistics['unique'] = _grouped_unique(values, groups, starts, size)
+
+    return statistics
+
+
+def _segment_reduce(
+    ufunc: np.ufunc,
+    values: np.ndarray,
+    starts: np.ndarray,
+    count: np.ndarray,
+    identity: float
+) -> np.ndarray:
+    result = np.full((count.size, values.shape[1]), identity, dtype=values.dtype)
+
+    # `reduceat` does not handle empty segments, which keep the identity instead.
+    present = count > 0
+    if present.any():
+        result[present] = ufunc.reduceat(values, starts[present], axis=0)
+
+    return result
+
+
+def _grouped_moments(
+    block: np.ndarray,
+    groups: np.ndarray,
+    starts: np.ndarray,
+    count: np.ndarray
+) -> Dict[str, np.ndarray]:
+    valid = ~np.isnan(block)
+    size = _segment_reduce(np.add, valid.astype(np.int64), starts, count, 0)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        total = _segment_reduce(np.add, np.where(valid, block, 0.0), starts, count, 0.0)
+        mean = total / size
+        deviation = np.where(valid, block - mean[groups], 0.0)
+
+    return {
+        'count': np.repeat(count[:, None], block.shape[1], axis=1),
+        'size': size,
+        'sum': total,
+        'mean': mean,
+        'm2': _segment_reduce(np.add, np.square(deviation), starts, count, 0.0),
+        'min': _segment_reduce(np.minimum, np.where(valid, block, inf), starts, count, inf),
+        'max': _segment_reduce(np.maximum, np.where(valid, block, -inf), starts, count, -inf),
+    }
+
+
+def _grouped_percentile(
+    values: np.ndarray,
+    starts: np.ndarray,
+    size: np.ndarray,
+    percentile: float
+) -> np.ndarray:
+    if values.shape[0] == 0:
+        return np.full(size.shape, np.nan)
+
+    index = np.maximum(size - 1, 0) * percentile
+    lower_index, upper_index = np.floor(index), np.ceil(index)
+
+    last = values.shape[0] - 1
+    lower_rows = np.minimum(starts[:, None] + lower_index.astype(np.intp), last)
+    upper_rows = np.minimum(starts[:, None] + upper_index.astype(np.intp), last)
+
+    lower = np.take_along_axis(values, lower_rows, axis=0)
+    upper = np.take_along_axis(values, upper_rows, axis=0)
 
-    return wrapper
+    result = _interpolate(lower, upper, index)
+    return np.where(size > 0, result, np.nan)
+
+
+def _grouped_unique(
+    values: np.ndarray,
+    groups: np.ndarray,
+    starts: np.ndarray,
+    size: np.ndarray
+) -> np.ndarray:
+    count = np.bincount(groups, minlength=size.shape[0])
+
+    # A row starts a new value if it is not NaN and differs from the previous row of its group.
+    rank = np.arange(values.shape[0]) - starts[groups]
+    changes = np.ones(values.shape, dtype=bool)
+    changes[1:] = values[1:] != values[:-1]
+    changes[rank == 0] = True
+    changes &= rank[:, None] < size[groups]
+
+    distinct = _segment_reduce(np.add, changes.astype(np.int64), starts, count, 0)
+
+    # Every NaN is counted as a distinct value, as `set` does.
+    return distinct + (count[:, None] - size)
+
+
+def _moments(block: np.ndarray) -> Dict[str, np.ndarray]:
+    valid = ~np.isnan(block)
+    size = valid.sum(axis=0)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        total = np.where(valid, block, 0.0).sum(axis=0)
+        mean = total / size
+        deviation = np.where(valid, block - mean, 0.0)
+
+    return {
+        'count': np.full(block.shape[1], block.shape[0], dtype=np.int64),
+        'size': size,
+        'sum': total,
+        'mean': mean,
+        'm2': np.square(deviation).sum(axis=0),
+        'min': np.min(np.where(valid, block, inf), axis=0, initial=inf),
+        'max': np.max(np.where(valid, block, -inf), axis=0, initial=-inf),
+    }
+
+
+def _finalize_moments(moments: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+    with np.errstate(divide='ignore', invalid='ignore'):
+        variance = moments['m2'] / (moments['size'] - 1)
+
+    return {
+        'count': moments['count'],
+        'sum': moments['sum'],
+        'mean': moments['mean'],
+        'variance': variance,
+        'std': np.sqrt(variance),
+        'min': moments['min'],
+        'max': moments['max'],
+    }
+
+
+def _sorted_unique(values: np.ndarray, size: np.ndarray) -> np.ndarray:
+    # Every NaN is counted as a distinct value, as `set` does.
+    sorted_valid = np.arange(1, values.shape[0])[:, None] < size
+    changes = np.count_nonzero((values[1:] != values[:-1]) & sorted_valid, axis=0)
+    distinct = np.where(size > 0, changes + 1, 0)
+
+    return distinct + (values.shape[0] - size)
+
+
+def _sorted_percentile(values: np.ndarray, size: np.ndarray, percentile: float) -> np.ndarray:
+    if values.shape[0] == 0:
+        return np.full(values.shape[1], np.nan)
+
+    index = np.maximum(size - 1, 0) * percentile
+    lower_index, upper_index = np.floor(index), np.ceil(index)
+
+    lower = np.take_along_axis(values, lower_index.astype(np.intp)[None, :], axis=0)[0]
+    upper = np.take_along_axis(values, upper_index.astype(np.intp)[None, :], axis=0)[0]
+
+    result = _interpolate(lower, upper, index)
+    return np.where(size > 0, result, np.nan)
+
+
+def _partitioned_percentiles(
+    block: np.ndarray,
+    size: np.ndarray,
+    percentiles: Sequence[float]
+) -> Dict[str, np.ndarray]:
+    results = np.full((len(percentiles), block.shape[1]), np.nan)
+
+    for column in np.flatnonzero(size):
+        values = block[:, column]
+        values = values[~np.isnan(values)]
+
+        index = (values.size - 1) * np.asarray(percentiles, dtype=np.float64)
+        lower_index = np.floor(index).astype(np.intp)
+        upper_index = np.ceil(index).astype(np.intp)
+
+        values = np.partition(values, np.union1d(lower_index, upper_index))
+        results[:, column] = _interpolate(values[lower_index], values[upper_index], index)
+
+    return {
+        percentile_label(percentile): result
+        for percentile, result in zip(percentiles, results)
+    }
+
+
+def _sketch_percentiles(
+    sketches: List[QuantileSketch],
+    percentiles: Sequence[float]
+) -> Dict[str, np.ndarray]:
+    if not percentiles:
+        return {}
+
+    results = np.array([sketch.quantiles(percentiles) for sketch in sketches]).T
+
+    return {
+        percentile_label(percentile): result
+        for percentile, result in zip(percentiles, results)
+    }
+
+
+def _estimate_unique(estimators: List[HyperLogLog]) -> np.ndarray:
+    return np.array([estimator.estimate() for estimator in estimators])
+
+
+def _interpolate(lower: np.ndarray, upper: np.ndarray, index: np.ndarray) -> np.ndarray:
+    lower_index, upper_index = np.floor(index), np.ceil(index)
+    interpolated = upper * (index - lower_index) + lower * (upper_index - index)
+
+    return np.where(lower_index == upper_index, lower, interpolated)
+
+
+class StatisticsAccumulator:
+    """
+    This class accumulates the statistics of a stream of blocks.
+
+    Each block is reduced with `ft_statistics`' vectorized moments, then
+    merged with Chan's parallel formulas so that only O(columns) values
+    are ever kept. Two accumulators over disjoint rows can be merged,
+    which makes them usable across chunks, workers or processes.
+
+    Percentiles and the number of unique values cannot be merged exactly,
+    so they are estimated with one `QuantileSketch` and one `HyperLogLog` per column.
+
+    Attributes:
+        moments (Dict[str, np.ndarray]): The running count, size (non-NaN count),
+            sum, mean, m2 (sum of squared deviations), min and max of each column.
+        percentiles (List[float]): The percentiles to estimate.
+        sketches (List[QuantileSketch]): The quantile sketch of each column.
+        estimators (List[HyperLogLog]): The cardinality estimator of each column.
+    """
+
+    moments: Dict[str, np.ndarray]
+    percentiles: List[float]
+    sketches: List[QuantileSketch]
+    estimators: List[HyperLogLog]
+
+
+    # pylint: disable=too-many-arguments
+    def __init__(
+        self,
+        columns: int,
+        percentiles: Sequence[float] = (),
+        sketch_size: int = SKETCH_SIZE,
+        unique: bool = False,
+        unique_precision: int = HLL_PRECISION
+    ) -> None:
+        """
+        Initialize an empty accumulator.
+
+        Args:
+            columns (int): The number of columns to accumulate.
+            percentiles (Sequence[float]): The percentiles to estimate, between 0 and 1.
+            sketch_size (int): The size of the quantile sketches.
+            unique (bool): Whether to estimate the number of unique values.
+            unique_precision (int): The precision of the cardinality estimators.
+        """
+
+        self.moments = _moments(np.empty((0, columns)))
+        self.percentiles = list(percentiles)
+        self.sketches = [QuantileSketch(sketch_size) for _ in range(columns)] if percentiles else []
+        self.estimators = [HyperLogLog(unique_precision) for _ in range(columns)] if unique else []
+
+
+    def update(self, block: np.ndarray) -> None:
+        """
+        Add the rows of a block to the accumulator.
+
+        Args:
+            block (np.ndarray): A (rows x columns) float block.
+        """
+
+        block = to_block(block)
+        self.moments = _merge_moments(self.moments, _moments(block))
+
+        for column, sketch in enumerate(self.sketches):
+            sketch.update(block[:, column])
+
+        for column, estimator in enumerate(self.estimators):
+            estimator.update(block[:, column])
+
+
+    def merge(self, other: 'StatisticsAccumulator') -> None:
+        """
+        Add the rows seen by another accumulator to this one.
+
+        Args:
+            other (StatisticsAccumulator): The accumulator to merge.
+        """
+
+        self.moments = _merge_moments(self.moments, other.moments)
+
+        for sketch, other_sketch in zip(self.sketches, other.sketches):
+            sketch.merge(other_sketch)
+
+        for estimator, other_estimator in zip(self.estimators, other.estimators):
+            estimator.merge(other_estimator)
+
+
+    def statistics(self) -> Dict[str, np.ndarray]:
+        """
+        Calculate the statistics of the rows seen so far.
+
+        Returns:
+            Dict[str, np.ndarray]: The statistics, keyed like `ft_statistics`' result.
+        """
+
+        statistics = _finalize_moments(self.moments)
+        statistics.update(_sketch_percentiles(self.sketches, self.percentiles))
+
+        if self.estimators:
+            statistics['unique'] = _estimate_unique(self.estimators)
+
+        return statistics
+
+
+def _merge_moments(
+    left: Dict[str, np.ndarray],
+    right: Dict[str, np.ndarray]
+) -> Dict[str, np.ndarray]:
+    size = left['size'] + right['size']
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        delta = right['mean'] - left['mean']
+        mean = left['mean'] + delta * (right['size'] / size)
+        m2 = left['m2'] + right['m2'] + delta ** 2 * (left['size'] * right['size'] / size)
+
+    # An empty side carries a NaN mean which must not leak into the result.
+    left_empty, right_empty = left['size'] == 0, right['size'] == 0
+    mean = np.where(left_empty, right['mean'], np.where(right_empty, left['mean'], mean))
+    m2 = np.where(left_empty, right['m2'], np.where(right_empty, left['m2'], m2))
+
+    return {
+        'count': left['count'] + right['count'],
+        'size': size,
+        'sum': left['sum'] + right['sum'],
+        'mean': mean,
+        'm2': m2,
+        'min': np.minimum(left['min'], right['min']),
+        'max': np.maximum(left['max'], right['max']),
+    }
 
 
-@dropna
 def ft_sum(column: pd.Series) -> float:
     """
     Calculate the sum of a given column.
@@ -40,10 +555,7 @@ def ft_sum(column: pd.Series) -> float:
         float: The sum of the column.
     """
 
-    total = 0
-    for value in column:
-        total += value
-    return total
+    return float(ft_statistics(to_block(column))['sum'][0])
 
 
 def ft_len(column: pd.Series | Iterable) -> int:
@@ -57,13 +569,15 @@ def ft_len(column: pd.Series | Iterable) -> int:
         int: The length of the column.
     """
 
+    if isinstance(column, (pd.Series, np.ndarray)):
+        return int(ft_statistics(to_block(column))['count'][0])
+
     length = 0
     for _ in column:
         length += 1
     return length
 
 
-@dropna
 def ft_min(column: pd.Series) -> float:
     """
     Calculate the minimum value of a given column.
@@ -75,13 +589,9 @@ def ft_min(column: pd.Series) -> float:
         float: The minimum value of the column.
     """
 
-    min_value = inf
-    for value in column:
-        min_value = value if value < min_value else min_value
-    return min_value
+    return float(ft_statistics(to_block(column))['min'][0])
 
 
-@dropna
 def ft_max(column: pd.Series) -> float:
     """
     Calculate the maximum value of a given column.
@@ -93,13 +603,9 @@ def ft_max(column: pd.Series) -> float:
         float: The maximum value of the column.
     """
 
-    max_value = -inf
-    for value in column:
-        max_value = value if value > max_value else max_value
-    return max_value
+    return float(ft_statistics(to_block(column))['max'][0])
 
 
-@dropna
 def ft_mean(column: pd.Series) -> float:
     """
     Calculate the mean of a given column.
@@ -111,10 +617,9 @@ def ft_mean(column: pd.Series) -> float:
         float: The mean of the column.
     """
 
-    return ft_sum(column) / ft_len(column)
+    return float(ft_statistics(to_block(column))['mean'][0])
 
 
-@dropna
 def ft_variance(column: pd.Series) -> float:
     """
     Calculate the variance of a given column.
@@ -126,16 +631,9 @@ def ft_variance(column: pd.Series) -> float:
         float: The variance of the column
     """
 
-    mean = ft_mean(column)
-    total = 0
-
-    for value in column:
-        total += (value - mean) ** 2
+    return float(ft_statistics(to_block(column))['variance'][0])
 
-    return total / (ft_len(column) - 1)
 
-
-@dropna
 def ft_std(column: pd.Series) -> float:
     """
     Calculate the standard deviation of a column.
@@ -147,11 +645,9 @@ def ft_std(column: pd.Series) -> float:
         float: The standard deviation of the column.
     """
 
-    variance = ft_variance(column)
-    return sqrt(variance)
+    return float(ft_statistics(to_block(column))['std'][0])
 
 
-@dropna
 def ft_percentile(column: pd.Series, percentile: float) -> float:
     """
     Calculate the percentile of a given column.
@@ -164,27 +660,22 @@ def ft_percentile(column: pd.Series, percentile: float) -> float:
         float: The percentile of the column.
     """
 
-    values = column.sort_values().reset_index(drop=True)
-    index = (ft_len(values) - 1) * percentile
-
-    if index.is_integer():
-        return values[int(index)]
-
-    lower = values[floor(index)] * (ceil(index) - index)
-    upper = values[ceil(index)] * (index - floor(index))
-
-    return upper + lower
+    statistics = ft_statistics(to_block(column), percentiles=[percentile])
+    return float(statistics[percentile_label(percentile)][0])
 
 
-def ft_unique(column: pd.Series) -> int:
+def ft_unique(column: pd.Series, precision: int | None = None) -> int:
     """
     Calculate the number of unique values in a column.
 
     Args:
         column (pd.Series): The column to calculate the number of unique values of.
+        precision (int | None): If set, the number is estimated with a
+            `HyperLogLog` of this precision instead of being counted exactly.
 
     Returns:
         int: The number of unique values in the column.
     """
 
-    return ft_len(set(column))
+    statistics = ft_statistics(to_block(column), unique=True, unique_precision=precision)
+    return int(round(statistics['unique'][0]))
@@ -0,0 +1,96 @@
+"""
+This module implements the binary model format.
+
+A binary model is an uncompressed `.npz` archive of three `.npy` members:
+the (features x classes) weight matrix, the bias of each class, and a JSON
+header describing them. Since the members are stored as they are, the
+weight matrix is memory-mapped from the archive instead of being read.
+"""
+
+import json
+import struct
+import zipfile
+from typing import Any, Dict, Tuple
+
+import numpy as np
+
+
+BINARY_FORMAT_VERSION = 1
+
+# The fixed-size part of a zip local file header, followed by the name and extra field.
+_LOCAL_HEADER = struct.Struct('<4s5H3L2H')
+
+
+def save_binary(path: str, weights: np.ndarray, bias: np.ndarray, header: Dict[str, Any]) -> None:
+    """
+    Save a model in the binary format.
+
+    Args:
+        path (str): The path of the archive.
+        weights (np.ndarray): The weight matrix, one column per class.
+        bias (np.ndarray): The bias of each class.
+        header (Dict[str, Any]): The description of the model.
+    """
+
+    header = {'format': BINARY_FORMAT_VERSION, 'dtype': weights.dtype.str, **header}
+
+    with open(path, 'wb') as file:
+        np.savez(
+            file,
+            weights=np.ascontiguousarray(weights),
+            bias=np.asarray(bias, dtype=weights.dtype),
+            header=np.array(json.dumps(header)),
+        )
+
+
+def load_binary(path: str) -> Tuple[np.ndarray, np.ndarray, Dict[str, Any]]:
+    """
+    Load a model saved in the binary format.
+
+    Args:
+        path (str): The path of the archive.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray, Dict[str, Any]]: The read-only memory-mapped
+            weight matrix, the bias of each class, and the header.
+
+    Raises:
+        ValueError: If the archive is not a binary model.
+    """
+
+    with np.load(path) as archive:
+        if {'weights.npy', 'bias.npy', 'header.npy'} - set(archive.zip.namelist()):
+            raise ValueError('The archive is not a binary model.')
+
+        header = json.loads(str(archive['header']))
+        bias = archive['bias']
+
+    if header.get('format') != BINARY_FORMAT_VERSION:
+        raise ValueError(f'Unsupported binary model format: {header.get("format")}.')
+
+    return _mmap_member(path, 'weights.npy'), bias, header
+
+
+def _mmap_member(path: str, name: str) -> np.ndarray:
+    with zipfile.ZipFile(path) as archive:
+        info = archive.getinfo(name)
+
+    if info.compress_type != zipfile.ZIP_STORED:
+        with np.load(path) as archive:
+            return archive[name[:-len('.npy')]]
+
+    with open(path, 'rb') as file:
+        file.seek(info.header_offset)
+        *_, name_length, extra_length = _LOCAL_HEADER.unpack(file.read(_LOCAL_HEADER.size))
+        file.seek(name_length + extra_length, 1)
+
+        version = np.lib.format.read_magic(file)
+        if version == (1, 0):
+            shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(file)
+        else:
+            shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(file)
+
+        offset = file.tell()
+
+    order = 'F' if fortran_order else 'C'
+    return np.memmap(path, dtype=dtype, mode='r', offset=offset, shape=shape, order=order)
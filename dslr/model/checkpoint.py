@@ -0,0 +1,172 @@
+"""
+This module saves the state of a training, so that it can be resumed once interrupted.
+
+A checkpoint is an uncompressed `.npz` archive holding each array of the
+state, and a JSON header holding the other values: the epoch, the state of
+the random number generator, and the name of the model. It is written next
+to its final path, then moved over it, so that an interrupted write never
+leaves a truncated checkpoint behind.
+"""
+
+import json
+import os
+import tempfile
+import time
+from typing import Any, Dict
+
+import numpy as np
+
+
+CHECKPOINT_FORMAT_VERSION = 1
+
+
+class Checkpoint:
+    """
+    This class saves and loads the state of a training, every few epochs or seconds.
+
+    Attributes:
+        directory (str): The directory the checkpoints are saved in.
+        name (str): The name of the checkpoint in the directory.
+        every_epochs (int | None): Save once this many epochs passed since the last save.
+        every_seconds (float | None): Save once this many seconds passed since the last save.
+        resume (bool): Whether the training resumes from the saved state.
+    """
+
+    directory: str
+    name: str
+    every_epochs: int | None
+    every_seconds: float | None
+    resume: bool
+
+
+    # pylint: disable=too-many-arguments,too-many-positional-arguments
+    def __init__(
+        self,
+        directory: str,
+        every_epochs: int | None = None,
+        every_seconds: float | None = None,
+        resume: bool = False,
+        name: str = 'model'
+    ) -> None:
+        """
+        Initialize the checkpoint.
+
+        Args:
+            directory (str): The directory the checkpoints are saved in.
+            every_epochs (int | None): Save once this many epochs passed since the last save.
+            every_seconds (float | None): Save once this many seconds passed since the last save.
+            resume (bool): Whether the training resumes from the saved state.
+            name (str): The name of the checkpoint in the directory.
+        """
+
+        self.directory = directory
+        self.name = name
+        self.every_epochs = every_epochs
+        self.every_seconds = every_seconds
+        self.resume = resume
+
+        self._last_epoch = 0
+        self._last_time = time.monotonic()
+
+
+    @property
+    def path(self) -> str:
+        """
+        The path of the checkpoint.
+        """
+
+        return os.path.join(self.directory, f'{self.name}.npz')
+
+
+    def for_class(self, index: int) -> 'Checkpoint':
+        """
+        Get the checkpoint of the model of one class, when each class is fitted on its own.
+
+        Args:
+            index (int): The index of the class.
+
+        Returns:
+            Checkpoint: The checkpoint of the class.
+        """
+
+        return Checkpoint(self.directory, self.every_epochs, self.every_seconds, self.resume,
+                          f'{self.name}-class-{index}')
+
+
+    def due(self, epoch: int) -> bool:
+        """
+        Check whether the state should be saved after an epoch.
+
+        Args:
+            epoch (int): The number of epochs done.
+
+        Returns:
+            bool: Whether enough epochs or seconds passed since the last save.
+        """
+
+        if self.every_epochs is not None and epoch - self._last_epoch >= self.every_epochs:
+            return True
+
+        if self.every_seconds is not None:
+            return time.monotonic() - self._last_time >= self.every_seconds
+
+        return False
+
+
+    def save(self, epoch: int, state: Dict[str, Any]) -> None:
+        """
+        Save the state of the training, replacing the previous checkpoint at once.
+
+        Args:
+            epoch (int): The number of epochs done.
+            state (Dict[str, Any]): The state, made of arrays and of values
+                which can be saved as JSON.
+        """
+
+        arrays = {key: value for key, value in state.items() if isinstance(value, np.ndarray)}
+        header = {key: value for key, value in state.items() if key not in arrays}
+        header.update(format=CHECKPOINT_FORMAT_VERSION, epoch=epoch, arrays=list(arrays))
+
+        os.makedirs(self.directory, exist_ok=True)
+        descriptor, staging = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+
+        try:
+            with os.fdopen(descriptor, 'wb') as file:
+                np.savez(file, header=np.array(json.dumps(header)), **arrays)
+                file.flush()
+                os.fsync(file.fileno())
+
+            os.replace(staging, self.path)
+        except BaseException:
+            if os.path.exists(staging):
+                os.unlink(staging)
+            raise
+
+        self._last_epoch = epoch
+        self._last_time = time.monotonic()
+
+
+    def load(self) -> Dict[str, Any] | None:
+        """
+        Load the state of the training, if it resumes and a checkpoint was saved.
+
+        Returns:
+            Dict[str, Any] | None: The state, with the number of epochs done as `epoch`.
+
+        Raises:
+            ValueError: If the file is not a checkpoint.
+        """
+
+        if not self.resume or not os.path.exists(self.path):
+            return None
+
+        with np.load(self.path) as archive:
+            header = json.loads(str(archive['header']))
+
+            if header.pop('format', None) != CHECKPOINT_FORMAT_VERSION:
+                raise ValueError(f'{self.path} is not a checkpoint.')
+
+            state = {key: archive[key] for key in header.pop('arrays')}
+
+        self._last_epoch = header['epoch']
+        return {**header, **state}
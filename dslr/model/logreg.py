@@ -2,12 +2,33 @@
 This module implements a logistic regression model using gradient descent.
 """
 
+import copy
+import logging
+from typing import Any, Dict, List, Tuple
+
 import numpy as np
 
+from dslr.model.checkpoint import Checkpoint
+from dslr.model.optimizer import Optimizer, Schedule, get_optimizer, get_schedule
+
 
 class LogReg:
     """
     This class implements a logistic regression model using gradient descent.
+
+    Models whose `fused` attribute is set can be fitted to one target column
+    per class at once, with a (features x classes) weight matrix.
+
+    Gradient descent models can also be fitted one chunk of rows at a time
+    with `partial_fit`, so that the dataset never has to fit in memory.
+
+    Models start from zero weights, or from the weights given to `warm_start`.
+
+    Gradient descent models turn their gradient into an update with their
+    `optimizer`, and multiply their learning rate by their `schedule` at each epoch.
+
+    Models whose `resumable` attribute is set save the state of their training
+    to their `checkpoint`, if any, and resume from it when the checkpoint resumes.
     """
 
     learning_rate: float
@@ -16,6 +37,20 @@ class LogReg:
     weights: np.ndarray
     bias: float
 
+    fused: bool = False
+    resumable: bool = False
+
+    optimizer: str | Optimizer = 'sgd'
+    schedule: str | Schedule | None = None
+
+    checkpoint: Checkpoint | None = None
+
+    _optimizer: Optimizer
+    _schedule: Schedule | None = None
+    _rate: float
+
+    _warm_start: Tuple[np.ndarray, np.ndarray] | None = None
+
 
     def fit(self, x: np.ndarray, y: np.ndarray) -> None:
         """
@@ -29,6 +64,273 @@ class LogReg:
         raise NotImplementedError
 
 
+    def partial_fit(self, x: np.ndarray, y: np.ndarray) -> None:
+        """
+        Update the model with one pass over a chunk of the data.
+
+        The weights are initialized by the first chunk, and updated by each
+        following one, so that calling it on every chunk of a dataset trains
+        the model for one epoch. Given the same chunks in the same order, the
+        model is always the same.
+
+        Args:
+            x (np.ndarray): The input values of the chunk.
+            y (np.ndarray): The target values of the chunk.
+
+        Raises:
+            NotImplementedError: If the model can only be fitted to the whole dataset.
+        """
+
+        raise NotImplementedError(f'{type(self).__name__} does not support partial_fit.')
+
+
+    def warm_start(self, weights: np.ndarray, bias: float | np.ndarray) -> None:
+        """
+        Start the next fit from given weights instead of zeros, such as the
+        weights of a model trained on a previous version of the dataset.
+
+        Args:
+            weights (np.ndarray): The initial weights, one column per class
+                when the model is fitted to every class at once.
+            bias (float | np.ndarray): The initial bias, one per class.
+        """
+
+        self._warm_start = (
+            np.array(weights, dtype=np.float64),
+            np.array(bias, dtype=np.float64)
+        )
+
+
+    def _initial_weights(self, n: int, y: np.ndarray) -> Tuple[np.ndarray, float | np.ndarray]:
+        """
+        Get the weights and the bias a fit starts from.
+
+        Args:
+            n (int): The number of features.
+            y (np.ndarray): The target values.
+
+        Returns:
+            Tuple[np.ndarray, float | np.ndarray]: The weights and the bias.
+
+        Raises:
+            ValueError: If the weights given to `warm_start` do not have the shape of the model.
+        """
+
+        shape = (n, *y.shape[1:])
+
+        if self._warm_start is None:
+            return np.zeros(shape), np.zeros(y.shape[1:]) if y.ndim > 1 else 0
+
+        weights, bias = self._warm_start
+        if weights.shape != shape or bias.shape != y.shape[1:]:
+            raise ValueError(f'Cannot warm start a model of shape {shape} '
+                             f'from weights of shape {weights.shape}.')
+
+        return weights.copy(), bias.copy() if y.ndim > 1 else float(bias)
+
+
+    def _start_optimizer(self) -> None:
+        """
+        Create the optimizer of a new fit, and start from the initial learning rate.
+        """
+
+        self._optimizer = get_optimizer(self.optimizer)
+        self._schedule = get_schedule(self.schedule)
+        self._rate = self.learning_rate
+
+
+    def _start_epoch(self, epoch: int) -> None:
+        """
+        Set the learning rate of an epoch from the schedule.
+
+        Args:
+            epoch (int): The epoch, starting from 1.
+        """
+
+        if self._schedule is not None:
+            self._rate = self.learning_rate * self._schedule(epoch - 1, self.epochs)
+
+
+    def _resume(self) -> Dict[str, Any] | None:
+        """
+        Restore the weights and the bias saved by the checkpoint, if the training resumes.
+
+        Returns:
+            Dict[str, Any] | None: The saved state, with the number of epochs done as `epoch`.
+
+        Raises:
+            ValueError: If the checkpoint was saved by another model, or for other data.
+        """
+
+        if self.checkpoint is None:
+            return None
+
+        state = self.checkpoint.load()
+        if state is None:
+            return None
+
+        if (state['model'] != type(self).__name__
+                or state.get('optimizer', 'sgd') != self._optimizer.name
+                or state['weights'].shape != self.weights.shape):
+            raise ValueError(f'{self.checkpoint.path} was saved by the training '
+                             f'of another model, or on other data.')
+
+        self.weights = state['weights']
+        self.bias = state['bias'] if np.ndim(self.bias) else float(state['bias'])
+
+        prefix = 'optimizer_'
+        self._optimizer.load_state({
+            key[len(prefix):]: value for key, value in state.items() if key.startswith(prefix)
+        })
+
+        logging.info('Resuming training from epoch %s', state['epoch'])
+        return state
+
+
+    def _save_checkpoint(self, epoch: int, force: bool = False, **state: Any) -> None:
+        """
+        Save the state of the training to the checkpoint, if it is due.
+
+        Args:
+            epoch (int): The number of epochs done.
+            force (bool): Save even if it is not due, such as once the training is complete.
+            **state (Any): The state of the training besides the weights and the bias.
+        """
+
+        if self.checkpoint is None or not (force or self.checkpoint.due(epoch)):
+            return
+
+        self.checkpoint.save(epoch, {
+            'model': type(self).__name__,
+            'optimizer': self._optimizer.name,
+            'weights': self.weights,
+            'bias': self.bias,
+            **{f'optimizer_{key}': value for key, value in self._optimizer.state().items()},
+            **state,
+        })
+
+
+    def _start_partial_fit(self, x: np.ndarray, y: np.ndarray) -> None:
+        # The first chunk initializes the weights and the optimizer, and the others keep them.
+        # A stream has no number of epochs, so the learning rate is not scheduled.
+        if not hasattr(self, 'weights'):
+            self.weights, self.bias = self._initial_weights(x.shape[1], y)
+            self._start_optimizer()
+
+
+    @classmethod
+    def fit_ovr(
+        cls,
+        x: np.ndarray,
+        y: np.ndarray,
+        n_jobs: int = 1,
+        init: Tuple[np.ndarray, np.ndarray] | None = None,
+        checkpoint: Checkpoint | None = None,
+        **kwargs: Any
+    ) -> List['LogReg']:
+        """
+        Fit one model per class (One vs Rest).
+
+        Models which are not fused are fitted one after another, or in a pool
+        of `n_jobs` processes. Fused models are fitted once for every class, in
+        this process: `n_jobs` is then ignored, with a warning.
+
+        The models which are not fused each save their own checkpoint.
+
+        Args:
+            x (np.ndarray): The input values.
+            y (np.ndarray): The target values, one column per class.
+            n_jobs (int): The number of processes, -1 for one per core.
+            init (Tuple[np.ndarray, np.ndarray] | None): The (features x classes) weights
+                and the bias of each class to warm start from, zeros by default.
+            checkpoint (Checkpoint | None): The checkpoint the training is saved to.
+            **kwargs (Any): The arguments of the models.
+
+        Returns:
+            List[LogReg]: The model of each class.
+
+        Raises:
+            ValueError: If a checkpoint is given to a model which cannot resume its training.
+        """
+
+        if checkpoint is not None and not cls.resumable:
+            raise ValueError(f'{cls.__name__} does not support checkpoints.')
+
+        if cls.fused:
+            if n_jobs != 1:
+                logging.warning('%s trains every class at once, n_jobs is ignored', cls.__name__)
+
+            logging.info('Training models for %s classes', y.shape[1])
+
+            model = cls(**kwargs)
+            model.checkpoint = checkpoint
+            if init is not None:
+                model.warm_start(*init)
+
+            model.fit(x, y)
+
+            return [model.select(i) for i in range(y.shape[1])]
+
+        inits = [None if init is None else (init[0][:, i], init[1][i]) for i in range(y.shape[1])]
+        checkpoints = [None if checkpoint is None else checkpoint.for_class(i)
+                       for i in range(y.shape[1])]
+
+        if n_jobs != 1:
+            # The pool module imports this one.
+            # pylint: disable=import-outside-toplevel
+            from dslr.model.pool import fit_parallel
+            return fit_parallel(cls, x, y, n_jobs, kwargs, inits, checkpoints)
+
+        models = []
+        for i in range(y.shape[1]):
+            logging.info('Training model for class #%s', i)
+
+            model = cls(**kwargs)
+            model.checkpoint = checkpoints[i]
+            if inits[i] is not None:
+                model.warm_start(*inits[i]) # type: ignore
+
+            model.fit(x, y[:, i])
+
+            models.append(model)
+
+        return models
+
+
+    def select(self, index: int) -> 'LogReg':
+        """
+        Extract the model of one class from a model fitted to every class at once.
+
+        Args:
+            index (int): The index of the class.
+
+        Returns:
+            LogReg: The model of the class.
+        """
+
+        model = copy.copy(self)
+
+        model.weights = self.weights[:, index].copy()
+        model.bias = float(self.bias[index]) # type: ignore
+
+        return model
+
+
+    def loss(self, x: np.ndarray, y: np.ndarray) -> float | np.ndarray:
+        """
+        Compute the log loss of the model.
+
+        Args:
+            x (np.ndarray): The input values.
+            y (np.ndarray): The target values.
+
+        Returns:
+            float | np.ndarray: The mean log loss, one per class if `y` has one column per class.
+        """
+
+        return log_loss(y, self.predict(x)) # type: ignore
+
+
     def predict(self, x: np.ndarray) -> float:
         """
         Predict the class of the input.
@@ -54,3 +356,21 @@ class LogReg:
         """
 
         return 1 / (1 + np.exp(-z))
+
+
+def log_loss(y: np.ndarray, y_predicted: np.ndarray) -> np.ndarray:
+    """
+    Compute the mean log loss of predictions.
+
+    Args:
+        y (np.ndarray): The target values.
+        y_predicted (np.ndarray): The predicted probabilities.
+
+    Returns:
+        np.ndarray: The mean log loss, one per column of `y`.
+    """
+
+    y_predicted = np.clip(y_predicted, 1e-15, 1 - 1e-15)
+    loss = y * np.log(y_predicted) + (1 - y) * np.log(1 - y_predicted)
+
+    return -np.mean(loss, axis=0)
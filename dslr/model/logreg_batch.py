@@ -3,14 +3,19 @@ This module implements a logistic regression model using gradient descent.
 """
 
 import logging
+from typing import Any, Dict, List, Tuple
+
 import numpy as np
 
 from dslr.model.logreg import LogReg
+from dslr.model.optimizer import Optimizer, Schedule
 
 
 BATCH_LEARNING_RATE = 1e-2
 BATCH_EPOCHS        = int(5e+4)
 
+VALIDATION_SEED = 0
+
 
 # pylint: disable=too-many-instance-attributes,duplicate-code
 class LogRegBatch(LogReg):
@@ -24,22 +29,59 @@ class LogRegBatch(LogReg):
     m: int
     n: int
 
+    tolerance: float | None
+    loss_tolerance: float | None
+    patience: int | None
+    validation_split: float
+
+    stopped_epoch: int | np.ndarray
+
+    fused = True
+    resumable = True
 
+
+    # pylint: disable=too-many-arguments,too-many-positional-arguments
     def __init__(
         self,
         learning_rate: float = BATCH_LEARNING_RATE,
-        epochs: int = BATCH_EPOCHS
+        epochs: int = BATCH_EPOCHS,
+        tolerance: float | None = None,
+        loss_tolerance: float | None = None,
+        patience: int | None = None,
+        validation_split: float = .2,
+        optimizer: str | Optimizer = 'sgd',
+        schedule: str | Schedule | None = None
     ) -> None:
         """
         Initialize the model.
 
+        Training stops after `epochs` epochs, or earlier once any of the
+        enabled stopping criteria is met.
+
         Args:
             learning_rate (float): The learning rate.
-            epochs (int): The number of epochs.
+            epochs (int): The maximum number of epochs.
+            tolerance (float | None): Stop once the norm of the gradient is below this value.
+            loss_tolerance (float | None): Stop once the relative change of the
+                training loss between two epochs is below this value.
+            patience (int | None): Stop once the validation loss has not improved
+                for this many epochs, and keep the best weights.
+            validation_split (float): The fraction of the rows held out for validation
+                when `patience` is set.
+            optimizer (str | Optimizer): The optimizer turning the gradient into an update,
+                by name or as an instance.
+            schedule (str | Schedule | None): The schedule of the learning rate, by name
+                or as a function of the epoch and the number of epochs, constant if None.
         """
 
         self.learning_rate = learning_rate
         self.epochs = epochs
+        self.tolerance = tolerance
+        self.loss_tolerance = loss_tolerance
+        self.patience = patience
+        self.validation_split = validation_split
+        self.optimizer = optimizer
+        self.schedule = schedule
 
 
     def predict(self, x: np.ndarray) -> float:
@@ -63,6 +105,16 @@ class LogRegBatch(LogReg):
         """
         Fit the model to the data using batch gradient descent.
 
+        If `y` has one column per class, the model is fitted to every class
+        at once: the weights are a (features x classes) matrix and the bias
+        a vector, so that each epoch is a single matrix multiplication.
+
+        Each class stops on its own: once it meets a stopping criterion its
+        weights are frozen, and the epoch is recorded in `stopped_epoch`.
+
+        The checkpoint holds the state of the stopping criteria along with the
+        weights, so that a resumed training stops at the same epoch.
+
         Args:
             x (np.ndarray): The input values.
             y (np.ndarray): The target values.
@@ -71,30 +123,246 @@ class LogRegBatch(LogReg):
             None
         """
 
+        validation = None
+        if self.patience is not None:
+            x, y, *validation = self._split_validation(x, y)
+
         self.m, self.n = x.shape
         self.x, self.y = x, y
 
-        self.weights = np.zeros(self.n)
-        self.bias = 0
+        self.weights, self.bias = self._initial_weights(self.n, y)
+        self._start_optimizer()
+
+        self.stopped_epoch = np.full(y.shape[1:], self.epochs)
+        stopping = _EarlyStopping(self, validation)
+
+        epoch = 0
+        if (state := self._resume()) is not None:
+            epoch = state['epoch']
+            self.stopped_epoch = state['stopped_epoch']
+            stopping.load_state(state)
 
         logging.info('Starting training')
 
-        for _ in range(self.epochs):
-            self._update_weights()
+        for epoch in range(epoch + 1, self.epochs + 1):
+            self._start_epoch(epoch)
+            delta_weight, delta_bias, loss = self._update_weights(stopping.active)
+
+            stopped = stopping.update(delta_weight, delta_bias, loss)
+            self.stopped_epoch = np.where(stopped, epoch, self.stopped_epoch)
 
-        logging.info('Training complete')
+            if not stopping.active.any():
+                break
+
+            self._save_checkpoint(epoch, stopped_epoch=self.stopped_epoch, **stopping.state())
+
+        self._save_checkpoint(epoch, True, stopped_epoch=self.stopped_epoch, **stopping.state())
+
+        stopping.restore()
+
+        if y.ndim == 1:
+            self.stopped_epoch = int(self.stopped_epoch)
+
+        logging.info('Training complete (stopped at epoch %s)', self.stopped_epoch)
 
         logging.debug('Weights: %s', self.weights)
         logging.debug('Bias: %s', self.bias)
 
 
-    def _update_weights(self) -> None:
+    def partial_fit(self, x: np.ndarray, y: np.ndarray) -> None:
+        """
+        Update the model with one gradient descent step over a chunk of the data.
+
+        The stopping criteria are not checked, and `stopped_epoch` counts the
+        chunks the model was updated with.
+
+        Args:
+            x (np.ndarray): The input values of the chunk.
+            y (np.ndarray): The target values of the chunk.
+        """
+
+        self._start_partial_fit(x, y)
+
+        self.m, self.n = x.shape
+        self.x, self.y = x, y
+
+        self.stopped_epoch = getattr(self, 'stopped_epoch', np.zeros(y.shape[1:], dtype=int)) + 1
+        self._update_weights()
+
+
+    def select(self, index: int) -> 'LogRegBatch':
+        """
+        Extract the model of one class from a model fitted to every class at once.
+
+        Args:
+            index (int): The index of the class.
+
+        Returns:
+            LogRegBatch: The model of the class.
+        """
+
+        model: LogRegBatch = super().select(index) # type: ignore
+
+        model.y = self.y[:, index]
+        model.stopped_epoch = int(self.stopped_epoch[index]) # type: ignore
+
+        return model
+
+
+    def _split_validation(
+        self,
+        x: np.ndarray,
+        y: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        rows = np.random.default_rng(VALIDATION_SEED).permutation(x.shape[0])
+        held_out = max(1, int(round(x.shape[0] * self.validation_split)))
+
+        train, validation = rows[held_out:], rows[:held_out]
+        return x[train], y[train], x[validation], y[validation]
+
+
+    def _update_weights(
+        self,
+        active: np.ndarray | None = None
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray | None]:
+        delta_weight, delta_bias, loss = self._gradient()
+        update_weight, update_bias = self._optimizer.direction(delta_weight, delta_bias)
+
+        # Classes which have stopped are frozen.
+        step = self._rate if active is None else self._rate * active
+
+        self.weights -= step * update_weight
+
+        if self.y.ndim > 1:
+            self.bias -= step * update_bias
+        else:
+            self.bias -= float(step * update_bias)
+
+        return delta_weight, delta_bias, loss
+
+
+    def _gradient(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray | None]:
         linear_model = np.dot(self.x, self.weights) + self.bias
         y_predicted = self.sigmoid(linear_model)
 
         delta_prediction = y_predicted - self.y
         delta_weight = (1 / self.m) * np.dot(self.x.T, delta_prediction)
-        delta_bias = (1 / self.m) * np.sum(delta_prediction)
+        delta_bias = (1 / self.m) * np.sum(delta_prediction, axis=0)
+
+        loss = None
+        if self.loss_tolerance is not None:
+            # With 0/1 targets, 1 - |y_predicted - y| is the predicted probability of the
+            # target, so the loss takes a single logarithm of the residuals of the gradient.
+            probability = np.maximum(1 - np.abs(delta_prediction), 1e-15)
+            loss = -np.mean(np.log(probability), axis=0)
+
+        return delta_weight, delta_bias, loss
+
+
+class _EarlyStopping:
+    """
+    This class tracks the stopping criteria of a `LogRegBatch` being fitted, one per class.
+    """
+
+    def __init__(self, model: LogRegBatch, validation: List[np.ndarray] | None) -> None:
+        self.model = model
+        self.validation = validation
+
+        shape = model.y.shape[1:]
+        self.active = np.ones(shape, dtype=bool)
+        self.previous_loss = np.full(shape, np.inf)
+
+        self.best_loss = np.full(shape, np.inf)
+        self.best_weights = model.weights.copy()
+        self.best_bias = np.array(model.bias, dtype=np.float64)
+        self.wait = np.zeros(shape, dtype=int)
+
+
+    def update(
+        self,
+        delta_weight: np.ndarray,
+        delta_bias: np.ndarray,
+        loss: np.ndarray | None
+    ) -> np.ndarray:
+        """
+        Check the stopping criteria after an epoch, and deactivate the classes meeting one.
+
+        Returns:
+            np.ndarray: Whether each class stopped at this epoch.
+        """
+
+        model = self.model
+        stopped = np.zeros_like(self.active)
+
+        if model.tolerance is not None:
+            norm = np.sqrt(np.sum(delta_weight ** 2, axis=0) + delta_bias ** 2)
+            stopped |= norm < model.tolerance
+
+        if loss is not None:
+            with np.errstate(divide='ignore', invalid='ignore'):
+                change = np.abs(self.previous_loss - loss) / np.abs(self.previous_loss)
+            stopped |= change < model.loss_tolerance
+            self.previous_loss = loss
+
+        if self.validation is not None:
+            stopped |= self._update_patience()
+
+        stopped &= self.active
+        self.active &= ~stopped
+
+        return stopped
+
+
+    def _update_patience(self) -> np.ndarray:
+        model = self.model
+        loss = model.loss(*self.validation) # type: ignore
+
+        improved = (loss < self.best_loss) & self.active
+        self.best_loss = np.where(improved, loss, self.best_loss)
+        self.best_weights = np.where(improved, model.weights, self.best_weights)
+        self.best_bias = np.where(improved, model.bias, self.best_bias)
+
+        self.wait = np.where(improved, 0, self.wait + 1)
+        return self.wait >= model.patience # type: ignore
+
+
+    def state(self) -> Dict[str, np.ndarray]:
+        """
+        Get the state of the stopping criteria, to save it in a checkpoint.
+
+        Returns:
+            Dict[str, np.ndarray]: The state of the stopping criteria.
+        """
+
+        return {
+            'active': self.active,
+            'previous_loss': self.previous_loss,
+            'best_loss': self.best_loss,
+            'best_weights': self.best_weights,
+            'best_bias': self.best_bias,
+            'wait': self.wait,
+        }
+
+
+    def load_state(self, state: Dict[str, Any]) -> None:
+        """
+        Restore the state of the stopping criteria saved in a checkpoint.
+
+        Args:
+            state (Dict[str, Any]): The state saved in the checkpoint.
+        """
+
+        for name in self.state():
+            setattr(self, name, state[name])
+
+
+    def restore(self) -> None:
+        """
+        Restore the weights with the best validation loss, if it was tracked.
+        """
+
+        if self.validation is None:
+            return
 
-        self.weights -= self.learning_rate * delta_weight
-        self.bias -= float(self.learning_rate * delta_bias)
+        self.model.weights = self.best_weights
+        self.model.bias = self.best_bias if self.best_bias.ndim else float(self.best_bias)
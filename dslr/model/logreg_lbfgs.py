@@ -0,0 +1,134 @@
+"""
+This module implements a logistic regression model using L-BFGS.
+"""
+
+import logging
+
+import numpy as np
+
+from dslr.model.logreg import LogReg, log_loss
+
+
+LBFGS_EPOCHS         = 1000
+LBFGS_TOLERANCE      = 1e-6
+LBFGS_MEMORY         = 10
+LBFGS_REGULARIZATION = 1e-4
+
+
+# L-BFGS needs the gradient over the whole dataset, so `partial_fit` is not supported.
+# pylint: disable=too-many-instance-attributes,duplicate-code,abstract-method
+class LogRegLbfgs(LogReg):
+    """
+    This class implements a logistic regression model using L-BFGS.
+
+    L-BFGS approximates the Hessian of the loss from the last gradients, so
+    that it converges much faster than gradient descent without solving a
+    (features x features) system at each iteration like Newton's method.
+    A small L2 penalty on the weights keeps the optimum finite when a class is separable.
+    """
+
+    x: np.ndarray
+    y: np.ndarray
+
+    m: int
+    n: int
+
+    tolerance: float
+    memory: int
+    regularization: float
+
+    stopped_epoch: int
+
+
+    def __init__(
+        self,
+        epochs: int = LBFGS_EPOCHS,
+        tolerance: float = LBFGS_TOLERANCE,
+        memory: int = LBFGS_MEMORY,
+        regularization: float = LBFGS_REGULARIZATION
+    ) -> None:
+        """
+        Initialize the model.
+
+        Args:
+            epochs (int): The maximum number of iterations.
+            tolerance (float): Stop once every component of the gradient is below this value.
+            memory (int): The number of gradients used to approximate the Hessian.
+            regularization (float): The L2 penalty on the weights.
+        """
+
+        self.epochs = epochs
+        self.tolerance = tolerance
+        self.memory = memory
+        self.regularization = regularization
+
+
+    def predict(self, x: np.ndarray) -> float:
+        """
+        Predict the class of the input.
+
+        Args:
+            x (np.ndarray): The input values.
+
+        Returns:
+            float: The probability of the input being in the class.
+        """
+
+        linear_model = np.dot(x, self.weights) + self.bias
+        y_predicted = self.sigmoid(linear_model)
+
+        return y_predicted # type: ignore
+
+
+    def fit(self, x: np.ndarray, y: np.ndarray) -> None:
+        """
+        Fit the model to the data using L-BFGS.
+
+        Args:
+            x (np.ndarray): The input values.
+            y (np.ndarray): The target values.
+
+        Returns:
+            None
+        """
+
+        self.m, self.n = x.shape
+        self.x, self.y = x, y
+
+        # SciPy takes longer to import than the rest of the package.
+        from scipy.optimize import minimize # pylint: disable=import-outside-toplevel
+
+        logging.info('Starting training')
+
+        weights, bias = self._initial_weights(self.n, y)
+
+        result = minimize(
+            self._objective,
+            np.append(weights, bias),
+            jac=True,
+            method='L-BFGS-B',
+            options={'maxiter': self.epochs, 'gtol': self.tolerance, 'maxcor': self.memory}
+        )
+
+        self.weights, self.bias = result.x[:-1], float(result.x[-1])
+        self.stopped_epoch = int(result.nit)
+
+        logging.info('Training complete (stopped at iteration %s)', self.stopped_epoch)
+
+        logging.debug('Weights: %s', self.weights)
+        logging.debug('Bias: %s', self.bias)
+
+
+    def _objective(self, params: np.ndarray) -> tuple:
+        weights, bias = params[:-1], params[-1]
+
+        y_predicted = self.sigmoid(np.dot(self.x, weights) + bias)
+        delta_prediction = (y_predicted - self.y) / self.m
+
+        loss = log_loss(self.y, y_predicted) + self.regularization / 2 * np.dot(weights, weights)
+        gradient = np.append(
+            np.dot(self.x.T, delta_prediction) + self.regularization * weights,
+            np.sum(delta_prediction)
+        )
+
+        return float(loss), gradient
@@ -0,0 +1,204 @@
+"""
+This module implements a logistic regression model using mini-batch gradient descent.
+"""
+
+import logging
+
+import numpy as np
+
+from dslr.model.logreg import LogReg
+from dslr.model.optimizer import Optimizer, Schedule
+
+
+MINIBATCH_LEARNING_RATE = 1e-1
+MINIBATCH_EPOCHS        = 200
+MINIBATCH_SIZE          = 32
+
+SHUFFLE_SEED = 0
+
+
+# pylint: disable=too-many-instance-attributes,duplicate-code
+class LogRegMiniBatch(LogReg):
+    """
+    This class implements a logistic regression model using mini-batch gradient descent.
+
+    Each epoch visits the rows in a new random order, split into batches of
+    `batch_size` rows. The order is a permutation of the row indices, so the
+    data itself is never shuffled, and the gradient of each batch is a single
+    matrix multiplication.
+    """
+
+    x: np.ndarray
+    y: np.ndarray
+
+    m: int
+    n: int
+
+    batch_size: int
+    seed: int
+
+    fused = True
+    resumable = True
+
+
+    # pylint: disable=too-many-arguments,too-many-positional-arguments
+    def __init__(
+        self,
+        learning_rate: float = MINIBATCH_LEARNING_RATE,
+        epochs: int = MINIBATCH_EPOCHS,
+        batch_size: int = MINIBATCH_SIZE,
+        seed: int = SHUFFLE_SEED,
+        optimizer: str | Optimizer = 'sgd',
+        schedule: str | Schedule | None = None
+    ) -> None:
+        """
+        Initialize the model.
+
+        Args:
+            learning_rate (float): The learning rate.
+            epochs (int): The number of passes over the data.
+            batch_size (int): The number of rows in each batch.
+            seed (int): The seed of the order the rows are visited in.
+            optimizer (str | Optimizer): The optimizer turning the gradient into an update,
+                by name or as an instance.
+            schedule (str | Schedule | None): The schedule of the learning rate, by name
+                or as a function of the epoch and the number of epochs, constant if None.
+        """
+
+        self.learning_rate = learning_rate
+        self.epochs = epochs
+        self.batch_size = batch_size
+        self.seed = seed
+        self.optimizer = optimizer
+        self.schedule = schedule
+
+        self._rng: np.random.Generator | None = None
+
+
+    def predict(self, x: np.ndarray) -> float:
+        """
+        Predict the class of the input.
+
+        Args:
+            x (np.ndarray): The input values.
+
+        Returns:
+            float: The probability of the input being in the class.
+        """
+
+        linear_model = np.dot(x, self.weights) + self.bias
+        y_predicted = self.sigmoid(linear_model)
+
+        return y_predicted # type: ignore
+
+
+    def fit(self, x: np.ndarray, y: np.ndarray) -> None:
+        """
+        Fit the model to the data using mini-batch gradient descent.
+
+        If `y` has one column per class, the model is fitted to every class
+        at once, with a (features x classes) weight matrix.
+
+        The checkpoint holds the state of the generator of the order of the
+        rows, so that a resumed training visits them in the same order.
+
+        Args:
+            x (np.ndarray): The input values.
+            y (np.ndarray): The target values.
+
+        Returns:
+            None
+        """
+
+        self.m, self.n = x.shape
+        self.x, self.y = x, y
+
+        self.weights, self.bias = self._initial_weights(self.n, y)
+        self._start_optimizer()
+
+        rng = np.random.default_rng(self.seed)
+
+        epoch = 0
+        if (state := self._resume()) is not None:
+            epoch = state['epoch']
+            rng.bit_generator.state = state['rng']
+
+        logging.info('Starting training')
+
+        for epoch in range(epoch + 1, self.epochs + 1):
+            self._start_epoch(epoch)
+            order = rng.permutation(self.m)
+
+            for start in range(0, self.m, self.batch_size):
+                self._update_weights(order[start:start + self.batch_size])
+
+            self._save_checkpoint(epoch, rng=rng.bit_generator.state)
+
+        self._save_checkpoint(epoch, True, rng=rng.bit_generator.state)
+
+        logging.info('Training complete')
+
+        logging.debug('Weights: %s', self.weights)
+        logging.debug('Bias: %s', self.bias)
+
+
+    def partial_fit(self, x: np.ndarray, y: np.ndarray) -> None:
+        """
+        Update the model with one pass of mini-batch gradient descent over a chunk of the data.
+
+        The rows of each chunk are visited in a random order, drawn from a
+        generator seeded with `seed` by the first chunk.
+
+        Args:
+            x (np.ndarray): The input values of the chunk.
+            y (np.ndarray): The target values of the chunk.
+        """
+
+        self._start_partial_fit(x, y)
+
+        if self._rng is None:
+            self._rng = np.random.default_rng(self.seed)
+
+        self.m, self.n = x.shape
+        self.x, self.y = x, y
+
+        order = self._rng.permutation(self.m)
+        for start in range(0, self.m, self.batch_size):
+            self._update_weights(order[start:start + self.batch_size])
+
+
+    def select(self, index: int) -> 'LogRegMiniBatch':
+        """
+        Extract the model of one class from a model fitted to every class at once.
+
+        Args:
+            index (int): The index of the class.
+
+        Returns:
+            LogRegMiniBatch: The model of the class.
+        """
+
+        model: LogRegMiniBatch = super().select(index) # type: ignore
+        model.y = self.y[:, index]
+
+        return model
+
+
+    def _update_weights(self, batch: np.ndarray) -> None:
+        x, y = self.x[batch], self.y[batch]
+
+        linear_model = np.dot(x, self.weights) + self.bias
+        y_predicted = self.sigmoid(linear_model)
+
+        delta_prediction = y_predicted - y
+        delta_weight = (1 / batch.size) * np.dot(x.T, delta_prediction)
+        delta_bias = (1 / batch.size) * np.sum(delta_prediction, axis=0)
+
+        delta_weight, delta_bias = self._optimizer.direction(delta_weight, delta_bias)
+
+        self.weights -= self._rate * delta_weight
+
+        if self.y.ndim > 1:
+            self.bias -= self._rate * delta_bias
+        else:
+            self.bias -= float(self._rate * delta_bias)
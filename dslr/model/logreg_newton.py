@@ -0,0 +1,178 @@
+"""
+This module implements a logistic regression model using Newton's method.
+"""
+
+import logging
+
+import numpy as np
+
+from dslr.model.logreg import LogReg
+
+
+NEWTON_LEARNING_RATE  = 1.0
+NEWTON_EPOCHS         = 100
+NEWTON_TOLERANCE      = 1e-8
+NEWTON_REGULARIZATION = 1e-4
+
+
+# Second-order methods need the whole dataset, so `partial_fit` is not supported.
+# pylint: disable=too-many-instance-attributes,duplicate-code,abstract-method
+class LogRegNewton(LogReg):
+    """
+    This class implements a logistic regression model using Newton's method,
+    also known as Iteratively Reweighted Least Squares (IRLS).
+
+    Each iteration solves the (features + 1) linear system of the Hessian of
+    the loss, so that training converges in a handful of iterations when the
+    number of features is small. A small L2 penalty on the weights keeps the
+    Hessian invertible when a class is separable.
+    """
+
+    x: np.ndarray
+    y: np.ndarray
+
+    m: int
+    n: int
+
+    tolerance: float
+    regularization: float
+
+    stopped_epoch: int | np.ndarray
+
+    fused = True
+
+
+    # pylint: disable=too-many-arguments,too-many-positional-arguments
+    def __init__(
+        self,
+        learning_rate: float = NEWTON_LEARNING_RATE,
+        epochs: int = NEWTON_EPOCHS,
+        tolerance: float = NEWTON_TOLERANCE,
+        regularization: float = NEWTON_REGULARIZATION
+    ) -> None:
+        """
+        Initialize the model.
+
+        Args:
+            learning_rate (float): The fraction of the Newton step taken at each iteration.
+            epochs (int): The maximum number of iterations.
+            tolerance (float): Stop once the norm of the Newton step is below this value.
+            regularization (float): The L2 penalty on the weights.
+        """
+
+        self.learning_rate = learning_rate
+        self.epochs = epochs
+        self.tolerance = tolerance
+        self.regularization = regularization
+
+
+    def predict(self, x: np.ndarray) -> float:
+        """
+        Predict the class of the input.
+
+        Args:
+            x (np.ndarray): The input values.
+
+        Returns:
+            float: The probability of the input being in the class.
+        """
+
+        linear_model = np.dot(x, self.weights) + self.bias
+        y_predicted = self.sigmoid(linear_model)
+
+        return y_predicted # type: ignore
+
+
+    def fit(self, x: np.ndarray, y: np.ndarray) -> None:
+        """
+        Fit the model to the data using Newton's method.
+
+        If `y` has one column per class, the model is fitted to every class
+        at once, solving one linear system per class at each iteration.
+
+        Args:
+            x (np.ndarray): The input values.
+            y (np.ndarray): The target values.
+
+        Returns:
+            None
+        """
+
+        self.m, self.n = x.shape
+        self.x, self.y = x, y
+
+        targets = y.reshape(self.m, -1)
+        classes = targets.shape[1]
+
+        # The bias is the weight of a constant feature, which is not penalized.
+        design = np.hstack([x, np.ones((self.m, 1))])
+        penalty = np.diag([self.regularization] * self.n + [0.0])
+
+        weights, bias = self._initial_weights(self.n, y)
+        params = np.vstack([weights.reshape(self.n, classes), np.reshape(bias, (1, classes))])
+        stopped_epoch = np.full(classes, self.epochs)
+        active = np.ones(classes, dtype=bool)
+
+        logging.info('Starting training')
+
+        for epoch in range(1, self.epochs + 1):
+            step = self._newton_step(design, targets, params, penalty)
+            params -= self.learning_rate * step * active
+
+            stopped = active & (np.linalg.norm(step, axis=0) < self.tolerance)
+            stopped_epoch[stopped] = epoch
+            active &= ~stopped
+
+            if not active.any():
+                break
+
+        self.weights, self.bias = params[:-1], params[-1]
+        self.stopped_epoch = stopped_epoch
+
+        if y.ndim == 1:
+            self.weights, self.bias = self.weights[:, 0], float(self.bias[0])
+            self.stopped_epoch = int(stopped_epoch[0])
+
+        logging.info('Training complete (stopped at iteration %s)', self.stopped_epoch)
+
+        logging.debug('Weights: %s', self.weights)
+        logging.debug('Bias: %s', self.bias)
+
+
+    def _newton_step(
+        self,
+        design: np.ndarray,
+        targets: np.ndarray,
+        params: np.ndarray,
+        penalty: np.ndarray
+    ) -> np.ndarray:
+        y_predicted = self.sigmoid(np.dot(design, params))
+
+        gradient = np.dot(design.T, y_predicted - targets) / self.m + np.dot(penalty, params)
+
+        curvature = y_predicted * (1 - y_predicted)
+        hessian = np.einsum('ik,ij,il->kjl', curvature, design, design) / self.m + penalty
+
+        # A tiny ridge keeps the system solvable when the bias is not determined.
+        hessian += np.eye(design.shape[1]) * 1e-12
+
+        return np.linalg.solve(hessian, gradient.T[..., None])[..., 0].T
+
+
+    def select(self, index: int) -> 'LogRegNewton':
+        """
+        Extract the model of one class from a model fitted to every class at once.
+
+        Args:
+            index (int): The index of the class.
+
+        Returns:
+            LogRegNewton: The model of the class.
+        """
+
+        model: LogRegNewton = super().select(index) # type: ignore
+
+        model.y = self.y[:, index]
+        model.stopped_epoch = int(self.stopped_epoch[index]) # type: ignore
+
+        return model
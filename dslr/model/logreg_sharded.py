@@ -0,0 +1,235 @@
+"""
+This module implements a logistic regression model using batch gradient descent,
+with the gradient of each epoch computed over shards of rows in parallel.
+"""
+
+import logging
+import multiprocessing
+from multiprocessing.connection import Connection
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+
+from dslr.model.logreg_batch import BATCH_EPOCHS, BATCH_LEARNING_RATE, LogRegBatch
+from dslr.model.optimizer import Optimizer, Schedule
+from dslr.model.pool import start_worker
+from dslr.parallel import ArraySpec, SharedArray, attached, cpu_count, resolve_jobs
+
+
+# pylint: disable=too-many-instance-attributes,duplicate-code
+class LogRegSharded(LogRegBatch):
+    """
+    This class implements a logistic regression model using batch gradient descent,
+    over a dataset split into shards of rows.
+
+    Each shard is owned by a worker process, which attaches once to its rows in
+    shared memory. Every epoch, the weights are sent to the workers, each computes
+    the gradient over its rows, and the gradients are reduced into the gradient
+    over every row.
+    Since only the weights and the gradients go through the pipes, an epoch reads
+    the dataset from as many cores as there are shards.
+
+    The models are the models of `LogRegBatch`, up to rounding.
+    """
+
+    shards: int
+
+
+    # pylint: disable=too-many-arguments,too-many-positional-arguments
+    def __init__(
+        self,
+        learning_rate: float = BATCH_LEARNING_RATE,
+        epochs: int = BATCH_EPOCHS,
+        tolerance: float | None = None,
+        loss_tolerance: float | None = None,
+        patience: int | None = None,
+        validation_split: float = .2,
+        shards: int = -1,
+        optimizer: str | Optimizer = 'sgd',
+        schedule: str | Schedule | None = None
+    ) -> None:
+        """
+        Initialize the model.
+
+        Args:
+            learning_rate (float): The learning rate.
+            epochs (int): The maximum number of epochs.
+            tolerance (float | None): Stop once the norm of the gradient is below this value.
+            loss_tolerance (float | None): Stop once the relative change of the
+                training loss between two epochs is below this value.
+            patience (int | None): Stop once the validation loss has not improved
+                for this many epochs, and keep the best weights.
+            validation_split (float): The fraction of the rows held out for validation
+                when `patience` is set.
+            shards (int): The number of worker processes, -1 for one per core.
+            optimizer (str | Optimizer): The optimizer turning the gradient into an update,
+                by name or as an instance.
+            schedule (str | Schedule | None): The schedule of the learning rate, by name
+                or as a function of the epoch and the number of epochs, constant if None.
+        """
+
+        super().__init__(learning_rate, epochs, tolerance, loss_tolerance, patience,
+                         validation_split, optimizer, schedule)
+
+        self.shards = shards
+        self._pool: _ShardPool | None = None
+
+
+    def fit(self, x: np.ndarray, y: np.ndarray) -> None:
+        """
+        Fit the model to the data using batch gradient descent over shards of rows.
+
+        Args:
+            x (np.ndarray): The input values.
+            y (np.ndarray): The target values.
+        """
+
+        try:
+            super().fit(x, y)
+        finally:
+            self._close_pool()
+
+
+    def partial_fit(self, x: np.ndarray, y: np.ndarray) -> None:
+        """
+        Not supported: the workers attach to the rows they own once, so each chunk would
+        start and stop a new pool of processes, which is slower than `LogRegBatch`.
+
+        Args:
+            x (np.ndarray): The input values of the chunk.
+            y (np.ndarray): The target values of the chunk.
+
+        Raises:
+            NotImplementedError: Always.
+        """
+
+        raise NotImplementedError(f'{type(self).__name__} does not support partial_fit, '
+                                  'use LogRegBatch to stream the data.')
+
+
+    def _close_pool(self) -> None:
+        if self._pool is not None:
+            self._pool.close()
+            self._pool = None
+
+
+    def _gradient(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray | None]:
+        # The pool is started once the training rows are known, after the validation split.
+        if self._pool is None:
+            self._pool = _ShardPool(self.x, self.y, self.shards, self.loss_tolerance is not None)
+
+        return self._pool.gradient(self.weights, self.bias)
+
+
+class _ShardPool:
+    """
+    This class runs the worker processes owning the shards of a dataset.
+    """
+
+    def __init__(self, x: np.ndarray, y: np.ndarray, shards: int, with_loss: bool) -> None:
+        shards = min(resolve_jobs(shards), x.shape[0])
+        threads = max(1, cpu_count() // shards)
+
+        logging.info('Splitting %s rows into %s shards of %s threads', x.shape[0], shards, threads)
+
+        self._shared = {
+            'x': SharedArray(np.ascontiguousarray(x, dtype=np.float64)),
+            'y': SharedArray(np.ascontiguousarray(y, dtype=np.float64)),
+        }
+        specs = {name: shared.spec for name, shared in self._shared.items()}
+
+        bounds = np.linspace(0, x.shape[0], shards + 1).astype(int)
+        self._fractions = np.diff(bounds) / x.shape[0]
+
+        self._connections: List[Connection] = []
+        self._processes: List[multiprocessing.Process] = []
+
+        for start, stop in zip(bounds[:-1], bounds[1:]):
+            connection, worker_connection = multiprocessing.Pipe()
+            process = multiprocessing.Process(
+                target=_serve_shard,
+                args=(worker_connection, specs, int(start), int(stop), threads, with_loss),
+                daemon=True,
+            )
+            process.start()
+            worker_connection.close()
+
+            self._connections.append(connection)
+            self._processes.append(process)
+
+
+    def gradient(
+        self,
+        weights: np.ndarray,
+        bias: Any
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray | None]:
+        """
+        Compute the gradient over every row, as the mean of the gradient of each
+        shard weighted by its number of rows.
+        """
+
+        for connection in self._connections:
+            connection.send((weights, bias))
+
+        delta_weight, delta_bias, loss = 0, 0, 0
+        for connection, fraction in zip(self._connections, self._fractions):
+            reply = connection.recv()
+            if isinstance(reply, BaseException):
+                raise reply
+
+            shard_weight, shard_bias, shard_loss = reply
+            delta_weight = delta_weight + fraction * shard_weight
+            delta_bias = delta_bias + fraction * shard_bias
+            loss = None if shard_loss is None else loss + fraction * shard_loss
+
+        return delta_weight, delta_bias, loss # type: ignore
+
+
+    def close(self) -> None:
+        """
+        Stop the workers, and release the shared dataset.
+        """
+
+        for connection in self._connections:
+            try:
+                connection.send(None)
+            except OSError:
+                pass
+            connection.close()
+
+        for process in self._processes:
+            process.join()
+
+        for shared in self._shared.values():
+            shared.close()
+
+
+# pylint: disable=too-many-arguments,too-many-positional-arguments
+def _serve_shard(
+    connection: Connection,
+    specs: Dict[str, ArraySpec],
+    start: int,
+    stop: int,
+    threads: int,
+    with_loss: bool
+) -> None:
+    # pylint: disable=protected-access
+    start_worker(specs, threads)
+
+    # The shard computes its gradient like a batch model fitted to its rows only.
+    shard = LogRegBatch(loss_tolerance=0 if with_loss else None)
+    shard.x = attached('x')[start:stop]
+    shard.y = attached('y')[start:stop]
+    shard.m, shard.n = shard.x.shape
+
+    while (message := connection.recv()) is not None:
+        shard.weights, shard.bias = message
+
+        try:
+            connection.send(shard._gradient())
+        # The error is raised again by the process fitting the model.
+        # pylint: disable=broad-except
+        except Exception as e:
+            connection.send(e)
+
+    connection.close()
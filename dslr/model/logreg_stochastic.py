@@ -3,11 +3,11 @@ This module implements a logistic regression model using gradient descent.
 """
 
 import logging
-from itertools import islice, cycle
 
 import numpy as np
 
 from dslr.model.logreg import LogReg
+from dslr.model.optimizer import Optimizer, Schedule
 
 
 LEARNING_RATE = 0.01
@@ -26,11 +26,15 @@ class LogRegStochastic(LogReg):
     m: int
     n: int
 
+    resumable = True
+
 
     def __init__(
             self,
             learning_rate: float = LEARNING_RATE,
-            epochs: int = EPOCHS
+            epochs: int = EPOCHS,
+            optimizer: str | Optimizer = 'sgd',
+            schedule: str | Schedule | None = None
         ) -> None:
         """
         Initialize the model.
@@ -38,10 +42,16 @@ class LogRegStochastic(LogReg):
         Args:
             learning_rate (float): The learning rate.
             epochs (int): The number of epochs.
+            optimizer (str | Optimizer): The optimizer turning the gradient into an update,
+                by name or as an instance.
+            schedule (str | Schedule | None): The schedule of the learning rate, by name
+                or as a function of the epoch and the number of epochs, constant if None.
         """
 
         self.learning_rate = learning_rate
         self.epochs = epochs
+        self.optimizer = optimizer
+        self.schedule = schedule
 
 
     def predict(self, x: np.ndarray) -> float:
@@ -64,6 +74,9 @@ class LogRegStochastic(LogReg):
         """
         Fit the model to the data using stochastic gradient descent.
 
+        Each epoch updates the model with one row, the rows being visited in
+        order, so that the checkpoint only needs the number of epochs done.
+
         Args:
             x (np.ndarray): The input values.
             y (np.ndarray): The target values.
@@ -74,13 +87,21 @@ class LogRegStochastic(LogReg):
         self.m, self.n = x.shape
         self.x, self.y = x, y
 
-        self.weights = np.zeros(self.n)
-        self.bias = 0
+        self.weights, self.bias = self._initial_weights(self.n, y)
+        self._start_optimizer()
+
+        epoch = 0
+        if (state := self._resume()) is not None:
+            epoch = state['epoch']
 
         logging.info('Starting training')
 
-        for index in islice(cycle(range(self.m)), self.epochs):
-            self._update_weights(index)
+        for epoch in range(epoch + 1, self.epochs + 1):
+            self._start_epoch(epoch)
+            self._update_weights((epoch - 1) % self.m)
+            self._save_checkpoint(epoch)
+
+        self._save_checkpoint(epoch, True)
 
         logging.info('Training complete')
 
@@ -88,6 +109,25 @@ class LogRegStochastic(LogReg):
         logging.debug('Bias: %s', self.bias)
 
 
+    def partial_fit(self, x: np.ndarray, y: np.ndarray) -> None:
+        """
+        Update the model with one pass of stochastic gradient descent over a chunk
+        of the data, visiting its rows in order.
+
+        Args:
+            x (np.ndarray): The input values of the chunk.
+            y (np.ndarray): The target values of the chunk.
+        """
+
+        self._start_partial_fit(x, y)
+
+        self.m, self.n = x.shape
+        self.x, self.y = x, y
+
+        for index in range(self.m):
+            self._update_weights(index)
+
+
     def _update_weights(self, index: int) -> None:
         linear_model = np.dot(self.x[index], self.weights) + self.bias
         y_predicted = self.sigmoid(linear_model)
@@ -96,5 +136,7 @@ class LogRegStochastic(LogReg):
         delta_weight = self.x[index] * delta_prediction + (self.weights / self.m)
         delta_bias = (1 / self.m) * delta_prediction
 
-        self.weights -= self.learning_rate * delta_weight
-        self.bias -= self.learning_rate * delta_bias
+        delta_weight, delta_bias = self._optimizer.direction(delta_weight, delta_bias)
+
+        self.weights -= self._rate * delta_weight
+        self.bias -= self._rate * delta_bias
@@ -0,0 +1,389 @@
+"""
+This module implements the optimizers turning the gradient of a model into
+its update, and the schedules of the learning rate.
+
+An optimizer keeps the state it needs from one update to the next, such as a
+running mean of the gradients, one value per weight. It is created anew by
+every fit, so that the models of each class never share their state. A
+schedule multiplies the learning rate of each epoch by a factor, which only
+depends on the number of epochs done.
+"""
+
+import copy
+import math
+from typing import Any, Callable, Dict, Tuple
+
+import numpy as np
+
+
+# pylint: disable=too-few-public-methods
+class Optimizer:
+    """
+    This class implements plain gradient descent, which updates the weights
+    with the gradient as it is.
+
+    The other optimizers override `direction`, and keep their state in
+    `_state`, so that it can be saved in a checkpoint.
+    """
+
+    name = 'sgd'
+
+
+    def __init__(self) -> None:
+        """
+        Initialize the optimizer, without any state until the first update.
+        """
+
+        self._state: Dict[str, Any] = {}
+
+
+    def direction(
+        self,
+        delta_weight: np.ndarray,
+        delta_bias: Any
+    ) -> Tuple[np.ndarray, Any]:
+        """
+        Get the direction of the update, which is multiplied by the learning rate.
+
+        Args:
+            delta_weight (np.ndarray): The gradient of the weights.
+            delta_bias (Any): The gradient of the bias.
+
+        Returns:
+            Tuple[np.ndarray, Any]: The update of the weights and of the bias.
+        """
+
+        return delta_weight, delta_bias
+
+
+    def state(self) -> Dict[str, Any]:
+        """
+        Get the state of the optimizer, to save it in a checkpoint.
+
+        Returns:
+            Dict[str, Any]: The state, empty until the first update.
+        """
+
+        return dict(self._state)
+
+
+    def load_state(self, state: Dict[str, Any]) -> None:
+        """
+        Restore the state of the optimizer saved in a checkpoint.
+
+        Args:
+            state (Dict[str, Any]): The state returned by `state`.
+        """
+
+        self._state = dict(state)
+
+
+class Momentum(Optimizer):
+    """
+    This class implements gradient descent with momentum, which updates the
+    weights with a running sum of the gradients, decayed by `momentum`.
+    """
+
+    name = 'momentum'
+
+
+    def __init__(self, momentum: float = .9) -> None:
+        """
+        Initialize the optimizer.
+
+        Args:
+            momentum (float): The fraction of the previous update kept by the next one.
+        """
+
+        super().__init__()
+        self.momentum = momentum
+
+
+    def direction(
+        self,
+        delta_weight: np.ndarray,
+        delta_bias: Any
+    ) -> Tuple[np.ndarray, Any]:
+        state = self._state
+
+        state['velocity_weight'] = self.momentum * state.get('velocity_weight', 0) + delta_weight
+        state['velocity_bias'] = self.momentum * state.get('velocity_bias', 0) + delta_bias
+
+        return state['velocity_weight'], state['velocity_bias']
+
+
+class Nesterov(Momentum):
+    """
+    This class implements Nesterov's accelerated gradient, which updates the
+    weights with the gradient plus the momentum of the next update.
+    """
+
+    name = 'nesterov'
+
+
+    def direction(
+        self,
+        delta_weight: np.ndarray,
+        delta_bias: Any
+    ) -> Tuple[np.ndarray, Any]:
+        velocity_weight, velocity_bias = super().direction(delta_weight, delta_bias)
+
+        return (delta_weight + self.momentum * velocity_weight,
+                delta_bias + self.momentum * velocity_bias)
+
+
+class AdaGrad(Optimizer):
+    """
+    This class implements AdaGrad, which divides the gradient of each weight
+    by the root of the sum of its squares so far.
+    """
+
+    name = 'adagrad'
+
+
+    def __init__(self, epsilon: float = 1e-8) -> None:
+        """
+        Initialize the optimizer.
+
+        Args:
+            epsilon (float): The value added to the divisor, so that it is never zero.
+        """
+
+        super().__init__()
+        self.epsilon = epsilon
+
+
+    def direction(
+        self,
+        delta_weight: np.ndarray,
+        delta_bias: Any
+    ) -> Tuple[np.ndarray, Any]:
+        state = self._state
+
+        state['squares_weight'] = state.get('squares_weight', 0) + delta_weight ** 2
+        state['squares_bias'] = state.get('squares_bias', 0) + delta_bias ** 2
+
+        return (delta_weight / (np.sqrt(state['squares_weight']) + self.epsilon),
+                delta_bias / (np.sqrt(state['squares_bias']) + self.epsilon))
+
+
+class Adam(Optimizer):
+    """
+    This class implements Adam, which divides a running mean of the gradient
+    of each weight by the root of a running mean of its squares.
+    """
+
+    name = 'adam'
+
+
+    def __init__(self, beta1: float = .9, beta2: float = .999, epsilon: float = 1e-8) -> None:
+        """
+        Initialize the optimizer.
+
+        Args:
+            beta1 (float): The decay of the running mean of the gradients.
+            beta2 (float): The decay of the running mean of their squares.
+            epsilon (float): The value added to the divisor, so that it is never zero.
+        """
+
+        super().__init__()
+        self.beta1 = beta1
+        self.beta2 = beta2
+        self.epsilon = epsilon
+
+
+    def direction(
+        self,
+        delta_weight: np.ndarray,
+        delta_bias: Any
+    ) -> Tuple[np.ndarray, Any]:
+        state = self._state
+        state['steps'] = steps = state.get('steps', 0) + 1
+
+        for name, gradient in (('weight', delta_weight), ('bias', delta_bias)):
+            state[f'mean_{name}'] = (self.beta1 * state.get(f'mean_{name}', 0)
+                                     + (1 - self.beta1) * gradient)
+            state[f'squares_{name}'] = (self.beta2 * state.get(f'squares_{name}', 0)
+                                        + (1 - self.beta2) * gradient ** 2)
+
+        # The running means start from zero, so they are corrected for the first updates.
+        mean_correction = 1 - self.beta1 ** steps
+        squares_correction = 1 - self.beta2 ** steps
+
+        def update(name: str) -> Any:
+            mean = state[f'mean_{name}'] / mean_correction
+            return mean / (np.sqrt(state[f'squares_{name}'] / squares_correction) + self.epsilon)
+
+        return update('weight'), update('bias')
+
+
+class StepDecay:
+    """
+    This class implements a schedule dividing the learning rate by a constant
+    factor every few epochs.
+    """
+
+    name = 'step'
+
+
+    def __init__(self, step_size: int | None = None, gamma: float = .5) -> None:
+        """
+        Initialize the schedule.
+
+        Args:
+            step_size (int | None): The number of epochs between two drops,
+                a quarter of the epochs by default.
+            gamma (float): The factor the learning rate is multiplied by at each drop.
+        """
+
+        self.step_size = step_size
+        self.gamma = gamma
+
+
+    def __call__(self, epoch: int, epochs: int) -> float:
+        """
+        Get the factor of the learning rate.
+
+        Args:
+            epoch (int): The number of epochs done.
+            epochs (int): The number of epochs of the training.
+
+        Returns:
+            float: The factor of the learning rate.
+        """
+
+        step_size = self.step_size or max(1, epochs // 4)
+        return self.gamma ** (epoch // step_size)
+
+
+class CosineAnnealing:
+    """
+    This class implements a schedule decreasing the learning rate along half a
+    cosine, from its initial value at the first epoch to its minimum at the last.
+    """
+
+    name = 'cosine'
+
+
+    def __init__(self, minimum: float = 0.) -> None:
+        """
+        Initialize the schedule.
+
+        Args:
+            minimum (float): The factor of the learning rate at the last epoch.
+        """
+
+        self.minimum = minimum
+
+
+    def __call__(self, epoch: int, epochs: int) -> float:
+        """
+        Get the factor of the learning rate.
+
+        Args:
+            epoch (int): The number of epochs done.
+            epochs (int): The number of epochs of the training.
+
+        Returns:
+            float: The factor of the learning rate.
+        """
+
+        return self.minimum + (1 - self.minimum) * (1 + math.cos(math.pi * epoch / epochs)) / 2
+
+
+class InverseTimeDecay:
+    """
+    This class implements a schedule dividing the learning rate by a linear
+    function of the number of epochs done.
+    """
+
+    name = 'inverse-time'
+
+
+    def __init__(self, decay: float | None = None) -> None:
+        """
+        Initialize the schedule.
+
+        Args:
+            decay (float | None): The increase of the divisor at each epoch, so that
+                the learning rate is divided by 11 at the last epoch by default.
+        """
+
+        self.decay = decay
+
+
+    def __call__(self, epoch: int, epochs: int) -> float:
+        """
+        Get the factor of the learning rate.
+
+        Args:
+            epoch (int): The number of epochs done.
+            epochs (int): The number of epochs of the training.
+
+        Returns:
+            float: The factor of the learning rate.
+        """
+
+        decay = 10 / epochs if self.decay is None else self.decay
+        return 1 / (1 + decay * epoch)
+
+
+Schedule = Callable[[int, int], float]
+
+OPTIMIZERS = {optimizer.name: optimizer for optimizer in (
+    Optimizer, Momentum, Nesterov, AdaGrad, Adam
+)}
+
+SCHEDULES = {schedule.name: schedule for schedule in (
+    StepDecay, CosineAnnealing, InverseTimeDecay
+)}
+
+
+def get_optimizer(optimizer: str | Optimizer) -> Optimizer:
+    """
+    Get a new optimizer, without any state.
+
+    Args:
+        optimizer (str | Optimizer): The name of the optimizer, with its default
+            parameters, or an optimizer to copy.
+
+    Returns:
+        Optimizer: The optimizer.
+
+    Raises:
+        ValueError: If there is no optimizer of this name.
+    """
+
+    if isinstance(optimizer, Optimizer):
+        fresh = copy.copy(optimizer)
+        fresh.load_state({})
+        return fresh
+
+    if optimizer not in OPTIMIZERS:
+        raise ValueError(f'Unknown optimizer {optimizer}, expected one of {list(OPTIMIZERS)}.')
+
+    return OPTIMIZERS[optimizer]()
+
+
+def get_schedule(schedule: str | Schedule | None) -> Schedule | None:
+    """
+    Get a schedule of the learning rate.
+
+    Args:
+        schedule (str | Schedule | None): The name of the schedule, with its
+            default parameters, a schedule, or None for a constant learning rate.
+
+    Returns:
+        Schedule | None: The schedule.
+
+    Raises:
+        ValueError: If there is no schedule of this name.
+    """
+
+    if not isinstance(schedule, str):
+        return schedule
+
+    if schedule not in SCHEDULES:
+        raise ValueError(f'Unknown schedule {schedule}, expected one of {list(SCHEDULES)}.')
+
+    return SCHEDULES[schedule]()
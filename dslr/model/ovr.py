@@ -2,24 +2,70 @@
 OVR (One vs Rest) classifier
 """
 
+import copy
 import sys
 import logging
 import json
-from typing import Type
+from typing import Any, List, Tuple, Type
 
 import numpy as np
+import pandas as pd
 
+from dslr.hogwarts import HOGWARTS_HOUSES
+from dslr.model.binary import load_binary, save_binary
+from dslr.model.checkpoint import Checkpoint
 from dslr.model.logreg import LogReg
+from dslr.preprocessing import Preprocessing
 
 
+# pylint: disable=too-many-instance-attributes
 class OvrClassifier:
     """
     This class implements a One vs Rest classifier.
+
+    Models are saved as JSON, or in the binary format if the path ends with
+    `.npz`, which is loaded as one memory-mapped weight matrix.
+
+    Attributes:
+        n_jobs (int): The number of processes the models of each class are fitted in,
+            -1 for one per core.
+        classes (List[str]): The label of each class.
+        preprocessing (Preprocessing | None): The preprocessing of the training
+            dataset, saved with the models.
+        checkpoint (Checkpoint | None): The checkpoint the state of `fit` is saved to.
     """
 
-    def __init__(self, model: Type[LogReg]):
+    n_jobs: int
+    classes: List[str]
+    checkpoint: Checkpoint | None
+
+    def __init__(self, model: Type[LogReg], n_jobs: int = 1, **model_args: Any):
         self.model = model
+        self.model_args = model_args
+        self.n_jobs = n_jobs
         self.models = []
+        self.classes = list(HOGWARTS_HOUSES)
+        self.checkpoint = None
+        self._preprocessing: Preprocessing | None = None
+        self._partial: LogReg | None = None
+        self._stacked: Tuple[np.ndarray, np.ndarray] | None = None
+        self._fused: Tuple[np.ndarray, np.ndarray] | None = None
+        self._warm_start: OvrClassifier | None = None
+
+
+    @property
+    def preprocessing(self) -> Preprocessing | None:
+        """
+        The preprocessing of the training dataset, saved with the models.
+        """
+
+        return self._preprocessing
+
+
+    @preprocessing.setter
+    def preprocessing(self, preprocessing: Preprocessing | None) -> None:
+        self._preprocessing = preprocessing
+        self._fused = None
 
 
     def fit(self, x: np.ndarray, y: np.ndarray) -> None:
@@ -27,30 +73,207 @@ class OvrClassifier:
         Fit the model to the data.
         """
 
-        self.models = []
-        for i in range(y.shape[1]):
-            logging.info('Training model for class #%s', i)
+        self.models = self.model.fit_ovr(x, y, n_jobs=self.n_jobs, init=self._initial_weights(),
+                                         checkpoint=self.checkpoint, **self.model_args)
+        self._partial = None
+        self._stacked = self._fused = None
 
-            model = self.model()
-            model.fit(x, y[:, i])
 
-            self.models.append(model)
+    def warm_start(self, ovr: 'OvrClassifier') -> None:
+        """
+        Start the next fits from the models of another classifier instead of
+        zeros, such as a classifier trained on a previous version of the dataset.
+
+        If both classifiers have a preprocessing, the weights are rescaled from
+        the preprocessing of the other classifier to the preprocessing of this one
+        when the fit starts, so that the models start from the same predictions.
+
+        Args:
+            ovr (OvrClassifier): The trained classifier.
+
+        Raises:
+            ValueError: If the classifier does not have the same classes.
+        """
+
+        if ovr.classes != self.classes:
+            raise ValueError(f'Cannot warm start from a model of classes {ovr.classes}.')
+
+        self._warm_start = ovr
+
+
+    def _initial_weights(self) -> Tuple[np.ndarray, np.ndarray] | None:
+        if self._warm_start is None:
+            return None
+
+        source = self._warm_start
+        weights, bias = source._stack() # pylint: disable=protected-access
+
+        if source.preprocessing is None or self.preprocessing is None:
+            logging.warning('The models have no preprocessing, using their weights as they are')
+            return weights, bias
+
+        if source.preprocessing.features != self.preprocessing.features:
+            raise ValueError('Cannot warm start from a model trained on other features: '
+                             f'{source.preprocessing.features}.')
+
+        weights, bias = source.preprocessing.fuse(weights, bias)
+        return weights * self.preprocessing.scale[:, None], bias
+
+
+    def partial_fit(self, x: np.ndarray, y: np.ndarray) -> None:
+        """
+        Update the model with one pass over a chunk of the data.
+
+        Fused models are updated for every class at once, and the others one class at a time.
+
+        Args:
+            x (np.ndarray): The input values of the chunk.
+            y (np.ndarray): The target values of the chunk, one column per class.
+        """
+
+        if self.model.fused:
+            if self._partial is None:
+                self._partial = self.model(**self.model_args)
+
+                init = self._initial_weights()
+                if init is not None:
+                    self._partial.warm_start(*init)
+
+            self._partial.partial_fit(x, y)
+            self.models = [self._partial.select(i) for i in range(y.shape[1])]
+        else:
+            if not self.models:
+                self.models = [self.model(**self.model_args) for _ in range(y.shape[1])]
+
+                init = self._initial_weights()
+                if init is not None:
+                    for i, model in enumerate(self.models):
+                        model.warm_start(init[0][:, i], init[1][i])
+
+            for i, model in enumerate(self.models):
+                model.partial_fit(x, y[:, i])
+
+        self._stacked = self._fused = None
 
 
     def predict(self, x: np.ndarray) -> np.ndarray:
         """
-        Predict the class of the input.
+        Predict the probability of each class, scored like `predict_batch`:
+        if the classifier has a preprocessing, the input values are the
+        features as they are in the dataset.
+
+        Args:
+            x (np.ndarray): The input values, one row or one row per sample.
+
+        Returns:
+            np.ndarray: The probabilities, one row per class and one column per sample
+                if the input has one row per sample.
+        """
+
+        probabilities = self.predict_batch(np.atleast_2d(x)).T
+        return probabilities if np.ndim(x) > 1 else probabilities[:, 0]
+
+
+    def predict_batch(self, x: np.ndarray) -> np.ndarray:
+        """
+        Predict the probability of each class for every row of the input.
+
+        The weights of the models are stacked into a (features x classes)
+        matrix, so that the whole input is scored with one matrix multiplication.
+
+        If the classifier has a preprocessing, the input values are the features
+        as they are in the dataset: they are imputed, and the scaling is fused
+        into the stacked weights. The fused weights are kept until the models or
+        the preprocessing change.
+
+        Args:
+            x (np.ndarray): The input values, one row per sample.
+
+        Returns:
+            np.ndarray: The probabilities, one row per sample and one column per class.
+        """
+
+        if self.preprocessing is not None:
+            x = self.preprocessing.impute(x)
+
+        weights, bias = self._fuse()
+        return self.models[0].sigmoid(np.dot(x, weights) + bias) # type: ignore
+
+
+    def with_preprocessing(self, features: pd.DataFrame) -> 'OvrClassifier':
+        """
+        Get the classifier with a preprocessing. Models saved without one are
+        preprocessed like the features they are about to score.
+
+        Args:
+            features (pd.DataFrame): The features about to be scored.
+
+        Returns:
+            OvrClassifier: The classifier, or a copy of it with the preprocessing of the features.
+        """
+
+        if self.preprocessing is not None:
+            return self
+
+        logging.warning('The model has no preprocessing, computing it from the dataset')
+
+        ovr = copy.copy(self)
+        ovr.preprocessing = Preprocessing.fit(features)
+
+        return ovr
+
+
+    def predict_labels(self, x: np.ndarray, labels: List[str] | None = None) -> np.ndarray:
         """
+        Predict the label of every row of the input.
 
-        return np.array(
-            [model.predict(x) for model in self.models]
-        )
+        Args:
+            x (np.ndarray): The input values, one row per sample.
+            labels (List[str] | None): The label of each class, `classes` by default.
 
-    def save_models(self, path: str) -> None:
+        Returns:
+            np.ndarray: The label of the most likely class of each row.
+        """
+
+        labels = self.classes if labels is None else labels
+        return np.asarray(labels)[np.argmax(self.predict_batch(x), axis=1)]
+
+
+    def _stack(self) -> Tuple[np.ndarray, np.ndarray]:
+        if self._stacked is not None:
+            return self._stacked
+
+        weights = np.stack([model.weights for model in self.models], axis=1)
+        bias = np.array([model.bias for model in self.models], dtype=np.float64)
+
+        self._stacked = weights, bias
+        return self._stacked
+
+
+    def _fuse(self) -> Tuple[np.ndarray, np.ndarray]:
+        if self._fused is not None:
+            return self._fused
+
+        self._fused = self._stack()
+        if self.preprocessing is not None:
+            self._fused = self.preprocessing.fuse(*self._fused)
+
+        return self._fused
+
+
+    def save_models(self, path: str, dtype: str = 'float64') -> None:
         """
         Save the model to a file.
+
+        Args:
+            path (str): The path of the file, in the binary format if it ends with `.npz`.
+            dtype (str): The type the weights are stored with in the binary format.
         """
 
+        if path.endswith('.npz'):
+            self._save_binary(path, dtype)
+            return
+
         models_data = []
         for model in self.models:
             model_data = {
@@ -59,10 +282,14 @@ class OvrClassifier:
             }
             models_data.append(model_data)
 
+        data: Any = models_data
+        if self.preprocessing is not None:
+            data = {'preprocessing': self.preprocessing.to_dict(), 'models': models_data}
+
         try:
             with open(path, 'w', encoding='utf-8') as file:
                 logging.debug('Saving the model to %s', path)
-                json.dump(models_data, file)
+                json.dump(data, file)
         # pylint: disable=broad-except
         except Exception as e:
             logging.error('An error occurred while saving the model: %s', e)
@@ -71,8 +298,15 @@ class OvrClassifier:
     def load_models(self, path: str) -> None:
         """
         Load the model from a file.
+
+        Args:
+            path (str): The path of the file, in the binary format if it ends with `.npz`.
         """
 
+        if path.endswith('.npz'):
+            self._load_binary(path)
+            return
+
         model_data = []
         try:
             with open(path, 'r', encoding='utf-8') as file:
@@ -89,6 +323,17 @@ class OvrClassifier:
             logging.error('An error occurred while loading the model: %s', e)
             sys.exit(1)
 
+        # Models saved without their preprocessing are a list of models.
+        self.preprocessing = None
+        if isinstance(models_data, dict):
+            try:
+                self.preprocessing = Preprocessing.from_dict(models_data['preprocessing'])
+                models_data = models_data['models']
+            except KeyError:
+                logging.error('The model data is invalid.')
+                sys.exit(1)
+
+        self._stacked = self._fused = None
         self.models = []
         for model_data in models_data:
             model = self.model()
@@ -101,3 +346,52 @@ class OvrClassifier:
                 sys.exit(1)
 
             self.models.append(model)
+
+
+    def _save_binary(self, path: str, dtype: str) -> None:
+        weights, bias = self._stack()
+
+        header = {
+            'classes': self.classes,
+            'features': None if self.preprocessing is None else self.preprocessing.features,
+            'preprocessing': None if self.preprocessing is None else self.preprocessing.to_dict(),
+        }
+
+        try:
+            logging.debug('Saving the model to %s', path)
+            save_binary(path, weights.astype(dtype), bias, header)
+        # pylint: disable=broad-except
+        except Exception as e:
+            logging.error('An error occurred while saving the model: %s', e)
+
+
+    def _load_binary(self, path: str) -> None:
+        try:
+            logging.debug('Loading the model from %s', path)
+            weights, bias, header = load_binary(path)
+        except FileNotFoundError:
+            logging.error('The file does not exist.')
+            sys.exit(1)
+        except PermissionError:
+            logging.error('You do not have permission to read this file.')
+            sys.exit(1)
+        # pylint: disable=broad-except
+        except Exception as e:
+            logging.error('An error occurred while loading the model: %s', e)
+            sys.exit(1)
+
+        self.classes = header['classes']
+        self.preprocessing = None
+        if header['preprocessing'] is not None:
+            self.preprocessing = Preprocessing.from_dict(header['preprocessing'])
+
+        self._stacked = weights, bias
+        self._fused = None
+
+        # The models of each class are views of the stacked weights.
+        self.models = []
+        for i in range(weights.shape[1]):
+            model = self.model()
+            model.weights, model.bias = weights[:, i], float(bias[i])
+
+            self.models.append(model)
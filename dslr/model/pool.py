@@ -0,0 +1,108 @@
+"""
+This module runs the worker processes the models are fitted in.
+
+The input values are copied once to shared memory, which each worker attaches
+to when it starts, so that they are neither pickled for every task nor copied
+in every worker. Each worker limits the threads of the BLAS library to its share
+of the cores, so that the processes do not run more threads than there are cores.
+"""
+
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from typing import TYPE_CHECKING, Any, Dict, List, Tuple, Type
+
+import numpy as np
+
+from dslr.parallel import ArraySpec, SharedArray, attach, attached, cpu_count, resolve_jobs
+
+if TYPE_CHECKING:
+    from dslr.model.checkpoint import Checkpoint
+    from dslr.model.logreg import LogReg
+
+
+def start_worker(specs: Dict[str, ArraySpec], threads: int) -> None:
+    """
+    Start a worker process: limit its threads and attach it to the shared arrays.
+
+    Args:
+        specs (Dict[str, ArraySpec]): The `spec` of each shared array, by name.
+        threads (int): The number of threads of the BLAS library.
+    """
+
+    # The limits apply until the worker exits.
+    # pylint: disable=import-outside-toplevel
+    from threadpoolctl import threadpool_limits
+    threadpool_limits(threads)
+
+    attach(specs)
+
+
+# pylint: disable=too-many-arguments,too-many-positional-arguments
+def fit_parallel(
+    model: Type['LogReg'],
+    x: np.ndarray,
+    y: np.ndarray,
+    n_jobs: int,
+    model_args: Dict[str, Any],
+    inits: List[Tuple[np.ndarray, np.ndarray] | None] | None = None,
+    checkpoints: List['Checkpoint | None'] | None = None
+) -> List['LogReg']:
+    """
+    Fit one model per class, each in a process of a pool.
+
+    Args:
+        model (Type[LogReg]): The model to fit.
+        x (np.ndarray): The input values.
+        y (np.ndarray): The target values, one column per class.
+        n_jobs (int): The number of processes, as accepted by `resolve_jobs`.
+        model_args (Dict[str, Any]): The arguments of the models.
+        inits (List[Tuple[np.ndarray, np.ndarray] | None] | None): The weights and
+            the bias each model is warm started from, zeros by default.
+        checkpoints (List[Checkpoint | None] | None): The checkpoint each model is saved to.
+
+    Returns:
+        List[LogReg]: The model of each class.
+    """
+
+    workers = min(resolve_jobs(n_jobs), y.shape[1])
+    threads = max(1, cpu_count() // workers)
+
+    logging.info('Training models for %s classes in %s processes of %s threads',
+                 y.shape[1], workers, threads)
+
+    with SharedArray(np.ascontiguousarray(x)) as shared:
+        with ProcessPoolExecutor(workers, initializer=start_worker,
+                                 initargs=({'x': shared.spec}, threads)) as pool:
+            return list(pool.map(
+                _fit_class,
+                [model] * y.shape[1],
+                [model_args] * y.shape[1],
+                [np.ascontiguousarray(y[:, i]) for i in range(y.shape[1])],
+                inits or [None] * y.shape[1],
+                checkpoints or [None] * y.shape[1],
+                range(y.shape[1]),
+            ))
+
+
+def _fit_class(
+    model: Type['LogReg'],
+    model_args: Dict[str, Any],
+    y: np.ndarray,
+    init: Tuple[np.ndarray, np.ndarray] | None,
+    checkpoint: 'Checkpoint | None',
+    i: int
+) -> 'LogReg':
+    logging.info('Training model for class #%s', i)
+
+    instance = model(**model_args)
+    instance.checkpoint = checkpoint
+    if init is not None:
+        instance.warm_start(*init)
+
+    instance.fit(attached('x'), y)
+
+    # Models which keep a reference to their training data do not send it back.
+    for name in ('x', 'y'):
+        vars(instance).pop(name, None)
+
+    return instance
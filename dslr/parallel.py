@@ -0,0 +1,136 @@
+"""
+This module contains helpers to share NumPy arrays with worker processes,
+and to size the pools of these processes.
+
+Arrays are copied once into shared memory by the parent process, and each
+worker attaches to them when it starts, so that tasks only carry indices.
+"""
+
+import os
+from multiprocessing.shared_memory import SharedMemory
+from typing import Dict, Tuple
+
+import numpy as np
+
+
+ArraySpec = Tuple[str, Tuple[int, ...], str, str]
+
+_ATTACHED: Dict[str, Tuple[SharedMemory, np.ndarray]] = {}
+
+
+def cpu_count() -> int:
+    """
+    Get the number of cores the process may run on.
+
+    Returns:
+        int: The number of cores.
+    """
+
+    if hasattr(os, 'sched_getaffinity'):
+        return len(os.sched_getaffinity(0))
+
+    return os.cpu_count() or 1
+
+
+def resolve_jobs(n_jobs: int) -> int:
+    """
+    Get the number of processes to run, like scikit-learn's `n_jobs`.
+
+    Args:
+        n_jobs (int): The number of processes, or -1 for one per core,
+            -2 for one per core but one, and so on.
+
+    Returns:
+        int: The number of processes.
+
+    Raises:
+        ValueError: If `n_jobs` is 0.
+    """
+
+    if n_jobs == 0:
+        raise ValueError('n_jobs must not be 0.')
+
+    return n_jobs if n_jobs > 0 else max(1, cpu_count() + 1 + n_jobs)
+
+
+class SharedArray:
+    """
+    This class copies a NumPy array to shared memory for the lifetime of a `with` block.
+
+    Attributes:
+        array (np.ndarray): The array, backed by the shared memory.
+    """
+
+    array: np.ndarray
+
+
+    def __init__(self, array: np.ndarray) -> None:
+        """
+        Copy the array to a new shared memory block.
+
+        Args:
+            array (np.ndarray): The array to share.
+        """
+
+        order = 'F' if array.flags.f_contiguous and not array.flags.c_contiguous else 'C'
+
+        self._memory = SharedMemory(create=True, size=max(array.nbytes, 1))
+        self.array = np.ndarray(array.shape, array.dtype, self._memory.buf, order=order)
+        self.array[...] = array
+
+
+    @property
+    def spec(self) -> ArraySpec:
+        """
+        The description of the array, which workers pass to `attach`.
+        """
+
+        order = 'F' if self.array.flags.f_contiguous and not self.array.flags.c_contiguous else 'C'
+        return self._memory.name, self.array.shape, self.array.dtype.str, order
+
+
+    def close(self) -> None:
+        """
+        Release the shared memory block.
+        """
+
+        del self.array
+        self._memory.close()
+        self._memory.unlink()
+
+
+    def __enter__(self) -> 'SharedArray':
+        return self
+
+
+    def __exit__(self, *_) -> None:
+        self.close()
+
+
+def attach(specs: Dict[str, ArraySpec]) -> None:
+    """
+    Attach the worker process to shared arrays. This is meant to be used
+    as the initializer of a process pool.
+
+    Args:
+        specs (Dict[str, ArraySpec]): The `spec` of each array, by name.
+    """
+
+    for name, (memory_name, shape, dtype, order) in specs.items():
+        memory = SharedMemory(name=memory_name)
+        array = np.ndarray(shape, np.dtype(dtype), memory.buf, order=order)
+        _ATTACHED[name] = (memory, array)
+
+
+def attached(name: str) -> np.ndarray:
+    """
+    Get a shared array the worker process is attached to.
+
+    Args:
+        name (str): The name the array was given in `attach`.
+
+    Returns:
+        np.ndarray: The shared array.
+    """
+
+    return _ATTACHED[name][1]
@@ -4,19 +4,17 @@ parsing command line arguments and reading the dataset.
 """
 
 import argparse
+import inspect
 import logging
 import sys
-from typing import Any, Type, List
+from typing import Any, Dict, Iterator, Type, List
 
 import pandas as pd
 import numpy as np
-from sklearn.preprocessing import label_binarize
-from sklearn.preprocessing import normalize
 
+from dslr.cache import read_csv_cached
 from dslr.model.logreg import LogReg
-from dslr.model.logreg_batch import LogRegBatch
-from dslr.model.logreg_stochastic import LogRegStochastic
-from dslr.hogwarts import HOGWARTS_COURSES, HOGWARTS_HOUSE, HOGWARTS_HOUSES
+from dslr.hogwarts import HOGWARTS_COURSES, HOGWARTS_HOUSE, HOGWARTS_HOUSES, HOGWARTS_STUDENT
 
 
 class Parser:
@@ -37,6 +35,10 @@ class Parser:
 
         self._parser = argparse.ArgumentParser()
         self._parser.add_argument('file', type=str, help='Path to the dataset file')
+        self._parser.add_argument('--no-cache', action='store_true',
+                                  help='Parse the dataset without using or updating the cache')
+        self._parser.add_argument('--refresh-cache', action='store_true',
+                                  help='Parse the dataset again and replace its cached copy')
 
 
     def add_arg(self, name: str, argument_type: Type, argument_help: str, **kwargs: Any) -> None:
@@ -53,10 +55,34 @@ class Parser:
         self._parser.add_argument(name, type=argument_type, help=argument_help, **kwargs)
 
 
-    def read_dataset(self) -> pd.DataFrame:
+    def add_flag(self, name: str, argument_help: str) -> None:
+        """
+        This method adds a flag to the parser, which is False unless it is given.
+
+        Args:
+            name (str): The name of the flag.
+            argument_help (str): The help message for the flag.
+        """
+
+        self._parser.add_argument(name, action='store_true', help=argument_help)
+
+
+    def read_dataset(
+        self,
+        columns: List[str] | None = None,
+        float_dtype: str = 'float64'
+    ) -> pd.DataFrame:
         """
         This method reads the dataset from the file specified in the command line arguments.
 
+        The columns are parsed with the types of `schema`. The parsed dataset is
+        cached, so that later runs load it instead of parsing the file again,
+        unless `--no-cache` is given.
+
+        Args:
+            columns (List[str] | None): The columns to read, every column by default.
+            float_dtype (str): The type of the courses.
+
         Returns:
             pd.DataFrame: The dataset read from the file.
 
@@ -66,9 +92,18 @@ class Parser:
 
         args = self._parser.parse_args()
         file = args.file
+        dtype = Parser.schema(float_dtype)
 
         try:
-            return pd.read_csv(file)
+            if args.no_cache:
+                return pd.read_csv(file, usecols=columns, dtype=dtype) # type: ignore
+
+            return read_csv_cached(
+                file,
+                refresh=args.refresh_cache,
+                columns=columns,
+                dtype=dtype
+            )
         except (FileNotFoundError, PermissionError, IsADirectoryError) as e:
             logging.error('Could not read the dataset from: `%s`: %s', file, e)
             sys.exit(1)
@@ -78,26 +113,68 @@ class Parser:
             sys.exit(1)
 
 
-    @staticmethod
-    def fill_dataset(df: pd.DataFrame) -> pd.DataFrame:
+    def read_dataset_chunks(
+        self,
+        chunksize: int,
+        columns: List[str] | None = None,
+        float_dtype: str = 'float64'
+    ) -> Iterator[pd.DataFrame]:
         """
-        This method fills the missing values in the dataset.
+        This method reads the dataset from the file specified in the command line arguments,
+        one chunk of rows at a time, so that the whole file is never held in memory.
 
         Args:
-            dataset (pd.DataFrame): The dataset to fill.
+            chunksize (int): The number of rows per chunk.
+            columns (List[str] | None): The columns to read, every column by default.
+            float_dtype (str): The type of the courses.
 
         Returns:
-            pd.DataFrame: The filled dataset.
+            Iterator[pd.DataFrame]: The chunks of the dataset.
+
+        Raises:
+            SystemExit: If the dataset file could not be parsed.
         """
 
+        args = self._parser.parse_args()
+        file = args.file
+        dtype = Parser.schema(float_dtype)
+
         try:
-            for course in HOGWARTS_COURSES:
-                df[course] = df[course].fillna(df[course].mean())
-        except KeyError as e:
-            logging.error('Could not fill the dataset: %s', e)
+            with pd.read_csv(
+                file, chunksize=chunksize, usecols=columns, dtype=dtype # type: ignore
+            ) as reader:
+                yield from reader
+        except (FileNotFoundError, PermissionError, IsADirectoryError) as e:
+            logging.error('Could not read the dataset from: `%s`: %s', file, e)
             sys.exit(1)
+        # pylint: disable=broad-except
+        except Exception as e:
+            logging.error('Could not parse the dataset from: `%s`: %s', file, e)
+            sys.exit(1)
+
+
+    @staticmethod
+    def schema(float_dtype: str = 'float64') -> Dict[str, Any]:
+        """
+        This method gives the type of each column of the Hogwarts datasets.
+        Columns which are not part of it are typed by pandas.
+
+        Args:
+            float_dtype (str): The type of the courses.
+
+        Returns:
+            Dict[str, Any]: The type of each column, as accepted by `pd.read_csv`.
+        """
 
-        return df
+        return {
+            'Index': 'int64',
+            HOGWARTS_HOUSE: pd.CategoricalDtype(HOGWARTS_HOUSES),
+            'First Name': 'object',
+            'Last Name': 'object',
+            'Birthday': 'object',
+            'Best Hand': 'category',
+            **{course: float_dtype for course in HOGWARTS_COURSES},
+        }
 
 
     def read_arg(self, name: str) -> str:
@@ -138,10 +215,13 @@ class Parser:
         return course
 
 
-    def read_model(self) -> Type[LogReg]:
+    def read_model(self, default: str = 'batch') -> Type[LogReg]:
         """
         This method reads the model from the command line arguments.
 
+        Args:
+            default (str): The name of the model used when none is given.
+
         Returns:
             Type: The model to read.
 
@@ -149,84 +229,151 @@ class Parser:
             SystemExit: If the model is not valid.
         """
 
-        model = self.read_arg('model') or 'batch'
+        return Parser.get_model(self.read_arg('model') or default)
+
+
+    @staticmethod
+    def get_model(name: str) -> Type[LogReg]:
+        """
+        This method gets a model from its name.
+
+        Args:
+            name (str): The name of the model.
 
-        match model.lower():
+        Returns:
+            Type: The model.
+
+        Raises:
+            SystemExit: If the model is not valid.
+        """
+
+        # Only the module of the model used is imported.
+        # pylint: disable=import-outside-toplevel
+        match name.lower():
             case 'batch':
+                from dslr.model.logreg_batch import LogRegBatch
                 return LogRegBatch
             case 'stochastic':
+                from dslr.model.logreg_stochastic import LogRegStochastic
                 return LogRegStochastic
+            case 'sharded':
+                from dslr.model.logreg_sharded import LogRegSharded
+                return LogRegSharded
+            case 'minibatch':
+                from dslr.model.logreg_minibatch import LogRegMiniBatch
+                return LogRegMiniBatch
+            case 'newton':
+                from dslr.model.logreg_newton import LogRegNewton
+                return LogRegNewton
+            case 'lbfgs':
+                from dslr.model.logreg_lbfgs import LogRegLbfgs
+                return LogRegLbfgs
             case _:
                 sys.exit(1)
 
 
-    @staticmethod
-    def get_x(df: pd.DataFrame) -> np.ndarray:
-        """
-        This method is used to get the X values.
+    def read_model_args(self, model: Type[LogReg], names: List[str]) -> Dict[str, Any]:
         """
+        This method reads the arguments of the model from the command line arguments.
+        Only the arguments which were given are returned.
 
-        try:
-            x = df.drop(columns=[
-                'Index',
-                'Hogwarts House',
-                'First Name',
-                'Last Name',
-                'Birthday',
-                'Best Hand',
-            ]).to_numpy()
+        Args:
+            model (Type[LogReg]): The model the arguments are for.
+            names (List[str]): The names of the arguments, as accepted by the model.
 
-            return normalize(X=x, axis=0, norm='max') # type: ignore
+        Returns:
+            Dict[str, Any]: The given arguments, by name.
 
-        except (KeyError, ValueError) as e:
-            logging.error('Could not get the X values: %s', e)
-            sys.exit(1)
+        Raises:
+            SystemExit: If the model does not accept one of the given arguments.
+        """
 
+        parameters = inspect.signature(model).parameters
 
-    @staticmethod
-    def get_y(df: pd.DataFrame) -> np.ndarray:
-        """
-        This method is used to get the y values.
-        """
+        model_args = {}
+        for name in names:
+            value = self.read_arg(name)
+            if value is None:
+                continue
 
-        try:
-            return label_binarize(df[HOGWARTS_HOUSE], classes=HOGWARTS_HOUSES) # type: ignore
+            if name not in parameters:
+                logging.error('`%s` is not supported by the `%s` model.', name, model.__name__)
+                sys.exit(1)
 
-        except (KeyError, ValueError) as e:
-            logging.error('Could not get the y values: %s', e)
-            sys.exit(1)
+            model_args[name] = value
+
+        return model_args
 
 
     @staticmethod
-    def convert_label(predictions: np.ndarray) -> str:
+    def get_features(df: pd.DataFrame, features: List[str] | None = None) -> pd.DataFrame:
         """
-        This method is used to convert the predictions to the Hogwarts house.
+        This method is used to get the features, as they are in the dataset.
 
         Args:
-            predictions (np.ndarray): The predictions to convert.
+            df (pd.DataFrame): The dataset.
+            features (List[str] | None): The features to get, in this order,
+                every column which is not in `HOGWARTS_STUDENT` by default.
 
         Returns:
-            str: The Hogwarts house.
+            pd.DataFrame: The features.
+
+        Raises:
+            SystemExit: If one of the features is not in the dataset.
+        """
+
+        if features is not None:
+            try:
+                return df[features]
+            except KeyError as e:
+                logging.error('Could not get the features: %s', e)
+                sys.exit(1)
+
+        return df.drop(columns=HOGWARTS_STUDENT, errors='ignore')
+
+
+    @staticmethod
+    def get_y(df: pd.DataFrame) -> np.ndarray:
+        """
+        This method is used to get the y values, one column per house
+        set to 1 for the students of the house.
         """
 
-        predicted_index = np.argmax(predictions)
-        return HOGWARTS_HOUSES[predicted_index]
+        try:
+            houses = df[HOGWARTS_HOUSE].to_numpy(dtype=object)
+            return (houses[:, None] == np.array(HOGWARTS_HOUSES, dtype=object)).astype(int)
+
+        except (KeyError, ValueError) as e:
+            logging.error('Could not get the y values: %s', e)
+            sys.exit(1)
 
 
     @staticmethod
-    def save_houses(predictions: List[str]) -> None:
+    def save_houses(
+        predictions: List[str] | np.ndarray,
+        index: pd.Index | None = None,
+        append: bool = False
+    ) -> None:
         """
         This method is used to save the predictions to a file.
 
         Args:
-            predictions (np.ndarray): The predictions to save.
+            predictions (List[str] | np.ndarray): The predictions to save.
+            index (pd.Index | None): The index of each prediction, from 0 by default.
+            append (bool): Whether to append the predictions to the file, without a header.
         """
 
-        logging.info('Writing predictions to `houses.csv`')
+        if not append:
+            logging.info('Writing predictions to `houses.csv`')
 
         try:
-            df = pd.DataFrame(predictions, columns=['Hogwarts House'])
-            df.to_csv('houses.csv', index_label='Index')
+            df = pd.DataFrame(predictions, columns=['Hogwarts House'], index=index)
+            df.to_csv(
+                'houses.csv',
+                index_label='Index',
+                mode='a' if append else 'w',
+                header=not append
+            )
         # pylint: disable=broad-except
         except Exception as e:
             logging.error('An error occurred: %s', e)
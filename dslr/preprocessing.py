@@ -0,0 +1,169 @@
+"""
+This module contains the preprocessing applied to the features before they are scored.
+"""
+
+from typing import Any, Dict, Iterable, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+class Preprocessing:
+    """
+    This class imputes the missing values of each feature with its mean,
+    and divides each feature by its largest absolute value.
+
+    The statistics are computed once, on the training dataset, and saved with
+    the model, so that any number of rows can be preprocessed on their own.
+    Since the scaling is linear, it can be fused into the weights of a model.
+
+    Attributes:
+        features (List[str]): The name of each feature.
+        means (np.ndarray): The value missing values of each feature are replaced with.
+        scale (np.ndarray): The value each feature is divided by.
+    """
+
+    features: List[str]
+    means: np.ndarray
+    scale: np.ndarray
+
+
+    def __init__(self, features: List[str], means: np.ndarray, scale: np.ndarray) -> None:
+        """
+        Initialize the preprocessing from its statistics.
+
+        Args:
+            features (List[str]): The name of each feature.
+            means (np.ndarray): The value missing values of each feature are replaced with.
+            scale (np.ndarray): The value each feature is divided by.
+        """
+
+        self.features = list(features)
+        self.means = np.asarray(means, dtype=np.float64)
+        self.scale = np.asarray(scale, dtype=np.float64)
+
+
+    @classmethod
+    def fit(cls, df: pd.DataFrame) -> 'Preprocessing':
+        """
+        Compute the preprocessing of a dataset.
+
+        Args:
+            df (pd.DataFrame): The features of the dataset.
+
+        Returns:
+            Preprocessing: The preprocessing of the dataset.
+        """
+
+        return cls.fit_chunks([df])
+
+
+    @classmethod
+    def fit_chunks(cls, chunks: Iterable[pd.DataFrame]) -> 'Preprocessing':
+        """
+        Compute the preprocessing of a dataset read one chunk of rows at a time.
+
+        Args:
+            chunks (Iterable[pd.DataFrame]): The features of each chunk of the dataset.
+
+        Returns:
+            Preprocessing: The preprocessing of the dataset.
+        """
+
+        features: List[str] = []
+        sums, counts, maximums = 0.0, 0, None
+
+        for chunk in chunks:
+            values = chunk.to_numpy(dtype=np.float64)
+            features = list(chunk.columns)
+
+            sums = sums + np.nansum(values, axis=0)
+            counts = counts + np.count_nonzero(~np.isnan(values), axis=0)
+
+            # Filling a feature with its mean cannot change its largest absolute value.
+            chunk_maximums = np.fmax.reduce(np.abs(values), axis=0)
+            maximums = chunk_maximums if maximums is None else np.fmax(maximums, chunk_maximums)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            means = sums / counts
+
+        # Features which are always zero are left as they are.
+        scale = np.where(maximums == 0, 1, maximums) # type: ignore
+
+        return cls(features, means, scale)
+
+
+    def impute(self, x: np.ndarray) -> np.ndarray:
+        """
+        Replace the missing values of the features with their mean.
+
+        Args:
+            x (np.ndarray): The features, one row per sample.
+
+        Returns:
+            np.ndarray: The imputed features.
+        """
+
+        return np.where(np.isnan(x), self.means, x)
+
+
+    def transform(self, x: np.ndarray) -> np.ndarray:
+        """
+        Impute and scale the features.
+
+        Args:
+            x (np.ndarray): The features, one row per sample.
+
+        Returns:
+            np.ndarray: The preprocessed features.
+        """
+
+        return self.impute(x) / self.scale
+
+
+    def fuse(self, weights: np.ndarray, bias: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Fold the scaling into weights, so that they apply to imputed features.
+
+        Args:
+            weights (np.ndarray): The weights, one row per feature.
+            bias (np.ndarray): The bias.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: The fused weights and bias.
+        """
+
+        return weights / self.scale.reshape(-1, *[1] * (weights.ndim - 1)), bias
+
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Convert the preprocessing to a dictionary which can be saved as JSON.
+
+        Returns:
+            Dict[str, Any]: The statistics of the preprocessing.
+        """
+
+        return {
+            'features': self.features,
+            'means': self.means.tolist(),
+            'scale': self.scale.tolist(),
+        }
+
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'Preprocessing':
+        """
+        Create a preprocessing from a dictionary created by `to_dict`.
+
+        Args:
+            data (Dict[str, Any]): The statistics of the preprocessing.
+
+        Returns:
+            Preprocessing: The preprocessing.
+
+        Raises:
+            KeyError: If a statistic is missing.
+        """
+
+        return cls(data['features'], data['means'], data['scale'])
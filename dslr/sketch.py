@@ -0,0 +1,283 @@
+"""
+This module contains mergeable sketches to summarize columns too large to be held in memory.
+"""
+
+from math import ceil, log
+from typing import List, Sequence
+
+import numpy as np
+
+
+SKETCH_SIZE = 200
+SKETCH_SEED = 0
+
+COMPACTOR_RATIO = 2 / 3
+
+HLL_PRECISION = 14
+HLL_MIN_PRECISION = 11
+HLL_MAX_PRECISION = 18
+
+
+class QuantileSketch:
+    """
+    This class implements a KLL quantile sketch.
+
+    Values are kept in a hierarchy of compactors: a value at level `h`
+    stands for `2 ** h` values of the stream. When a level is full it is
+    sorted and every other value is promoted to the next level, so the
+    sketch holds about `3 * k` values however many it has seen.
+
+    The error is measured on ranks: the quantile returned for `q` has a
+    rank within `q ± ε` of the exact one. For the default `k = 200`,
+    `ε` is about 1.3% with 99% confidence, and it shrinks roughly as `1 / k`.
+    Sketches with the same `k` can be merged, across chunks or workers,
+    without increasing that error.
+
+    Attributes:
+        k (int): The size of the top compactor, which bounds the error.
+        count (int): The number of values seen by the sketch.
+        compactors (List[np.ndarray]): The values kept at each level.
+    """
+
+    k: int
+    count: int
+    compactors: List[np.ndarray]
+
+
+    def __init__(self, k: int = SKETCH_SIZE, seed: int = SKETCH_SEED) -> None:
+        """
+        Initialize an empty sketch.
+
+        Args:
+            k (int): The size of the top compactor.
+            seed (int): The seed used to pick which values are promoted,
+                so that a given stream always gives the same sketch.
+        """
+
+        self.k = k
+        self.count = 0
+        self.compactors = [np.empty(0)]
+        self._rng = np.random.default_rng(seed)
+
+
+    def update(self, values: np.ndarray) -> None:
+        """
+        Add values to the sketch. NaN values are ignored.
+
+        Args:
+            values (np.ndarray): The values to add.
+        """
+
+        values = np.asarray(values, dtype=np.float64).ravel()
+        values = values[~np.isnan(values)]
+
+        self.count += values.size
+        self.compactors[0] = np.concatenate([self.compactors[0], values])
+        self._compress()
+
+
+    def merge(self, other: 'QuantileSketch') -> None:
+        """
+        Add the values seen by another sketch to this one.
+
+        Args:
+            other (QuantileSketch): The sketch to merge.
+        """
+
+        while len(self.compactors) < len(other.compactors):
+            self.compactors.append(np.empty(0))
+
+        for level, values in enumerate(other.compactors):
+            self.compactors[level] = np.concatenate([self.compactors[level], values])
+
+        self.count += other.count
+        self._compress()
+
+
+    def quantiles(self, quantiles: Sequence[float]) -> np.ndarray:
+        """
+        Estimate quantiles of the values seen so far.
+
+        Args:
+            quantiles (Sequence[float]): The quantiles to estimate, between 0 and 1.
+
+        Returns:
+            np.ndarray: The estimated quantiles, NaN if the sketch is empty.
+        """
+
+        if self.count == 0:
+            return np.full(len(quantiles), np.nan)
+
+        values = np.concatenate(self.compactors)
+        weights = np.concatenate([
+            np.full(compactor.size, 2 ** level) for level, compactor in enumerate(self.compactors)
+        ])
+
+        order = np.argsort(values, kind='stable')
+        values, ranks = values[order], np.cumsum(weights[order])
+
+        targets = np.asarray(quantiles, dtype=np.float64) * ranks[-1]
+        indices = np.searchsorted(ranks, targets, side='left')
+
+        return values[np.minimum(indices, values.size - 1)]
+
+
+    def _capacity(self, level: int) -> int:
+        depth = len(self.compactors) - level - 1
+        return ceil(self.k * COMPACTOR_RATIO ** depth) + 1
+
+
+    def _size(self) -> int:
+        return sum(compactor.size for compactor in self.compactors)
+
+
+    def _max_size(self) -> int:
+        return sum(self._capacity(level) for level in range(len(self.compactors)))
+
+
+    def _compress(self) -> None:
+        while self._size() >= self._max_size():
+            for level, compactor in enumerate(self.compactors):
+                if compactor.size < self._capacity(level):
+                    continue
+
+                if level + 1 == len(self.compactors):
+                    self.compactors.append(np.empty(0))
+
+                self._compact(level)
+
+                if self._size() < self._max_size():
+                    break
+
+
+    def _compact(self, level: int) -> None:
+        values = np.sort(self.compactors[level])
+
+        # An odd value out stays at its level, so that no weight is lost.
+        kept = values[values.size - values.size % 2:]
+        values = values[:values.size - values.size % 2]
+
+        offset = int(self._rng.integers(2))
+        self.compactors[level + 1] = np.concatenate([self.compactors[level + 1], values[offset::2]])
+        self.compactors[level] = kept
+
+
+class HyperLogLog:
+    """
+    This class implements a HyperLogLog cardinality estimator.
+
+    Every value is hashed to 64 bits: the first `precision` bits pick one of
+    `2 ** precision` registers, which keeps the longest run of leading zeros
+    seen in the remaining bits. The relative standard error of the estimate
+    is `1.04 / sqrt(2 ** precision)`, 0.81% for the default precision of 14,
+    using 16 KiB whatever the number of values. Estimators with the same
+    precision can be merged, across chunks or processes.
+
+    Like `ft_unique`, which counts with a `set`, every NaN is counted as a
+    distinct value: NaN values are counted exactly, aside from the registers.
+
+    Attributes:
+        precision (int): The number of bits used to pick a register.
+        registers (np.ndarray): The longest run of leading zeros of each register, plus one.
+        nan_count (int): The number of NaN values seen.
+    """
+
+    precision: int
+    registers: np.ndarray
+    nan_count: int
+
+
+    def __init__(self, precision: int = HLL_PRECISION) -> None:
+        """
+        Initialize an empty estimator.
+
+        Args:
+            precision (int): The number of bits used to pick a register.
+
+        Raises:
+            ValueError: If the precision is out of range.
+        """
+
+        if not HLL_MIN_PRECISION <= precision <= HLL_MAX_PRECISION:
+            raise ValueError(
+                f'The precision must be between {HLL_MIN_PRECISION} and {HLL_MAX_PRECISION}.'
+            )
+
+        self.precision = precision
+        self.registers = np.zeros(2 ** precision, dtype=np.uint8)
+        self.nan_count = 0
+
+
+    def update(self, values: np.ndarray) -> None:
+        """
+        Add values to the estimator.
+
+        Args:
+            values (np.ndarray): The values to add.
+        """
+
+        values = np.asarray(values, dtype=np.float64).ravel()
+        nan = np.isnan(values)
+
+        self.nan_count += int(np.count_nonzero(nan))
+
+        # -0.0 and 0.0 are the same value, and must share their hash.
+        hashes = _hash(values[~nan] + 0.0)
+
+        width = 64 - self.precision
+        indices = (hashes >> np.uint64(width)).astype(np.intp)
+        remainders = hashes & np.uint64((1 << width) - 1)
+
+        # The remainders fit in a float mantissa, so `frexp` counts their bits exactly.
+        _, bits = np.frexp(remainders.astype(np.float64))
+        ranks = (width - bits + 1).astype(np.uint8)
+
+        np.maximum.at(self.registers, indices, ranks)
+
+
+    def merge(self, other: 'HyperLogLog') -> None:
+        """
+        Add the values seen by another estimator to this one.
+
+        Args:
+            other (HyperLogLog): The estimator to merge.
+
+        Raises:
+            ValueError: If the estimators do not have the same precision.
+        """
+
+        if other.precision != self.precision:
+            raise ValueError('Only estimators with the same precision can be merged.')
+
+        np.maximum(self.registers, other.registers, out=self.registers)
+        self.nan_count += other.nan_count
+
+
+    def estimate(self) -> float:
+        """
+        Estimate the number of distinct values seen so far.
+
+        Returns:
+            float: The estimated number of distinct values.
+        """
+
+        size = self.registers.size
+        alpha = 0.7213 / (1 + 1.079 / size)
+
+        estimate = alpha * size ** 2 / np.sum(np.ldexp(1.0, -self.registers.astype(np.int64)))
+        zeros = int(np.count_nonzero(self.registers == 0))
+
+        # Small cardinalities are better estimated by counting the empty registers.
+        if estimate <= 2.5 * size and zeros:
+            estimate = size * log(size / zeros)
+
+        return float(estimate) + self.nan_count
+
+
+def _hash(values: np.ndarray) -> np.ndarray:
+    # The SplitMix64 finalizer, applied to the bits of the values.
+    hashes = values.view(np.uint64) + np.uint64(0x9E3779B97F4A7C15)
+    hashes = (hashes ^ (hashes >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    hashes = (hashes ^ (hashes >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+
+    return hashes ^ (hashes >> np.uint64(31))
@@ -4,8 +4,6 @@ This module is used to display a histogram of the dataset.
 
 import logging
 
-import matplotlib.pyplot as plt
-
 from dslr.parser import Parser
 from dslr.hogwarts import HOGWARTS_HOUSE
 
@@ -18,10 +16,13 @@ def main() -> None:
     parser = Parser()
     parser.add_arg('course', str, 'The course to display the histogram for')
 
-    df = parser.read_dataset()
     course = parser.read_course('course')
+    df = parser.read_dataset([HOGWARTS_HOUSE, course], float_dtype='float32')
+
+    # Matplotlib is only imported once the arguments and the dataset are valid.
+    import matplotlib.pyplot as plt # pylint: disable=import-outside-toplevel
 
-    df_grouped = df.groupby(HOGWARTS_HOUSE)[course]
+    df_grouped = df.groupby(HOGWARTS_HOUSE, observed=True)[course]
     df_grouped.plot(
         kind='hist',
         alpha=0.6,
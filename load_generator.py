@@ -0,0 +1,205 @@
+"""
+This module generates load against `predict_server.py`.
+
+Each client keeps one connection open and sends the students of a dataset,
+one per request, as soon as the previous response is received. Once every
+request is answered, the throughput and latency seen by the clients are
+printed, along with the metrics of the server.
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+from dslr.parser import Parser
+from predict_server import HOST, PORT
+
+
+CONCURRENCY = 32
+REQUESTS = 10_000
+
+
+async def send_request(
+    reader: asyncio.StreamReader,
+    writer: asyncio.StreamWriter,
+    method: str,
+    path: str,
+    body: Dict[str, Any] | None = None
+) -> Tuple[int, Dict[str, Any]]:
+    """
+    Send an HTTP/1.1 request on an open connection, and read its response.
+
+    Args:
+        reader (asyncio.StreamReader): The stream the response is read from.
+        writer (asyncio.StreamWriter): The stream the request is written to.
+        method (str): The method of the request.
+        path (str): The path of the request.
+        body (Dict[str, Any] | None): The JSON body of the request.
+
+    Returns:
+        Tuple[int, Dict[str, Any]]: The status and the JSON body of the response.
+    """
+
+    content = b'' if body is None else json.dumps(body).encode()
+    head = (
+        f'{method} {path} HTTP/1.1\r\n'
+        f'Host: {HOST}\r\n'
+        'Content-Type: application/json\r\n'
+        f'Content-Length: {len(content)}\r\n'
+        '\r\n'
+    )
+
+    writer.write(head.encode('latin-1') + content)
+    await writer.drain()
+
+    status = int((await reader.readline()).split()[1])
+
+    length = 0
+    while (line := await reader.readline()) not in (b'\r\n', b''):
+        name, _, value = line.decode('latin-1').partition(':')
+        if name.strip().lower() == 'content-length':
+            length = int(value)
+
+    return status, json.loads(await reader.readexactly(length))
+
+
+async def run_client(
+    host: str,
+    port: int,
+    rows: List[Dict[str, Any]],
+    requests: List[int],
+    latencies: List[float]
+) -> None:
+    """
+    Send requests on one connection until there are none left.
+
+    Args:
+        host (str): The address of the server.
+        port (int): The port of the server.
+        rows (List[Dict[str, Any]]): The students to send.
+        requests (List[int]): The requests left to send, shared by every client.
+        latencies (List[float]): The list the latency of each request is appended to.
+
+    Raises:
+        RuntimeError: If a request fails.
+    """
+
+    reader, writer = await asyncio.open_connection(host, port)
+
+    try:
+        while requests:
+            row = rows[requests.pop() % len(rows)]
+
+            start = time.perf_counter()
+            status, response = await send_request(reader, writer, 'POST', '/predict', row)
+            latencies.append(time.perf_counter() - start)
+
+            if status != 200:
+                raise RuntimeError(f'The request failed with status {status}: {response}')
+    finally:
+        writer.close()
+
+
+async def generate_load(
+    host: str,
+    port: int,
+    rows: List[Dict[str, Any]],
+    concurrency: int,
+    total: int
+) -> Dict[str, Any]:
+    """
+    Send requests from concurrent clients.
+
+    Args:
+        host (str): The address of the server.
+        port (int): The port of the server.
+        rows (List[Dict[str, Any]]): The students to send, in turn.
+        concurrency (int): The number of clients.
+        total (int): The total number of requests.
+
+    Returns:
+        Dict[str, Any]: The throughput and latency seen by the clients,
+            and the metrics of the server.
+    """
+
+    requests = list(range(total))[::-1]
+    latencies: List[float] = []
+
+    start = time.perf_counter()
+    await asyncio.gather(*(
+        run_client(host, port, rows, requests, latencies) for _ in range(concurrency)
+    ))
+    elapsed = time.perf_counter() - start
+
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        _, metrics = await send_request(reader, writer, 'GET', '/metrics')
+    finally:
+        writer.close()
+
+    p50, p99 = np.percentile(np.array(latencies) * 1000, [50, 99])
+
+    return {
+        'requests': len(latencies),
+        'throughput': len(latencies) / elapsed,
+        'latency_ms': {'p50': float(p50), 'p99': float(p99)},
+        'server': metrics,
+    }
+
+
+def read_rows(path: str) -> List[Dict[str, Any]]:
+    """
+    Read the features of the students of a dataset, as JSON objects.
+
+    Args:
+        path (str): The path of the dataset.
+
+    Returns:
+        List[Dict[str, Any]]: The features of each student, None where they are missing.
+    """
+
+    features = Parser.get_features(pd.read_csv(path, dtype=Parser.schema()))
+    features = features.select_dtypes('number').astype(object)
+
+    return features.where(features.notna(), None).to_dict('records')
+
+
+def main() -> None:
+    """
+    The main function to generate load against the prediction server.
+    """
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument('file', type=str, help='Path to the dataset file the requests are made of')
+    parser.add_argument('--host', type=str, default=HOST, help='The address of the server')
+    parser.add_argument('--port', type=int, default=PORT, help='The port of the server')
+    parser.add_argument('--concurrency', type=int, default=CONCURRENCY,
+                        help='The number of concurrent clients')
+    parser.add_argument('--requests', type=int, default=REQUESTS,
+                        help='The total number of requests')
+
+    args = parser.parse_args()
+
+    result = asyncio.run(generate_load(
+        args.host, args.port, read_rows(args.file), args.concurrency, args.requests
+    ))
+
+    latency = result['latency_ms']
+    print(f'{result["requests"]} requests, {result["throughput"]:.0f} requests/s')
+    print(f'Client latency: p50 {latency["p50"]:.2f} ms, p99 {latency["p99"]:.2f} ms')
+
+    server = result['server']
+    latency = server['latency_ms']
+    print(f'Server latency: p50 {latency["p50"]:.2f} ms, p99 {latency["p99"]:.2f} ms')
+    print(f'{server["batches"]} batches, by size:')
+    for size, count in server['batch_sizes'].items():
+        print(f'{size:>6}: {count}')
+
+
+if __name__ == '__main__':
+    main()
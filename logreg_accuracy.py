@@ -6,12 +6,36 @@ This module is used to train a logistic regression model on the dataset.
 import logging
 
 import numpy as np
-from sklearn.metrics import accuracy_score
+import pandas as pd
 
+from dslr.hogwarts import HOGWARTS_HOUSE
 from dslr.parser import Parser
 from dslr.model.ovr import OvrClassifier
 
 
+def score(ovr: OvrClassifier, df: pd.DataFrame) -> float:
+    """
+    Compute the accuracy of a classifier on a dataset.
+
+    Args:
+        ovr (OvrClassifier): The trained classifier.
+        df (pd.DataFrame): The dataset, with the house of each student.
+
+    Returns:
+        float: The fraction of students whose house is predicted correctly.
+    """
+
+    ovr = ovr.with_preprocessing(Parser.get_features(df))
+
+    y = Parser.get_y(df)
+    x = Parser.get_features(df, ovr.preprocessing.features).to_numpy(dtype=float) # type: ignore
+
+    predictions = np.argmax(ovr.predict_batch(x), axis=1)
+    truth = np.argmax(y, axis=1)
+
+    return float(np.mean(truth == predictions))
+
+
 def main():
     """
     The main function to train a logistic regression model on the dataset.
@@ -22,35 +46,29 @@ def main():
     parser = Parser()
 
     parser.add_arg('model_path', str, 'The path to the model file')
-    parser.add_arg('--model', str, 'The model used',
-                   required=False, choices=['batch', 'stochastic'])
+    parser.add_arg('--model', str, 'The model used', required=False,
+                   choices=['batch', 'stochastic', 'minibatch', 'sharded', 'newton', 'lbfgs'])
 
     model_path = parser.read_arg('model_path')
 
     model = parser.read_model()
     logging.debug('Using model %s', model)
 
-    df = parser.read_dataset()
-    df = Parser.fill_dataset(df)
-
-    y = Parser.get_y(df)
-    x = Parser.get_x(df)
-
     ovr = OvrClassifier(model)
     ovr.load_models(model_path)
 
-    logging.info('Predicting classes')
+    # Models saved without their preprocessing use every feature of the dataset.
+    columns = None
+    if ovr.preprocessing is not None:
+        columns = [HOGWARTS_HOUSE, *ovr.preprocessing.features]
 
-    predictions = []
-    for value in x:
-        prediction = ovr.predict(value)
-        predictions.append(np.argmax(prediction))
+    df = parser.read_dataset(columns)
 
-    logging.info('Prediction complete')
+    logging.info('Predicting classes')
 
-    truth = [np.argmax(i) for i in y]
-    accuracy = accuracy_score(truth, predictions)
+    accuracy = score(ovr, df)
 
+    logging.info('Prediction complete')
     logging.info('Accuracy: %.4f', accuracy)
 
 
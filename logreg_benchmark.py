@@ -0,0 +1,90 @@
+"""
+This module benchmarks the sharded batch gradient descent against the single process one.
+
+A synthetic dataset is fitted once with `LogRegBatch`, then with `LogRegSharded`
+for each number of shards, so that the scaling with the number of cores shows.
+"""
+
+import argparse
+import logging
+import time
+from typing import Tuple
+
+import numpy as np
+
+from dslr.model.logreg_batch import LogRegBatch
+from dslr.model.logreg_sharded import LogRegSharded
+from dslr.parallel import cpu_count
+
+
+ROWS = 1_000_000
+FEATURES = 13
+CLASSES = 4
+EPOCHS = 20
+
+
+def make_dataset(rows: int, features: int, classes: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Generate a synthetic dataset, with one target column per class.
+
+    Args:
+        rows (int): The number of rows.
+        features (int): The number of features.
+        classes (int): The number of classes.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: The input values and the target values.
+    """
+
+    rng = np.random.default_rng(0)
+
+    x = rng.normal(size=(rows, features))
+    labels = np.argmax(x @ rng.normal(size=(features, classes)), axis=1)
+
+    return x, np.eye(classes)[labels]
+
+
+def main() -> None:
+    """
+    The main function to benchmark the sharded batch gradient descent.
+    """
+
+    logging.basicConfig(level=logging.WARNING)
+
+    default_shards = sorted({1, *[2 ** i for i in range(cpu_count().bit_length())], cpu_count()})
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rows', type=int, default=ROWS, help='The number of rows')
+    parser.add_argument('--features', type=int, default=FEATURES, help='The number of features')
+    parser.add_argument('--classes', type=int, default=CLASSES, help='The number of classes')
+    parser.add_argument('--epochs', type=int, default=EPOCHS, help='The number of epochs')
+    parser.add_argument('--shards', type=int, nargs='+', default=default_shards,
+                        help='The numbers of shards to benchmark')
+
+    args = parser.parse_args()
+
+    x, y = make_dataset(args.rows, args.features, args.classes)
+    print(f'{args.rows} rows, {args.features} features, {args.classes} classes, '
+          f'{args.epochs} epochs, {cpu_count()} cores')
+
+    start = time.perf_counter()
+    baseline = LogRegBatch(epochs=args.epochs)
+    baseline.fit(x, y)
+    elapsed = time.perf_counter() - start
+
+    print(f'{"model":>12} {"seconds":>9} {"speedup":>8} {"max |dw|":>10}')
+    print(f'{"batch":>12} {elapsed:>9.2f} {1:>8.2f} {0:>10.1e}')
+
+    for shards in args.shards:
+        start = time.perf_counter()
+        model = LogRegSharded(epochs=args.epochs, shards=shards)
+        model.fit(x, y)
+        seconds = time.perf_counter() - start
+
+        difference = np.max(np.abs(model.weights - baseline.weights))
+        print(f'{f"{shards} shards":>12} {seconds:>9.2f} {elapsed / seconds:>8.2f} '
+              f'{difference:>10.1e}')
+
+
+if __name__ == '__main__':
+    main()
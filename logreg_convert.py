@@ -0,0 +1,47 @@
+"""
+This module is used to convert a model saved as JSON to the binary model format.
+"""
+# pylint:disable=duplicate-code
+
+import argparse
+import logging
+import sys
+
+from dslr.model.logreg import LogReg
+from dslr.model.ovr import OvrClassifier
+
+
+def main():
+    """
+    The main function to convert a model saved as JSON to the binary model format.
+    """
+
+    logging.basicConfig(level=logging.DEBUG)
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument('model_path', type=str, help='The path to the JSON model file')
+    parser.add_argument('output_path', type=str,
+                        help='The path of the binary model, ending with `.npz`')
+    parser.add_argument('--dtype', type=str, choices=['float32', 'float64'], default='float64',
+                        help='The type the weights are stored with')
+
+    args = parser.parse_args()
+    model_path = args.model_path
+    output_path = args.output_path
+
+    if not output_path.endswith('.npz'):
+        logging.error('The binary model must be saved to a `.npz` file.')
+        sys.exit(1)
+
+    ovr = OvrClassifier(LogReg)
+    ovr.load_models(model_path)
+
+    if ovr.preprocessing is None:
+        logging.warning('The model has no preprocessing, it will be computed when predicting')
+
+    ovr.save_models(output_path, args.dtype)
+    logging.info('Model converted to %s', output_path)
+
+
+if __name__ == '__main__':
+    main()
@@ -5,10 +5,60 @@ This module is used to predict the class of the input using the trained model.
 
 import logging
 
+import numpy as np
+import pandas as pd
+
 from dslr.parser import Parser
+from dslr.preprocessing import Preprocessing
 from dslr.model.ovr import OvrClassifier
 
 
+def predict_chunks(parser: Parser, ovr: OvrClassifier, chunksize: int) -> None:
+    """
+    Predict the class of the input one chunk of rows at a time, appending
+    the predictions of each chunk to `houses.csv`.
+
+    The chunks are preprocessed with the preprocessing saved with the model.
+    Models saved without one are preprocessed like the whole dataset, which
+    is then read twice.
+
+    Args:
+        parser (Parser): The parser to read the dataset with.
+        ovr (OvrClassifier): The trained classifier.
+        chunksize (int): The number of rows per chunk.
+    """
+
+    if ovr.preprocessing is None:
+        logging.warning('The model has no preprocessing, computing it from the dataset')
+
+        chunks = parser.read_dataset_chunks(chunksize)
+        ovr.preprocessing = Preprocessing.fit_chunks(Parser.get_features(c) for c in chunks)
+
+    features = ovr.preprocessing.features
+
+    for i, chunk in enumerate(parser.read_dataset_chunks(chunksize, features)):
+        x = Parser.get_features(chunk, features).to_numpy(dtype=float)
+        Parser.save_houses(ovr.predict_labels(x), index=chunk.index, append=i > 0)
+
+
+def predict(ovr: OvrClassifier, df: pd.DataFrame) -> np.ndarray:
+    """
+    Predict the house of every student of a dataset.
+
+    Args:
+        ovr (OvrClassifier): The trained classifier.
+        df (pd.DataFrame): The dataset.
+
+    Returns:
+        np.ndarray: The house of each student.
+    """
+
+    ovr = ovr.with_preprocessing(Parser.get_features(df))
+    x = Parser.get_features(df, ovr.preprocessing.features).to_numpy(dtype=float) # type: ignore
+
+    return ovr.predict_labels(x)
+
+
 def main():
     """
     The main function to predict the class of the input using the trained model.
@@ -19,28 +69,30 @@ def main():
     parser = Parser()
 
     parser.add_arg('model_path', str, 'The path to the model file')
-    parser.add_arg('--model', str, 'The model used',
-                   required=False, choices=['batch', 'stochastic'])
+    parser.add_arg('--model', str, 'The model used', required=False,
+                   choices=['batch', 'stochastic', 'minibatch', 'sharded', 'newton', 'lbfgs'])
+    parser.add_arg('--chunksize', int, 'Read and predict the dataset in chunks of this many rows',
+                   required=False)
 
     model_path = parser.read_arg('model_path')
+    chunksize = parser.read_arg('chunksize')
 
     model = parser.read_model()
     logging.debug('Using model %s', model)
 
-    df = parser.read_dataset()
-    df = Parser.fill_dataset(df)
-
-    x = Parser.get_x(df)
-
     ovr = OvrClassifier(model)
     ovr.load_models(model_path)
 
     logging.info('Predicting classes')
 
-    predictions = []
-    for value in x:
-        prediction = ovr.predict(value)
-        predictions.append(Parser.convert_label(prediction))
+    if chunksize:
+        predict_chunks(parser, ovr, chunksize) # type: ignore
+        logging.info('Prediction complete')
+        return
+
+    df = parser.read_dataset(None if ovr.preprocessing is None else ovr.preprocessing.features)
+
+    predictions = predict(ovr, df)
 
     logging.info('Prediction complete')
     Parser.save_houses(predictions)
@@ -4,11 +4,209 @@ This module is used to train a logistic regression model on the dataset.
 # pylint:disable=duplicate-code
 
 import logging
+import sys
+from typing import Any, Dict, Type
 
+from dslr.hogwarts import HOGWARTS_COURSES, HOGWARTS_HOUSE
 from dslr.parser import Parser
+from dslr.preprocessing import Preprocessing
+from dslr.model.checkpoint import Checkpoint
+from dslr.model.logreg import LogReg
+from dslr.model.optimizer import OPTIMIZERS, SCHEDULES
 from dslr.model.ovr import OvrClassifier
 
 
+STREAM_CHUNKSIZE = 10_000
+STREAM_PASSES = 10
+
+# The options of the models which `partial_fit` does not read.
+STREAM_IGNORED_ARGS = {
+    'epochs': '--max-epochs',
+    'tolerance': '--tolerance',
+    'loss_tolerance': '--loss-tolerance',
+    'patience': '--patience',
+    'validation_split': '--validation-split',
+    'schedule': '--schedule',
+}
+
+CHECKPOINT_SECONDS = 60.
+
+
+def check_stream_args(parser: Parser, ovr: OvrClassifier) -> None:
+    """
+    Check that the options are supported when streaming.
+
+    Args:
+        parser (Parser): The parser to read the options with.
+        ovr (OvrClassifier): The classifier to train.
+
+    Raises:
+        SystemExit: If an option is ignored by `partial_fit`.
+    """
+
+    for name, option in STREAM_IGNORED_ARGS.items():
+        if parser.read_arg(name) is not None:
+            logging.error('%s is not supported with --stream, the number of epochs is --passes',
+                          option)
+            sys.exit(1)
+
+    if parser.read_arg('n_jobs') != 1:
+        logging.error('--n-jobs is not supported with --stream')
+        sys.exit(1)
+
+    if ovr.model is Parser.get_model('batch'):
+        logging.warning('The batch model takes a single gradient descent step per chunk, '
+                        'so it needs many more passes to converge than minibatch')
+
+
+def train_stream(parser: Parser, ovr: OvrClassifier, chunksize: int, passes: int) -> None:
+    """
+    Train the classifier one chunk of rows at a time, so that only one chunk
+    of the dataset is held in memory.
+
+    The dataset is read once to compute the preprocessing, then once per pass,
+    each chunk updating the models with `partial_fit`.
+
+    Args:
+        parser (Parser): The parser to read the dataset with.
+        ovr (OvrClassifier): The classifier to train.
+        chunksize (int): The number of rows per chunk.
+        passes (int): The number of passes over the dataset.
+    """
+
+    check_stream_args(parser, ovr)
+
+    columns = [HOGWARTS_HOUSE, *HOGWARTS_COURSES]
+
+    chunks = parser.read_dataset_chunks(chunksize, columns)
+    ovr.preprocessing = Preprocessing.fit_chunks(Parser.get_features(c) for c in chunks)
+    features = ovr.preprocessing.features
+
+    for i in range(passes):
+        logging.info('Pass %s of %s over the dataset', i + 1, passes)
+
+        for chunk in parser.read_dataset_chunks(chunksize, columns):
+            x = Parser.get_features(chunk, features).to_numpy(dtype=float)
+
+            try:
+                ovr.partial_fit(ovr.preprocessing.transform(x), Parser.get_y(chunk))
+            except (NotImplementedError, ValueError) as e:
+                logging.error('Could not train the model on a stream: %s', e)
+                sys.exit(1)
+
+
+def add_optimizer_args(parser: Parser) -> None:
+    """
+    Add the options of the gradient descent steps: the learning rate, the
+    optimizer turning the gradient into an update, and the schedule of the
+    learning rate.
+
+    Args:
+        parser (Parser): The parser to add the options to.
+    """
+
+    parser.add_arg('--learning-rate', float, 'The learning rate', required=False,
+                   dest='learning_rate')
+    parser.add_arg('--optimizer', str, 'The optimizer turning the gradient into an update',
+                   required=False, choices=list(OPTIMIZERS))
+    parser.add_arg('--schedule', str, 'The schedule of the learning rate', required=False,
+                   choices=list(SCHEDULES))
+
+
+def add_checkpoint_args(parser: Parser) -> None:
+    """
+    Add the options saving the state of the training, and resuming from it.
+
+    Args:
+        parser (Parser): The parser to add the options to.
+    """
+
+    parser.add_arg('--checkpoint-dir', str, 'The directory the state of the training is saved in',
+                   required=False, dest='checkpoint_dir')
+    parser.add_arg('--checkpoint-every', int, 'Save the state of the training every N epochs',
+                   required=False, dest='checkpoint_every')
+    parser.add_arg('--checkpoint-seconds', float,
+                   'Save the state of the training every N seconds', required=False,
+                   dest='checkpoint_seconds')
+    parser.add_flag('--resume', 'Resume the training from the state saved in --checkpoint-dir')
+
+
+def read_checkpoint(parser: Parser) -> Checkpoint | None:
+    """
+    Read the checkpoint options.
+
+    Without an interval, the state is saved every `CHECKPOINT_SECONDS` seconds.
+
+    Args:
+        parser (Parser): The parser to read the options with.
+
+    Returns:
+        Checkpoint | None: The checkpoint, or None if the training is not saved.
+    """
+
+    directory = parser.read_arg('checkpoint_dir')
+    every_epochs = parser.read_arg('checkpoint_every')
+    every_seconds = parser.read_arg('checkpoint_seconds')
+
+    if directory is None:
+        if parser.read_arg('resume') or every_epochs is not None or every_seconds is not None:
+            logging.error('The checkpoint options need --checkpoint-dir')
+            sys.exit(1)
+        return None
+
+    if parser.read_arg('stream'):
+        logging.error('Checkpoints are not supported when streaming')
+        sys.exit(1)
+
+    if every_epochs is None and every_seconds is None:
+        every_seconds = CHECKPOINT_SECONDS
+
+    return Checkpoint(directory, every_epochs, every_seconds, parser.read_arg('resume'))
+
+
+def read_model_args(parser: Parser, model: Type[LogReg]) -> Dict[str, Any]:
+    """
+    Read the options of the model.
+
+    Args:
+        parser (Parser): The parser to read the options with.
+        model (Type[LogReg]): The model the options are for.
+
+    Returns:
+        Dict[str, Any]: The given options, by name.
+
+    Raises:
+        SystemExit: If the model does not accept an option, if the validation
+            split is given without the patience it is used for, or if the model
+            trains every class at once in several processes.
+    """
+
+    model_args = parser.read_model_args(model, [
+        'learning_rate',
+        'optimizer',
+        'schedule',
+        'epochs',
+        'tolerance',
+        'loss_tolerance',
+        'patience',
+        'validation_split',
+        'batch_size',
+        'shards',
+        'regularization',
+    ])
+
+    if 'validation_split' in model_args and 'patience' not in model_args:
+        logging.error('--validation-split only applies with --patience')
+        sys.exit(1)
+
+    if parser.read_arg('n_jobs') != 1 and model.fused:
+        logging.error('--n-jobs is not supported by the `%s` model, '
+                      'which trains every class at once', model.__name__)
+        sys.exit(1)
+
+    return model_args
+
+
 def main():
     """
     The main function to train a logistic regression model on the dataset.
@@ -18,25 +216,86 @@ def main():
 
     parser = Parser()
 
-    parser.add_arg('--model', str, 'The model used',
-                   required=False, choices=['batch', 'stochastic'])
+    parser.add_arg('--model', str, 'The model used, minibatch by default when streaming',
+                   required=False,
+                   choices=['batch', 'stochastic', 'minibatch', 'sharded', 'newton', 'lbfgs'])
+    add_optimizer_args(parser)
+    parser.add_arg('--max-epochs', int, 'The maximum number of epochs',
+                   required=False, dest='epochs')
+    parser.add_arg('--tolerance', float, 'Stop once the gradient norm is below this value',
+                   required=False)
+    parser.add_arg('--loss-tolerance', float,
+                   'Stop once the relative loss change is below this value', required=False)
+    parser.add_arg('--patience', int,
+                   'Stop once the validation loss has not improved for this many epochs',
+                   required=False)
+    parser.add_arg('--validation-split', float, 'The fraction of rows held out for validation',
+                   required=False)
+    parser.add_arg('--batch-size', int, 'The number of rows in each mini-batch',
+                   required=False)
+    parser.add_arg('--shards', int, 'The number of processes the rows are split between',
+                   required=False)
+    parser.add_arg('--regularization', float, 'The L2 penalty on the weights',
+                   required=False)
+    parser.add_arg('--n-jobs', int,
+                   'The number of processes the models are trained in, -1 for one per core',
+                   required=False, default=1, dest='n_jobs')
+    parser.add_flag('--stream', 'Train one chunk of rows at a time, in constant memory')
+    parser.add_arg('--chunksize', int, 'The number of rows per chunk when streaming',
+                   required=False, default=STREAM_CHUNKSIZE)
+    parser.add_arg('--passes', int, 'The number of passes over the dataset when streaming',
+                   required=False, default=STREAM_PASSES)
+    parser.add_arg('--init-from', str, 'The model whose weights the training starts from',
+                   required=False, dest='init_from')
+    add_checkpoint_args(parser)
+    parser.add_arg('--output', str, 'The path of the model, binary if it ends with .npz',
+                   required=False, default='model.json')
 
-    model = parser.read_model()
+    model = parser.read_model('minibatch' if parser.read_arg('stream') else 'batch')
     logging.debug('Using model %s', model)
 
-    df = parser.read_dataset()
-    df = Parser.fill_dataset(df)
+    model_args = read_model_args(parser, model)
+
+    ovr = OvrClassifier(model, n_jobs=parser.read_arg('n_jobs'), **model_args)
+    ovr.checkpoint = read_checkpoint(parser)
+
+    init_from = parser.read_arg('init_from')
+    if init_from is not None:
+        logging.info('Starting from the weights of %s', init_from)
+
+        previous = OvrClassifier(model)
+        previous.load_models(init_from)
+        ovr.warm_start(previous)
+
+    if parser.read_arg('stream'):
+        logging.info('Training models on a stream')
+        train_stream(parser, ovr, parser.read_arg('chunksize'), parser.read_arg('passes'))
+        logging.info('Training complete')
+
+        ovr.save_models(parser.read_arg('output'))
+        return
+
+    df = parser.read_dataset([HOGWARTS_HOUSE, *HOGWARTS_COURSES])
 
     y = Parser.get_y(df)
-    x = Parser.get_x(df)
+    features = Parser.get_features(df)
+
+    preprocessing = Preprocessing.fit(features)
+    x = preprocessing.transform(features.to_numpy(dtype=float))
 
-    ovr = OvrClassifier(model)
+    ovr.preprocessing = preprocessing
 
     logging.info('Training models')
-    ovr.fit(x, y)
+
+    try:
+        ovr.fit(x, y)
+    except ValueError as e:
+        logging.error('Could not train the models: %s', e)
+        sys.exit(1)
+
     logging.info('Training complete')
 
-    ovr.save_models('model.json')
+    ovr.save_models(parser.read_arg('output'))
 
 
 if __name__ == '__main__':
@@ -4,9 +4,6 @@ This module is used to display a pair plot of the dataset.
 
 import logging
 
-import matplotlib.pyplot as plt
-import seaborn as sns
-
 from dslr.hogwarts import HOGWARTS_HOUSE
 from dslr.parser import Parser
 
@@ -22,8 +19,6 @@ def main() -> None:
     parser.add_arg("third_course", str, "The third course to display on the pair plot")
     parser.add_arg("fourth_course", str, "The fourth course to display on the pair plot")
 
-    df = parser.read_dataset()
-
     courses = [
         parser.read_course("first_course"),
         parser.read_course("second_course"),
@@ -31,6 +26,13 @@ def main() -> None:
         parser.read_course("fourth_course"),
     ]
 
+    df = parser.read_dataset([HOGWARTS_HOUSE, *courses], float_dtype='float32')
+
+    # Matplotlib and seaborn are only imported once the arguments and the dataset are valid.
+    # pylint: disable=import-outside-toplevel
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+
     sns.pairplot(df, hue=HOGWARTS_HOUSE, vars=courses, diag_kind='hist', height=2.0, aspect=1.5)
 
     try:
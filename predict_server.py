@@ -0,0 +1,377 @@
+"""
+This module runs an HTTP server predicting the house of one student per request.
+
+Concurrent requests are scored together, in micro-batches, with one matrix
+multiplication each. The server only uses asyncio, and answers:
+
+- `POST /predict`: the body is a JSON object mapping the name of each feature
+  to its value, missing features are imputed. The response holds the predicted
+  house and the probability of each house.
+- `GET /metrics`: the percentiles of the latency of the requests, and the
+  number of batches of each size.
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import sys
+import time
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+
+from dslr.batching import MicroBatcher
+from dslr.model.ovr import OvrClassifier
+from dslr.parser import Parser
+
+
+HOST = '127.0.0.1'
+PORT = 8000
+MAX_BATCH_SIZE = 64
+MAX_WAIT_US = 500
+
+MAX_BODY_SIZE = 1 << 20
+
+REASONS = {
+    200: 'OK',
+    400: 'Bad Request',
+    404: 'Not Found',
+    405: 'Method Not Allowed',
+    413: 'Payload Too Large',
+    500: 'Internal Server Error',
+}
+
+
+class HttpError(Exception):
+    """
+    This exception is raised when a request cannot be answered.
+
+    Attributes:
+        status (int): The HTTP status of the response.
+    """
+
+    status: int
+
+
+    def __init__(self, status: int, message: str) -> None:
+        super().__init__(message)
+        self.status = status
+
+
+class PredictServer:
+    """
+    This class implements the prediction server.
+
+    Attributes:
+        batcher (MicroBatcher): The batcher scoring the rows.
+        features (List[str]): The name of each feature of the model.
+    """
+
+    batcher: MicroBatcher
+    features: List[str]
+
+
+    def __init__(self, ovr: OvrClassifier, max_batch_size: int, max_wait: float) -> None:
+        """
+        Initialize the server.
+
+        Args:
+            ovr (OvrClassifier): The classifier, with its preprocessing.
+            max_batch_size (int): The largest number of rows scored at once.
+            max_wait (float): The longest time a row waits for other rows, in seconds.
+
+        Raises:
+            ValueError: If the classifier has no preprocessing.
+        """
+
+        if ovr.preprocessing is None:
+            raise ValueError('The model has no preprocessing, train it again to serve it.')
+
+        self.batcher = MicroBatcher(ovr, max_batch_size, max_wait)
+        self.features = ovr.preprocessing.features
+        self._labels = ovr.classes
+
+
+    async def start(self, host: str, port: int) -> asyncio.Server:
+        """
+        Start listening for requests.
+
+        Args:
+            host (str): The address to listen on.
+            port (int): The port to listen on, `0` for any free port.
+
+        Returns:
+            asyncio.Server: The listening server.
+        """
+
+        self.batcher.start()
+        return await asyncio.start_server(self.handle, host, port)
+
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """
+        Answer the requests of a connection, until the client closes it.
+
+        Args:
+            reader (asyncio.StreamReader): The stream the requests are read from.
+            writer (asyncio.StreamWriter): The stream the responses are written to.
+        """
+
+        try:
+            while True:
+                try:
+                    request = await read_request(reader)
+                except asyncio.IncompleteReadError:
+                    break
+                except HttpError as e:
+                    await write_response(writer, e.status, {'error': str(e)}, keep_alive=False)
+                    break
+
+                if request is None:
+                    break
+
+                start = time.perf_counter()
+                method, path, headers, body = request
+
+                try:
+                    status, response = 200, await self.route(method, path, body)
+                except HttpError as e:
+                    status, response = e.status, {'error': str(e)}
+                # pylint: disable=broad-except
+                except Exception as e:
+                    logging.error('Could not answer the request: %s', e)
+                    status, response = 500, {'error': str(e) or type(e).__name__}
+
+                keep_alive = headers.get('connection', '').lower() != 'close'
+                await write_response(writer, status, response, keep_alive)
+
+                if path == '/predict':
+                    self.batcher.stats.add_latency(time.perf_counter() - start)
+
+                if not keep_alive:
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+
+    async def route(self, method: str, path: str, body: bytes) -> Dict[str, Any]:
+        """
+        Answer a request.
+
+        Args:
+            method (str): The method of the request.
+            path (str): The path of the request.
+            body (bytes): The body of the request.
+
+        Returns:
+            Dict[str, Any]: The body of the response.
+
+        Raises:
+            HttpError: If the request is not valid.
+        """
+
+        if path == '/metrics':
+            if method != 'GET':
+                raise HttpError(405, 'Use GET.')
+
+            return self.batcher.stats.summary()
+
+        if path == '/predict':
+            if method != 'POST':
+                raise HttpError(405, 'Use POST.')
+
+            probabilities = await self.batcher.predict(self.parse_row(body))
+
+            return {
+                'house': self._labels[int(np.argmax(probabilities))],
+                'probabilities': dict(zip(self._labels, probabilities.tolist())),
+            }
+
+        raise HttpError(404, f'Unknown path: {path}.')
+
+
+    def parse_row(self, body: bytes) -> np.ndarray:
+        """
+        Parse the features of a student.
+
+        Args:
+            body (bytes): A JSON object mapping the name of each feature to its value.
+
+        Returns:
+            np.ndarray: The value of each feature, NaN where it is missing.
+
+        Raises:
+            HttpError: If the body is not a valid row.
+        """
+
+        try:
+            row = json.loads(body)
+        except ValueError as e:
+            raise HttpError(400, f'The body is not valid JSON: {e}') from e
+
+        if not isinstance(row, dict):
+            raise HttpError(400, 'The body must be an object mapping each feature to its value.')
+
+        try:
+            values = [row.get(feature) for feature in self.features]
+            return np.array([np.nan if v is None else v for v in values], dtype=np.float64)
+        except (TypeError, ValueError) as e:
+            raise HttpError(400, f'The features must be numbers: {e}') from e
+
+
+async def read_request(
+    reader: asyncio.StreamReader
+) -> Tuple[str, str, Dict[str, str], bytes] | None:
+    """
+    Read an HTTP/1.1 request.
+
+    Args:
+        reader (asyncio.StreamReader): The stream to read the request from.
+
+    Returns:
+        Tuple[str, str, Dict[str, str], bytes] | None: The method, the path, the headers
+            with lowercase names and the body of the request, or None if the stream ended.
+
+    Raises:
+        HttpError: If the request is not valid.
+    """
+
+    line = await reader.readline()
+    if not line:
+        return None
+
+    try:
+        method, path, _ = line.decode('latin-1').split()
+    except ValueError as e:
+        raise HttpError(400, 'Invalid request line.') from e
+
+    headers = {}
+    while (line := await reader.readline()) not in (b'\r\n', b'\n', b''):
+        name, _, value = line.decode('latin-1').partition(':')
+        headers[name.strip().lower()] = value.strip()
+
+    try:
+        length = int(headers.get('content-length', 0))
+    except ValueError as e:
+        raise HttpError(400, 'Invalid Content-Length.') from e
+
+    if length > MAX_BODY_SIZE:
+        raise HttpError(413, 'The body is too large.')
+
+    body = await reader.readexactly(length) if length else b''
+
+    return method, path, headers, body
+
+
+async def write_response(
+    writer: asyncio.StreamWriter,
+    status: int,
+    body: Dict[str, Any],
+    keep_alive: bool = True
+) -> None:
+    """
+    Write an HTTP/1.1 response with a JSON body.
+
+    Args:
+        writer (asyncio.StreamWriter): The stream to write the response to.
+        status (int): The status of the response.
+        body (Dict[str, Any]): The body of the response.
+        keep_alive (bool): Whether the connection stays open for other requests.
+    """
+
+    content = json.dumps(body).encode()
+    head = (
+        f'HTTP/1.1 {status} {REASONS[status]}\r\n'
+        'Content-Type: application/json\r\n'
+        f'Content-Length: {len(content)}\r\n'
+        f'Connection: {"keep-alive" if keep_alive else "close"}\r\n'
+        '\r\n'
+    )
+
+    writer.write(head.encode('latin-1') + content)
+    await writer.drain()
+
+
+async def serve(server: PredictServer, host: str, port: int) -> None:
+    """
+    Answer requests until the process is interrupted.
+
+    Args:
+        server (PredictServer): The prediction server.
+        host (str): The address to listen on.
+        port (int): The port to listen on.
+    """
+
+    listening = await server.start(host, port)
+    logging.info('Listening on http://%s:%d', host, port)
+
+    async with listening:
+        await listening.serve_forever()
+
+
+def positive_int(value: str) -> int:
+    """
+    Parse a command line argument which must be an integer of at least 1.
+
+    Args:
+        value (str): The argument.
+
+    Returns:
+        int: The integer.
+
+    Raises:
+        argparse.ArgumentTypeError: If the argument is not an integer of at least 1.
+    """
+
+    try:
+        number = int(value)
+    except ValueError:
+        number = 0
+
+    if number < 1:
+        raise argparse.ArgumentTypeError(f'{value} is not an integer of at least 1')
+
+    return number
+
+
+def main() -> None:
+    """
+    The main function to run the prediction server.
+    """
+
+    logging.basicConfig(level=logging.INFO)
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument('model_path', type=str, help='The path to the model file')
+    parser.add_argument('--model', type=str, default='batch',
+                        choices=['batch', 'stochastic', 'minibatch', 'sharded', 'newton', 'lbfgs'],
+                        help='The model used')
+    parser.add_argument('--host', type=str, default=HOST, help='The address to listen on')
+    parser.add_argument('--port', type=int, default=PORT, help='The port to listen on')
+    parser.add_argument('--max-batch-size', type=positive_int, default=MAX_BATCH_SIZE,
+                        help='The largest number of rows scored at once')
+    parser.add_argument('--max-wait-us', type=positive_int, default=MAX_WAIT_US,
+                        help='The longest time a row waits for other rows, in microseconds')
+
+    args = parser.parse_args()
+
+    ovr = OvrClassifier(Parser.get_model(args.model))
+    ovr.load_models(args.model_path)
+
+    try:
+        server = PredictServer(ovr, args.max_batch_size, args.max_wait_us / 1e6)
+    except ValueError as e:
+        logging.error(e)
+        sys.exit(1)
+
+    try:
+        asyncio.run(serve(server, args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
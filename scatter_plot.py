@@ -4,8 +4,6 @@ This module is used to display a scatter plot of the dataset.
 
 import logging
 
-import matplotlib.pyplot as plt
-
 from dslr.hogwarts import HOGWARTS_HOUSE
 from dslr.parser import Parser
 
@@ -20,11 +18,14 @@ def main() -> None:
     parser.add_arg('first_course', str, 'The first course to display on the scatter plot')
     parser.add_arg('second_course', str, 'The second course to display on the scatter plot')
 
-    df = parser.read_dataset()
     x = parser.read_course('first_course')
     y = parser.read_course('second_course')
+    df = parser.read_dataset([HOGWARTS_HOUSE, x, y], float_dtype='float32')
+
+    # Matplotlib is only imported once the arguments and the dataset are valid.
+    import matplotlib.pyplot as plt # pylint: disable=import-outside-toplevel
 
-    for house, group in df.groupby(HOGWARTS_HOUSE):
+    for house, group in df.groupby(HOGWARTS_HOUSE, observed=True):
         plt.scatter(group[x], group[y], alpha=0.6, label=house)
     plt.legend(title="Hogwarts House")
     plt.xlabel(x)
@@ -0,0 +1,288 @@
+"""
+This module runs a daemon which answers describe, predict and accuracy requests.
+
+The daemon keeps the datasets and models it reads in memory, so that a request
+only pays for its computation, not for starting Python, importing the
+dependencies, parsing the dataset or loading the model. Requests are sent with
+`client.py`.
+"""
+
+import argparse
+import logging
+import os
+import socket
+import socketserver
+import sys
+import threading
+from typing import Any, Callable, Dict, Tuple
+
+import pandas as pd
+
+from describe import describe, describe_grouped
+from logreg_accuracy import score
+from logreg_predict import predict
+from dslr.cache import LruCache, read_csv_cached
+from dslr.client import receive, send, socket_path
+from dslr.model.ovr import OvrClassifier
+from dslr.parser import Parser
+from dslr.sketch import HLL_PRECISION, SKETCH_SIZE
+
+
+CACHE_SIZE = 512
+
+
+class DslrServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """
+    This class implements the daemon, listening on a Unix socket.
+
+    Attributes:
+        cache (LruCache): The datasets and models in memory.
+    """
+
+    daemon_threads = True
+
+    cache: LruCache
+
+
+    def __init__(self, path: str, cache_size: int) -> None:
+        """
+        Listen on a Unix socket.
+
+        Args:
+            path (str): The path of the socket.
+            cache_size (int): The total size of the datasets and models kept in memory, in bytes.
+
+        Raises:
+            OSError: If a daemon is already listening on the socket.
+        """
+
+        _remove_stale_socket(path)
+
+        self.cache = LruCache(cache_size)
+        self.commands: Dict[str, Callable[[Dict[str, Any]], Dict[str, Any]]] = {
+            'describe': self.describe,
+            'predict': self.predict,
+            'accuracy': self.accuracy,
+            'stats': self.stats,
+            'stop': self.stop,
+        }
+
+        super().__init__(path, _RequestHandler)
+
+
+    def server_bind(self) -> None:
+        """
+        Bind the socket, readable and writable by the user only.
+
+        The socket is created with these permissions, instead of being restricted
+        once it exists, so that other users can never connect to it.
+        """
+
+        umask = os.umask(0o177)
+        try:
+            super().server_bind()
+        finally:
+            os.umask(umask)
+
+
+    def dispatch(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Run the command of a request.
+
+        Args:
+            request (Dict[str, Any]): The request.
+
+        Returns:
+            Dict[str, Any]: The response.
+
+        Raises:
+            ValueError: If the command is not valid.
+        """
+
+        command = self.commands.get(request.get('command')) # type: ignore
+        if command is None:
+            raise ValueError(f'Unknown command: {request.get("command")}.')
+
+        return command(request)
+
+
+    def describe(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Describe a dataset, like `describe.py`.
+        """
+
+        df = self.dataset(request['dataset'])
+        by = request.get('by')
+
+        if by is not None:
+            if by not in df.columns:
+                raise ValueError(f'`{by}` is not a valid column.')
+
+            return {'output': str(describe_grouped(df, by))}
+
+        sketch_size = SKETCH_SIZE if request.get('quantiles') == 'sketch' else None
+        unique_precision = HLL_PRECISION if request.get('unique') == 'sketch' else None
+
+        return {'output': str(describe(df, sketch_size, unique_precision))}
+
+
+    def predict(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Predict the house of every student of a dataset, like `logreg_predict.py`.
+        """
+
+        df = self.dataset(request['dataset'])
+        ovr = self.model(request['model'], request.get('model_type', 'batch'))
+
+        return {'index': df.index.tolist(), 'houses': predict(ovr, df).tolist()}
+
+
+    def accuracy(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Compute the accuracy of a model on a dataset, like `logreg_accuracy.py`.
+        """
+
+        df = self.dataset(request['dataset'])
+        ovr = self.model(request['model'], request.get('model_type', 'batch'))
+
+        return {'accuracy': score(ovr, df)}
+
+
+    def stats(self, _: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Describe the content of the cache.
+        """
+
+        return {
+            'entries': len(self.cache),
+            'size': self.cache.size,
+            'max_size': self.cache.max_bytes,
+            'hits': self.cache.hits,
+            'misses': self.cache.misses,
+        }
+
+
+    def stop(self, _: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Stop the daemon once the response is sent.
+        """
+
+        # `shutdown` waits for `serve_forever` to return, so it cannot run on its thread.
+        threading.Thread(target=self.shutdown).start()
+        return {}
+
+
+    def dataset(self, path: str) -> pd.DataFrame:
+        """
+        Get a dataset, parsed with the Hogwarts schema.
+
+        Args:
+            path (str): The path of the dataset.
+
+        Returns:
+            pd.DataFrame: The dataset.
+        """
+
+        def load() -> Tuple[pd.DataFrame, int]:
+            logging.info('Loading the dataset %s', path)
+            df = read_csv_cached(path, dtype=Parser.schema())
+            return df, int(df.memory_usage(deep=True).sum())
+
+        return self.cache.get(('dataset', *_file_key(path)), load)
+
+
+    def model(self, path: str, model_type: str) -> OvrClassifier:
+        """
+        Get a model.
+
+        Args:
+            path (str): The path of the model.
+            model_type (str): The name of the model, as accepted by `--model`.
+
+        Returns:
+            OvrClassifier: The model.
+        """
+
+        def load() -> Tuple[OvrClassifier, int]:
+            logging.info('Loading the model %s', path)
+
+            ovr = OvrClassifier(Parser.get_model(model_type))
+            ovr.load_models(path)
+
+            return ovr, sum(model.weights.nbytes + 8 for model in ovr.models)
+
+        return self.cache.get(('model', model_type, *_file_key(path)), load)
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    server: DslrServer
+
+    def handle(self) -> None:
+        try:
+            response = self.server.dispatch(receive(self.connection))
+        # The scripts exit once they have logged an error, which must not stop the daemon.
+        except SystemExit:
+            response = {'error': 'The request failed, see the log of the daemon.'}
+        # pylint: disable=broad-except
+        except Exception as e:
+            logging.error('Could not answer the request: %s', e)
+            response = {'error': str(e) or type(e).__name__}
+
+        send(self.connection, response)
+
+
+def _file_key(path: str) -> Tuple[str, int, int]:
+    # A file which changed is loaded again.
+    stat = os.stat(path)
+    return os.path.abspath(path), stat.st_size, stat.st_mtime_ns
+
+
+def _remove_stale_socket(path: str) -> None:
+    if not os.path.exists(path):
+        return
+
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as connection:
+        try:
+            connection.connect(path)
+        except OSError:
+            os.unlink(path)
+            return
+
+    raise OSError(f'A daemon is already listening on {path}.')
+
+
+def main() -> None:
+    """
+    The main function to run the daemon.
+    """
+
+    logging.basicConfig(level=logging.INFO)
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--socket', type=str, default=socket_path(),
+                        help='The path of the Unix socket to listen on')
+    parser.add_argument('--cache-size', type=int, default=CACHE_SIZE,
+                        help='The total size of the datasets and models kept in memory, in MiB')
+
+    args = parser.parse_args()
+
+    try:
+        server = DslrServer(args.socket, args.cache_size * 2 ** 20)
+    except OSError as e:
+        logging.error('Could not start the daemon: %s', e)
+        sys.exit(1)
+
+    logging.info('Listening on %s', args.socket)
+
+    with server:
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            if os.path.exists(args.socket):
+                os.unlink(args.socket)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,155 @@
+"""
+Test the micro-batching of predictions.
+"""
+
+import asyncio
+import unittest
+from unittest import mock
+import numpy as np
+import pandas as pd
+from dslr.batching import LatencyStats, MicroBatcher
+from dslr.model.ovr import OvrClassifier
+from dslr.model.logreg_batch import LogRegBatch
+from dslr.preprocessing import Preprocessing
+
+class TestLatencyStats(unittest.TestCase):
+    """
+    Test the latency statistics.
+    """
+
+    def test_summary(self):
+        """
+        Test summarizing the latencies and the batch sizes.
+        """
+
+        stats = LatencyStats(4, window=100)
+        for i in range(1, 201):
+            stats.add_latency(i / 1000)
+        stats.add_batch(1)
+        stats.add_batch(4)
+        stats.add_batch(4)
+
+        summary = stats.summary()
+
+        self.assertEqual(summary['requests'], 200)
+        self.assertEqual(summary['batches'], 3)
+        self.assertAlmostEqual(summary['latency_ms']['p50'], 150.5)
+        self.assertAlmostEqual(summary['latency_ms']['max'], 200)
+        self.assertEqual(summary['batch_sizes'], {'1': 1, '4': 2})
+
+
+    def test_empty(self):
+        """
+        Test summarizing no requests.
+        """
+
+        summary = LatencyStats(4).summary()
+
+        self.assertEqual(summary['requests'], 0)
+        self.assertTrue(np.isnan(summary['latency_ms']['p99']))
+
+
+class TestMicroBatcher(unittest.IsolatedAsyncioTestCase):
+    """
+    Test the micro-batcher.
+    """
+
+    def setUp(self):
+        self.x = np.array([[1, 2], [3, np.nan], [5, 6], [7, 8], [9, 10]], dtype=float)
+        y = np.array([[0, 1], [1, 0], [0, 1], [1, 0], [0, 1]])
+
+        self.ovr = OvrClassifier(LogRegBatch)
+        self.ovr.preprocessing = Preprocessing.fit(pd.DataFrame(self.x))
+        self.ovr.fit(self.ovr.preprocessing.transform(self.x), y)
+
+
+    async def test_predict(self):
+        """
+        Test that concurrent rows are scored together, like one batch.
+        """
+
+        batcher = MicroBatcher(self.ovr, 4, max_wait=.01)
+        batcher.start()
+
+        try:
+            predictions = await asyncio.gather(*(batcher.predict(row) for row in self.x))
+        finally:
+            await batcher.stop()
+
+        np.testing.assert_allclose(predictions, self.ovr.predict_batch(self.x))
+        self.assertEqual(batcher.stats.summary()['batch_sizes'], {'1': 1, '4': 1})
+
+
+    async def test_max_wait(self):
+        """
+        Test that a row alone is scored once it has waited long enough.
+        """
+
+        batcher = MicroBatcher(self.ovr, 4, max_wait=.001)
+        batcher.start()
+
+        try:
+            prediction = await asyncio.wait_for(batcher.predict(self.x[0]), 1)
+        finally:
+            await batcher.stop()
+
+        np.testing.assert_allclose(prediction, self.ovr.predict_batch(self.x[:1])[0])
+
+
+    async def test_error(self):
+        """
+        Test that an error is raised for every row of the batch.
+        """
+
+        batcher = MicroBatcher(self.ovr, 4, max_wait=.01)
+        batcher.start()
+
+        try:
+            results = await asyncio.gather(batcher.predict(self.x[0]),
+                                           batcher.predict(self.x[0][:1]),
+                                           return_exceptions=True)
+        finally:
+            await batcher.stop()
+
+        self.assertTrue(all(isinstance(result, ValueError) for result in results))
+
+
+    async def test_invalid(self):
+        """
+        Test that batches without rows and rows which do not wait are rejected.
+        """
+
+        with self.assertRaises(ValueError):
+            MicroBatcher(self.ovr, 0, max_wait=.01)
+
+        with self.assertRaises(ValueError):
+            MicroBatcher(self.ovr, 4, max_wait=0)
+
+
+    async def test_bookkeeping_error(self):
+        """
+        Test that an error recording a batch fails its rows, and the next batches are scored.
+        """
+
+        batcher = MicroBatcher(self.ovr, 4, max_wait=.001)
+        batcher.start()
+
+        try:
+            # The error is returned rather than caught with assertRaises, which would clear
+            # the frames of its traceback, and so close the task scoring the batches.
+            with mock.patch.object(batcher.stats, 'add_batch', side_effect=IndexError):
+                failed, = await asyncio.gather(asyncio.wait_for(batcher.predict(self.x[0]), 1),
+                                               return_exceptions=True)
+
+            self.assertIsInstance(failed, IndexError)
+            prediction = await asyncio.wait_for(batcher.predict(self.x[0]), 1)
+        finally:
+            await batcher.stop()
+
+        np.testing.assert_allclose(prediction, self.ovr.predict_batch(self.x[:1])[0])
+
+        with self.assertRaises(RuntimeError):
+            await batcher.predict(self.x[0])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,76 @@
+"""
+This module contains the tests for the binary model format.
+"""
+
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from dslr.model.binary import load_binary, save_binary
+
+class TestBinary(unittest.TestCase):
+    """
+    This class contains the tests for the binary model format.
+    """
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory() # pylint: disable=consider-using-with
+        self.path = os.path.join(self.directory.name, 'model.npz')
+
+        self.weights = np.arange(12, dtype=np.float32).reshape(3, 4)
+        self.bias = np.array([1.0, 2.0, 3.0, 4.0])
+
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+
+    def test_load(self):
+        """
+        Test that the weights are memory-mapped, with the header they were saved with.
+        """
+
+        save_binary(self.path, self.weights, self.bias, {'classes': ['a', 'b', 'c', 'd']})
+        weights, bias, header = load_binary(self.path)
+
+        self.assertIsInstance(weights, np.memmap)
+        self.assertFalse(weights.flags.writeable)
+        np.testing.assert_array_equal(weights, self.weights)
+        np.testing.assert_array_equal(bias, self.bias)
+
+        self.assertEqual(header['classes'], ['a', 'b', 'c', 'd'])
+        self.assertEqual(header['dtype'], '<f4')
+
+        del weights
+
+
+    def test_load_compressed(self):
+        """
+        Test that compressed archives are read instead of being memory-mapped.
+        """
+
+        np.savez_compressed(
+            self.path,
+            weights=self.weights,
+            bias=self.bias,
+            header=np.array('{"format": 1}')
+        )
+        weights, _, _ = load_binary(self.path)
+
+        np.testing.assert_array_equal(weights, self.weights)
+
+
+    def test_load_invalid(self):
+        """
+        Test that archives which are not binary models are rejected.
+        """
+
+        np.savez(self.path, weights=self.weights)
+
+        with self.assertRaises(ValueError):
+            load_binary(self.path)
+
+if __name__ == '__main__':
+    unittest.main()
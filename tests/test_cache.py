@@ -0,0 +1,265 @@
+"""
+This module contains the tests for the dataset cache.
+"""
+
+import os
+import tempfile
+import threading
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+import pandas as pd
+import pandas.testing as pd_testing
+
+from dslr.cache import LruCache, clear_cache, read_csv_cached
+
+class TestCache(unittest.TestCase):
+    """
+    This class contains the tests for the dataset cache.
+    """
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory() # pylint: disable=consider-using-with
+        self.cache = os.path.join(self.directory.name, 'cache')
+        self.path = os.path.join(self.directory.name, 'dataset.csv')
+
+        self._write('Index,Name,Value,House\n0,a,1.5,x\n1,,2.5,y\n2,c,,\n')
+        self.dtype = {'Value': 'float32', 'House': pd.CategoricalDtype(['y', 'x', 'z'])}
+
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+
+    def _write(self, content: str, mtime: int | None = None) -> None:
+        with open(self.path, 'w', encoding='utf-8') as file:
+            file.write(content)
+
+        if mtime is not None:
+            os.utime(self.path, ns=(mtime, mtime))
+
+
+    def test_read(self):
+        """
+        Test that the cached dataset is the parsed one.
+        """
+
+        expected = pd.read_csv(self.path)
+
+        pd_testing.assert_frame_equal(read_csv_cached(self.path, directory=self.cache), expected)
+        self.assertEqual(len(os.listdir(self.cache)), 1)
+
+        with patch('dslr.cache.pd.read_csv') as read_csv:
+            df = read_csv_cached(self.path, directory=self.cache)
+            read_csv.assert_not_called()
+
+        pd_testing.assert_frame_equal(df, expected)
+
+
+    def test_read_columns(self):
+        """
+        Test that reading some columns with types gives what pandas parses.
+        """
+
+        for _ in range(2):
+            df = read_csv_cached(
+                self.path,
+                directory=self.cache,
+                columns=['House', 'Index', 'Value'],
+                dtype=self.dtype
+            )
+
+            expected = pd.read_csv(self.path, usecols=['House', 'Index', 'Value'], dtype=self.dtype)
+            pd_testing.assert_frame_equal(df, expected)
+
+        with self.assertRaises(ValueError):
+            read_csv_cached(self.path, directory=self.cache, columns=['Other'], dtype=self.dtype)
+
+
+    def test_read_new_columns(self):
+        """
+        Test that only the columns the entry does not hold yet are parsed.
+        """
+
+        with patch('dslr.cache.pd.read_csv', wraps=pd.read_csv) as read_csv:
+            read_csv_cached(self.path, directory=self.cache, columns=['Value'])
+            self.assertEqual(read_csv.call_args.kwargs['usecols'], ['Value'])
+
+            read_csv.reset_mock()
+            read_csv_cached(self.path, directory=self.cache, columns=['Index', 'Value'])
+            read_csv.assert_called_once()
+            self.assertEqual(read_csv.call_args.kwargs['usecols'], ['Index'])
+
+            read_csv.reset_mock()
+            df = read_csv_cached(self.path, directory=self.cache, columns=['Value', 'Index'])
+            read_csv.assert_not_called()
+
+        self.assertEqual(len(os.listdir(self.cache)), 1)
+        pd_testing.assert_frame_equal(df, pd.read_csv(self.path, usecols=['Index', 'Value']))
+
+        # The columns are the memory-mapped files of the entry, not copies of them.
+        self.assertFalse(df['Value'].to_numpy().flags.writeable)
+
+
+    def test_dtype(self):
+        """
+        Test that a file read with other types has its own entry.
+        """
+
+        read_csv_cached(self.path, directory=self.cache)
+        df = read_csv_cached(self.path, directory=self.cache, dtype=self.dtype)
+
+        self.assertEqual(len(os.listdir(self.cache)), 2)
+        self.assertEqual(df['Value'].dtype, 'float32')
+
+        clear_cache(self.path, directory=self.cache)
+        self.assertEqual(os.listdir(self.cache), [])
+
+
+    def test_modified(self):
+        """
+        Test that the entry is rebuilt once the content of the file changes.
+        """
+
+        self._write('Index,Name,Value\n0,a,1.5\n', mtime=10 ** 18)
+        read_csv_cached(self.path, directory=self.cache)
+
+        # The same size, but not the same content nor modification time.
+        self._write('Index,Name,Value\n0,b,1.5\n', mtime=10 ** 18 + 1)
+        df = read_csv_cached(self.path, directory=self.cache)
+
+        self.assertEqual(df['Name'][0], 'b')
+
+
+    def test_touched(self):
+        """
+        Test that the entry is reused if only the modification time of the file changes.
+        """
+
+        read_csv_cached(self.path, directory=self.cache)
+        os.utime(self.path, ns=(10 ** 18, 10 ** 18))
+
+        # The content is hashed a few bytes at a time, to the same digest.
+        with patch('dslr.cache.pd.read_csv') as read_csv, patch('dslr.cache.HASH_CHUNK_SIZE', 4):
+            read_csv_cached(self.path, directory=self.cache)
+            read_csv.assert_not_called()
+
+
+    def test_refresh(self):
+        """
+        Test that the entry is rebuilt when asked to.
+        """
+
+        read_csv_cached(self.path, directory=self.cache)
+
+        with patch('dslr.cache.pd.read_csv', wraps=pd.read_csv) as read_csv:
+            read_csv_cached(self.path, refresh=True, directory=self.cache)
+            read_csv.assert_called_once()
+
+
+    def test_clear(self):
+        """
+        Test that clearing the cache removes the entry of the file.
+        """
+
+        read_csv_cached(self.path, directory=self.cache)
+        clear_cache(self.path, directory=self.cache)
+
+        self.assertEqual(os.listdir(self.cache), [])
+
+class TestLruCache(unittest.TestCase):
+    """
+    This class contains the tests for the LruCache class.
+    """
+
+    def test_get(self):
+        """
+        Test that values are loaded once.
+        """
+
+        cache = LruCache(100)
+
+        self.assertEqual(cache.get('a', lambda: (1, 10)), 1)
+        self.assertEqual(cache.get('a', lambda: (2, 10)), 1)
+        self.assertEqual((cache.hits, cache.misses, cache.size), (1, 1, 10))
+
+
+    def test_evict(self):
+        """
+        Test that the least recently used values are evicted once the cache is full.
+        """
+
+        cache = LruCache(100)
+
+        cache.get('a', lambda: ('a', 40))
+        cache.get('b', lambda: ('b', 40))
+        cache.get('a', lambda: ('a', 40))
+        cache.get('c', lambda: ('c', 40))
+
+        self.assertEqual(cache.get('a', lambda: ('new', 40)), 'a')
+        self.assertEqual(cache.get('b', lambda: ('new', 40)), 'new')
+        self.assertEqual(len(cache), 2)
+        self.assertLessEqual(cache.size, 100)
+
+
+    def test_too_large(self):
+        """
+        Test that values larger than the cache are not kept.
+        """
+
+        cache = LruCache(100)
+        cache.get('a', lambda: ('a', 40))
+
+        self.assertEqual(cache.get('b', lambda: ('b', 200)), 'b')
+        self.assertEqual(len(cache), 1)
+
+
+    def test_concurrent_load(self):
+        """
+        Test that a slow load does not block other values, and is not run twice.
+        """
+
+        cache = LruCache(100)
+        cache.get('a', lambda: ('a', 10))
+
+        started, release = threading.Event(), threading.Event()
+        loads = []
+
+        def load():
+            loads.append(1)
+            started.set()
+            release.wait(5)
+            return 'b', 10
+
+        with ThreadPoolExecutor(2) as pool:
+            first = pool.submit(cache.get, 'b', load)
+            started.wait(5)
+            second = pool.submit(cache.get, 'b', load)
+
+            self.assertEqual(cache.get('a', lambda: ('new', 10)), 'a')
+            self.assertFalse(first.done())
+
+            release.set()
+            self.assertEqual((first.result(5), second.result(5)), ('b', 'b'))
+
+        self.assertEqual(len(loads), 1)
+
+
+    def test_failed_load(self):
+        """
+        Test that a failed load is not cached, so that it is tried again.
+        """
+
+        def load():
+            raise OSError('missing')
+
+        cache = LruCache(100)
+
+        with self.assertRaises(OSError):
+            cache.get('a', load)
+
+        self.assertEqual(cache.get('a', lambda: ('a', 10)), 'a')
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,228 @@
+"""
+This module contains the tests for the Checkpoint class.
+"""
+# pylint:disable=duplicate-code
+
+import itertools
+import os
+import tempfile
+import unittest
+from unittest import mock
+import numpy as np
+
+from dslr.model.checkpoint import Checkpoint
+from dslr.model.logreg_batch import LogRegBatch
+from dslr.model.logreg_minibatch import LogRegMiniBatch
+from dslr.model.logreg_newton import LogRegNewton
+from dslr.model.logreg_stochastic import LogRegStochastic
+from dslr.model.ovr import OvrClassifier
+
+
+def interrupt_after(model, calls):
+    """
+    Interrupt the training of a model once it updated its weights a number of times.
+    """
+
+    update = model._update_weights # pylint: disable=protected-access
+    count = itertools.count()
+
+    def interrupted(self, *args):
+        if next(count) == calls:
+            raise KeyboardInterrupt
+        return update(self, *args)
+
+    return mock.patch.object(model, '_update_weights', interrupted)
+
+
+class TestCheckpoint(unittest.TestCase):
+    """
+    This class contains the tests for the Checkpoint class.
+    """
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory() # pylint: disable=consider-using-with
+        self.addCleanup(self.directory.cleanup)
+
+        rng = np.random.default_rng(42)
+        self.x = rng.normal(size=(200, 3))
+        labels = np.argmax(self.x @ rng.normal(size=(3, 4)) + rng.normal(size=(200, 4)), axis=1)
+        self.y = np.eye(4)[labels]
+
+
+    def resume(self, model, calls, **kwargs):
+        """
+        Fit a model until it is interrupted, then fit another one resuming from its checkpoint.
+        """
+
+        interrupted = model(**kwargs)
+        interrupted.checkpoint = Checkpoint(self.directory.name, every_epochs=7)
+
+        with interrupt_after(model, calls), self.assertRaises(KeyboardInterrupt):
+            interrupted.fit(self.x, self.y if model.fused else self.y[:, 0])
+
+        resumed = model(**kwargs)
+        resumed.checkpoint = Checkpoint(self.directory.name, every_epochs=7, resume=True)
+
+        with self.assertLogs(level='INFO') as logs:
+            resumed.fit(self.x, self.y if model.fused else self.y[:, 0])
+
+        self.assertIn('Resuming training from epoch', logs.output[0])
+
+        expected = model(**kwargs)
+        expected.fit(self.x, self.y if model.fused else self.y[:, 0])
+
+        np.testing.assert_array_equal(resumed.weights, expected.weights)
+        np.testing.assert_array_equal(resumed.bias, expected.bias)
+
+        return resumed, expected
+
+
+    def test_save_load(self):
+        """
+        Test that the arrays and the other values of a state are loaded back.
+        """
+
+        checkpoint = Checkpoint(self.directory.name)
+        checkpoint.save(3, {'weights': np.arange(6.).reshape(3, 2), 'bias': 1.5, 'rng': {'a': 1}})
+
+        self.assertIsNone(checkpoint.load())
+
+        state = Checkpoint(self.directory.name, resume=True).load()
+
+        np.testing.assert_array_equal(state['weights'], np.arange(6.).reshape(3, 2))
+        self.assertEqual(state['bias'], 1.5)
+        self.assertEqual(state['rng'], {'a': 1})
+        self.assertEqual(state['epoch'], 3)
+        self.assertEqual(os.listdir(self.directory.name), ['model.npz'])
+
+
+    def test_atomic(self):
+        """
+        Test that a failed save keeps the previous checkpoint, and leaves no file behind.
+        """
+
+        checkpoint = Checkpoint(self.directory.name, resume=True)
+        checkpoint.save(1, {'weights': np.zeros(3)})
+
+        with mock.patch('numpy.savez', side_effect=KeyboardInterrupt), \
+             self.assertRaises(KeyboardInterrupt):
+            checkpoint.save(2, {'weights': np.ones(3)})
+
+        self.assertEqual(checkpoint.load()['epoch'], 1)
+        self.assertEqual(os.listdir(self.directory.name), ['model.npz'])
+
+
+    def test_due(self):
+        """
+        Test that the state is due once enough epochs or seconds passed since the last save.
+        """
+
+        checkpoint = Checkpoint(self.directory.name, every_epochs=10)
+        self.assertFalse(checkpoint.due(9))
+        self.assertTrue(checkpoint.due(10))
+
+        checkpoint.save(10, {})
+        self.assertFalse(checkpoint.due(19))
+        self.assertTrue(checkpoint.due(20))
+
+        with mock.patch('time.monotonic', return_value=0):
+            checkpoint = Checkpoint(self.directory.name, every_seconds=5)
+
+        with mock.patch('time.monotonic', return_value=4):
+            self.assertFalse(checkpoint.due(1))
+        with mock.patch('time.monotonic', return_value=5):
+            self.assertTrue(checkpoint.due(1))
+
+
+    def test_resume_batch(self):
+        """
+        Test that a resumed batch gradient descent stops where an uninterrupted one does.
+        """
+
+        resumed, expected = self.resume(LogRegBatch, 60, learning_rate=.5, epochs=300,
+                                         tolerance=1e-3, patience=5)
+
+        np.testing.assert_array_equal(resumed.stopped_epoch, expected.stopped_epoch)
+
+
+    def test_resume_minibatch(self):
+        """
+        Test that a resumed mini-batch gradient descent visits the rows in the same order.
+        """
+
+        self.resume(LogRegMiniBatch, 7 * 13 + 5, epochs=20, batch_size=16)
+
+
+    def test_resume_stochastic(self):
+        """
+        Test that a resumed stochastic gradient descent continues from the same row.
+        """
+
+        self.resume(LogRegStochastic, 250, epochs=500)
+
+
+    def test_resume_optimizer(self):
+        """
+        Test that a resumed training continues with the state of its optimizer and its schedule.
+        """
+
+        self.resume(LogRegBatch, 60, epochs=100, optimizer='adam', schedule='cosine')
+        self.resume(LogRegStochastic, 250, epochs=500, optimizer='momentum', schedule='step')
+
+
+    def test_resume_complete(self):
+        """
+        Test that resuming a complete training does not train any further.
+        """
+
+        model = LogRegMiniBatch(epochs=5)
+        model.checkpoint = Checkpoint(self.directory.name)
+        model.fit(self.x, self.y)
+
+        resumed = LogRegMiniBatch(epochs=5)
+        resumed.checkpoint = Checkpoint(self.directory.name, resume=True)
+
+        with mock.patch.object(LogRegMiniBatch, '_update_weights') as update:
+            resumed.fit(self.x, self.y)
+
+        update.assert_not_called()
+        np.testing.assert_array_equal(resumed.weights, model.weights)
+
+
+    def test_other_model(self):
+        """
+        Test that a checkpoint is not resumed by another model.
+        """
+
+        model = LogRegMiniBatch(epochs=5)
+        model.checkpoint = Checkpoint(self.directory.name)
+        model.fit(self.x, self.y)
+
+        other = LogRegBatch(epochs=5)
+        other.checkpoint = Checkpoint(self.directory.name, resume=True)
+
+        with self.assertRaises(ValueError):
+            other.fit(self.x, self.y)
+
+
+    def test_ovr(self):
+        """
+        Test that the models which are not fused each save their own checkpoint.
+        """
+
+        ovr = OvrClassifier(LogRegStochastic, epochs=50)
+        ovr.checkpoint = Checkpoint(self.directory.name)
+        ovr.fit(self.x, self.y)
+
+        self.assertEqual(sorted(os.listdir(self.directory.name)),
+                         [f'model-class-{i}.npz' for i in range(4)])
+
+        ovr = OvrClassifier(LogRegNewton)
+        ovr.checkpoint = Checkpoint(self.directory.name)
+
+        with self.assertRaises(ValueError):
+            ovr.fit(self.x, self.y)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -50,5 +50,133 @@ class TestLogRegBatch(unittest.TestCase):
 
         self.assertTrue(0 <= pred <= 1)
 
+
+    def test_fit_ovr(self):
+        """
+        Test that fitting every class at once gives the per-class models.
+        """
+
+        x = np.array([[1, 2], [3, 4], [5, 6], [7, 1]])
+        y = np.array([[0, 1, 0], [1, 0, 0], [0, 0, 1], [0, 1, 0]])
+
+        models = LogRegBatch.fit_ovr(x, y, learning_rate=0.01, epochs=1000)
+        self.assertEqual(len(models), 3)
+
+        for i, model in enumerate(models):
+            expected = LogRegBatch(learning_rate=0.01, epochs=1000)
+            expected.fit(x, y[:, i])
+
+            np.testing.assert_allclose(model.weights, expected.weights)
+            self.assertAlmostEqual(model.bias, expected.bias)
+            self.assertIsInstance(model.bias, float)
+
+    def test_fit_tolerance(self):
+        """
+        Test that training stops once the gradient norm is below the tolerance.
+        """
+
+        x = np.array([[1, 2], [3, 4], [5, 6], [7, 1]]) / 7
+        y = np.array([[0, 1], [1, 0], [0, 0], [1, 1]])
+
+        models = LogRegBatch.fit_ovr(x, y, learning_rate=0.5, epochs=10000, tolerance=1e-2)
+
+        for i, model in enumerate(models):
+            expected = LogRegBatch(learning_rate=0.5, epochs=10000, tolerance=1e-2)
+            expected.fit(x, y[:, i])
+
+            self.assertLess(model.stopped_epoch, 10000)
+            self.assertEqual(model.stopped_epoch, expected.stopped_epoch)
+            np.testing.assert_allclose(model.weights, expected.weights)
+
+
+    def test_fit_loss_tolerance(self):
+        """
+        Test that training stops once the loss no longer changes.
+        """
+
+        log_reg = LogRegBatch(learning_rate=0.5, epochs=10000, loss_tolerance=1e-4)
+        log_reg.fit(np.array([[0.1, 0.2], [0.3, 0.4], [0.5, 0.6]]), np.array([0, 1, 0]))
+
+        self.assertIsInstance(log_reg.stopped_epoch, int)
+        self.assertLess(log_reg.stopped_epoch, 10000)
+
+
+    def test_gradient_loss(self):
+        """
+        Test that the loss computed with the gradient is the log loss of the predictions.
+        """
+
+        x = np.array([[0.1, 0.2], [0.3, 0.4], [0.5, 0.6], [0.7, -0.2]])
+        y = np.array([[0, 1], [1, 0], [0, 1], [1, 1]])
+
+        log_reg = LogRegBatch(learning_rate=0.5, epochs=20, loss_tolerance=0)
+        log_reg.fit(x, y)
+
+        _, _, loss = log_reg._gradient() # pylint: disable=protected-access
+        np.testing.assert_allclose(loss, log_reg.loss(x, y))
+
+
+    def test_partial_fit(self):
+        """
+        Test that updating the model with the whole dataset is an epoch of `fit`.
+        """
+
+        x = np.array([[1, 2], [3, 4], [5, 6]])
+        y = np.array([[0, 1], [1, 0], [0, 1]])
+
+        expected = LogRegBatch(learning_rate=0.01, epochs=2)
+        expected.fit(x, y)
+
+        self.log_reg.partial_fit(x, y)
+        self.log_reg.partial_fit(x, y)
+
+        np.testing.assert_allclose(self.log_reg.weights, expected.weights)
+        np.testing.assert_allclose(self.log_reg.bias, expected.bias)
+        np.testing.assert_array_equal(self.log_reg.stopped_epoch, [2, 2])
+
+
+    def test_warm_start(self):
+        """
+        Test that a warm started fit continues from the given weights.
+        """
+
+        x = np.array([[1, 2], [3, 4], [5, 6]])
+        y = np.array([0, 1, 0])
+
+        expected = LogRegBatch(epochs=20)
+        expected.fit(x, y)
+
+        start = LogRegBatch(epochs=10)
+        start.fit(x, y)
+
+        log_reg = LogRegBatch(epochs=10)
+        log_reg.warm_start(start.weights, start.bias)
+        log_reg.fit(x, y)
+
+        np.testing.assert_allclose(log_reg.weights, expected.weights)
+        self.assertAlmostEqual(log_reg.bias, expected.bias)
+
+        log_reg.warm_start(np.zeros(3), 0)
+        with self.assertRaises(ValueError):
+            log_reg.fit(x, y)
+
+
+    def test_fit_patience(self):
+        """
+        Test that training stops once the validation loss no longer improves.
+        """
+
+        rng = np.random.default_rng(42)
+        x = rng.normal(size=(40, 10))
+        y = rng.integers(0, 2, size=40)
+
+        log_reg = LogRegBatch(learning_rate=1, epochs=10000, patience=5, validation_split=.5)
+        log_reg.fit(x, y)
+
+        self.assertLess(log_reg.stopped_epoch, 10000)
+        self.assertEqual(log_reg.m, 20)
+        self.assertIsInstance(log_reg.bias, float)
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,65 @@
+"""
+This module contains the tests for the LogRegLbfgs class.
+"""
+# pylint:disable=duplicate-code
+
+import unittest
+import numpy as np
+
+from dslr.model.logreg_batch import LogRegBatch
+from dslr.model.logreg_lbfgs import LogRegLbfgs
+
+class TestLogRegLbfgs(unittest.TestCase):
+    """
+    This class contains the tests for the LogRegLbfgs class.
+    """
+
+    def setUp(self):
+        self.log_reg = LogRegLbfgs(epochs=1000)
+
+        rng = np.random.default_rng(42)
+        self.x = rng.normal(size=(200, 3))
+        self.y = (self.x @ np.array([1.5, -2.0, 0.5]) + rng.normal(size=200) > 0.3).astype(int)
+
+
+    def test_fit(self):
+        """
+        Test the fit method.
+        """
+
+        self.log_reg.fit(self.x, self.y)
+
+        self.assertEqual(self.log_reg.m, 200)
+        self.assertEqual(self.log_reg.n, 3)
+        self.assertIsInstance(self.log_reg.bias, float)
+        self.assertLess(self.log_reg.stopped_epoch, self.log_reg.epochs)
+
+
+    def test_converges(self):
+        """
+        Test that L-BFGS reaches the optimum gradient descent converges to.
+        """
+
+        self.log_reg.regularization = 0
+        self.log_reg.fit(self.x, self.y)
+
+        expected = LogRegBatch(learning_rate=1, epochs=20000, tolerance=1e-9)
+        expected.fit(self.x, self.y)
+
+        np.testing.assert_allclose(self.log_reg.weights, expected.weights, atol=1e-2)
+        self.assertAlmostEqual(self.log_reg.bias, expected.bias, delta=1e-2)
+
+
+    def test_predict(self):
+        """
+        Test the predict method.
+        """
+
+        self.log_reg.fit(self.x, self.y)
+
+        pred = self.log_reg.predict(np.array([2, 3, 1]))
+
+        self.assertTrue(0 <= pred <= 1)
+
+if __name__ == '__main__':
+    unittest.main()
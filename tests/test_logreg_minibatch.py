@@ -0,0 +1,128 @@
+"""
+This module contains the tests for the LogRegMiniBatch class.
+"""
+# pylint:disable=duplicate-code
+
+import unittest
+import numpy as np
+
+from dslr.model.logreg_batch import LogRegBatch
+from dslr.model.logreg_minibatch import LogRegMiniBatch
+
+class TestLogRegMiniBatch(unittest.TestCase):
+    """
+    This class contains the tests for the LogRegMiniBatch class.
+    """
+
+    def setUp(self):
+        self.log_reg = LogRegMiniBatch(epochs=100, batch_size=16)
+
+        rng = np.random.default_rng(42)
+        self.x = rng.normal(size=(200, 3))
+        self.y = (self.x @ np.array([1.5, -2.0, 0.5]) + rng.normal(size=200) > 0.3).astype(int)
+
+
+    def test_fit(self):
+        """
+        Test the fit method.
+        """
+
+        self.log_reg.fit(self.x, self.y)
+
+        self.assertEqual(self.log_reg.m, 200)
+        self.assertEqual(self.log_reg.n, 3)
+        self.assertEqual(self.log_reg.weights.shape, (3,))
+        self.assertIsInstance(self.log_reg.bias, float)
+
+
+    def test_full_batch(self):
+        """
+        Test that a single batch of every row is batch gradient descent.
+        """
+
+        self.log_reg.batch_size = len(self.x)
+        self.log_reg.fit(self.x, self.y)
+
+        expected = LogRegBatch(learning_rate=self.log_reg.learning_rate, epochs=100)
+        expected.fit(self.x, self.y)
+
+        np.testing.assert_allclose(self.log_reg.weights, expected.weights)
+        self.assertAlmostEqual(self.log_reg.bias, expected.bias)
+
+
+    def test_seed(self):
+        """
+        Test that the order the rows are visited in depends on the seed only.
+        """
+
+        self.log_reg.fit(self.x, self.y)
+
+        same = LogRegMiniBatch(epochs=100, batch_size=16)
+        same.fit(self.x, self.y)
+
+        other = LogRegMiniBatch(epochs=100, batch_size=16, seed=1)
+        other.fit(self.x, self.y)
+
+        np.testing.assert_array_equal(self.log_reg.weights, same.weights)
+        self.assertFalse(np.array_equal(self.log_reg.weights, other.weights))
+
+
+    def test_fit_ovr(self):
+        """
+        Test that fitting every class at once gives the per-class models.
+        """
+
+        y = np.stack([self.y, 1 - self.y, self.x[:, 0] > 0], axis=1).astype(int)
+        models = LogRegMiniBatch.fit_ovr(self.x, y, epochs=20, batch_size=16)
+
+        for i, model in enumerate(models):
+            expected = LogRegMiniBatch(epochs=20, batch_size=16)
+            expected.fit(self.x, y[:, i])
+
+            np.testing.assert_allclose(model.weights, expected.weights)
+            self.assertAlmostEqual(model.bias, expected.bias)
+
+
+    def test_partial_fit(self):
+        """
+        Test that one pass over the whole dataset is one epoch of `fit`.
+        """
+
+        expected = LogRegMiniBatch(epochs=1, batch_size=16)
+        expected.fit(self.x, self.y)
+
+        self.log_reg.partial_fit(self.x, self.y)
+
+        np.testing.assert_allclose(self.log_reg.weights, expected.weights)
+        self.assertAlmostEqual(self.log_reg.bias, expected.bias)
+
+
+    def test_partial_fit_deterministic(self):
+        """
+        Test that the same chunks in the same order give the same model.
+        """
+
+        models = [LogRegMiniBatch(batch_size=4), LogRegMiniBatch(batch_size=4)]
+
+        for model in models:
+            for _ in range(3):
+                for start in range(0, len(self.x), 10):
+                    model.partial_fit(self.x[start:start + 10], self.y[start:start + 10])
+
+        np.testing.assert_array_equal(models[0].weights, models[1].weights)
+        self.assertEqual(models[0].bias, models[1].bias)
+
+
+    def test_predict(self):
+        """
+        Test the predict method.
+        """
+
+        self.log_reg.fit(self.x, self.y)
+
+        pred = self.log_reg.predict(np.array([2, 3, 1]))
+
+        self.assertTrue(0 <= pred <= 1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,105 @@
+"""
+This module contains the tests for the LogRegNewton class.
+"""
+# pylint:disable=duplicate-code
+
+import unittest
+import numpy as np
+
+from dslr.model.logreg_batch import LogRegBatch
+from dslr.model.logreg_newton import LogRegNewton
+
+class TestLogRegNewton(unittest.TestCase):
+    """
+    This class contains the tests for the LogRegNewton class.
+    """
+
+    def setUp(self):
+        self.log_reg = LogRegNewton(epochs=100)
+
+        rng = np.random.default_rng(42)
+        self.x = rng.normal(size=(200, 3))
+        self.y = (self.x @ np.array([1.5, -2.0, 0.5]) + rng.normal(size=200) > 0.3).astype(int)
+
+
+    def test_fit(self):
+        """
+        Test the fit method.
+        """
+
+        self.log_reg.fit(self.x, self.y)
+
+        self.assertEqual(self.log_reg.m, 200)
+        self.assertEqual(self.log_reg.n, 3)
+        self.assertIsInstance(self.log_reg.bias, float)
+        self.assertLess(self.log_reg.stopped_epoch, self.log_reg.epochs)
+
+
+    def test_converges(self):
+        """
+        Test that Newton reaches the optimum gradient descent converges to.
+        """
+
+        self.log_reg.regularization = 0
+        self.log_reg.fit(self.x, self.y)
+
+        expected = LogRegBatch(learning_rate=1, epochs=20000, tolerance=1e-9)
+        expected.fit(self.x, self.y)
+
+        np.testing.assert_allclose(self.log_reg.weights, expected.weights, atol=1e-2)
+        self.assertAlmostEqual(self.log_reg.bias, expected.bias, delta=1e-2)
+
+
+    def test_fit_ovr(self):
+        """
+        Test that fitting every class at once gives the per-class models.
+        """
+
+        y = np.stack([self.y, 1 - self.y, self.x[:, 0] > 0], axis=1).astype(int)
+        models = LogRegNewton.fit_ovr(self.x, y)
+
+        for i, model in enumerate(models):
+            expected = LogRegNewton()
+            expected.fit(self.x, y[:, i])
+
+            np.testing.assert_allclose(model.weights, expected.weights, rtol=1e-6)
+            self.assertEqual(model.stopped_epoch, expected.stopped_epoch)
+
+
+    def test_warm_start(self):
+        """
+        Test that starting from the solution converges at once.
+        """
+
+        self.log_reg.fit(self.x, self.y)
+
+        log_reg = LogRegNewton(epochs=100)
+        log_reg.warm_start(self.log_reg.weights, self.log_reg.bias)
+        log_reg.fit(self.x, self.y)
+
+        self.assertLessEqual(log_reg.stopped_epoch, 2)
+        np.testing.assert_allclose(log_reg.weights, self.log_reg.weights, atol=1e-6)
+
+
+    def test_partial_fit(self):
+        """
+        Test that the model cannot be fitted one chunk at a time.
+        """
+
+        with self.assertRaises(NotImplementedError):
+            self.log_reg.partial_fit(np.array([[1., 2.]]), np.array([1]))
+
+
+    def test_predict(self):
+        """
+        Test the predict method.
+        """
+
+        self.log_reg.fit(self.x, self.y)
+
+        pred = self.log_reg.predict(np.array([2, 3, 1]))
+
+        self.assertTrue(0 <= pred <= 1)
+
+if __name__ == '__main__':
+    unittest.main()
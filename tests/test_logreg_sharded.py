@@ -0,0 +1,102 @@
+"""
+This module contains the tests for the LogRegSharded class.
+"""
+# pylint:disable=duplicate-code
+
+import unittest
+import numpy as np
+
+from dslr.model.logreg_batch import LogRegBatch
+from dslr.model.logreg_sharded import LogRegSharded
+
+class TestLogRegSharded(unittest.TestCase):
+    """
+    This class contains the tests for the LogRegSharded class.
+    """
+
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.x = rng.normal(size=(101, 3))
+        self.y = np.eye(3)[rng.integers(0, 3, 101)]
+
+
+    def assert_same_model(self, model, expected):
+        """
+        Assert that two models have the same weights, up to rounding.
+        """
+
+        np.testing.assert_allclose(model.weights, expected.weights, atol=1e-12)
+        np.testing.assert_allclose(model.bias, expected.bias, atol=1e-12)
+        np.testing.assert_array_equal(model.stopped_epoch, expected.stopped_epoch)
+
+
+    def test_fit(self):
+        """
+        Test that the model is the model of batch gradient descent.
+        """
+
+        expected = LogRegBatch(epochs=200)
+        expected.fit(self.x, self.y)
+
+        model = LogRegSharded(epochs=200, shards=3)
+        model.fit(self.x, self.y)
+
+        self.assert_same_model(model, expected)
+
+
+    def test_fit_one_class(self):
+        """
+        Test fitting a single target column.
+        """
+
+        expected = LogRegBatch(epochs=200)
+        expected.fit(self.x, self.y[:, 0])
+
+        model = LogRegSharded(epochs=200, shards=2)
+        model.fit(self.x, self.y[:, 0])
+
+        self.assert_same_model(model, expected)
+        self.assertIsInstance(model.bias, float)
+
+
+    def test_early_stopping(self):
+        """
+        Test that the stopping criteria see the same gradients and losses.
+        """
+
+        args = {'epochs': 2000, 'tolerance': 1e-2, 'loss_tolerance': 1e-5, 'patience': 10}
+
+        expected = LogRegBatch(**args)
+        expected.fit(self.x, self.y)
+
+        model = LogRegSharded(shards=2, **args)
+        model.fit(self.x, self.y)
+
+        self.assert_same_model(model, expected)
+        self.assertLess(max(model.stopped_epoch), 2000)
+
+
+    def test_more_shards_than_rows(self):
+        """
+        Test that there is at most one shard per row.
+        """
+
+        expected = LogRegBatch(epochs=10)
+        expected.fit(self.x[:2], self.y[:2])
+
+        model = LogRegSharded(epochs=10, shards=4)
+        model.fit(self.x[:2], self.y[:2])
+
+        self.assert_same_model(model, expected)
+
+
+    def test_partial_fit(self):
+        """
+        Test that the model cannot be fitted one chunk at a time.
+        """
+
+        with self.assertRaises(NotImplementedError):
+            LogRegSharded().partial_fit(self.x, self.y)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -17,6 +17,10 @@ from dslr.math import (
     ft_std,
     ft_percentile,
     ft_unique,
+    ft_statistics,
+    ft_parallel_statistics,
+    ft_grouped_statistics,
+    StatisticsAccumulator,
 )
 
 
@@ -121,6 +125,141 @@ class TestMath(unittest.TestCase):
         result = ft_unique(self.column)
         self.assertEqual(result, 6)
 
+        result = ft_unique(self.column, precision=14)
+        self.assertEqual(result, 6)
+
+
+    def test_ft_statistics(self):
+        """
+        Test the ft_statistics function.
+        """
+
+        block = np.array([
+            [1.0, 4.0],
+            [2.0, np.nan],
+            [3.0, 1.0],
+            [4.0, 1.0],
+            [5.0, np.nan],
+            [np.nan, 2.5],
+        ])
+
+        result = ft_statistics(block, percentiles=[.25, .5, .75], unique=True)
+
+        # The count is the number of rows, like len, and the spread is the sample one.
+        np.testing.assert_array_equal(result['count'], [6, 6])
+        np.testing.assert_allclose(result['sum'], np.nansum(block, axis=0))
+        np.testing.assert_allclose(result['mean'], np.nanmean(block, axis=0))
+        np.testing.assert_allclose(result['variance'], np.nanvar(block, axis=0, ddof=1))
+        np.testing.assert_allclose(result['std'], np.nanstd(block, axis=0, ddof=1))
+        np.testing.assert_array_equal(result['min'], np.nanmin(block, axis=0))
+        np.testing.assert_array_equal(result['max'], np.nanmax(block, axis=0))
+
+        quantiles = np.nanquantile(block, [.25, .5, .75], axis=0)
+        for label, expected in zip(['25%', '50%', '75%'], quantiles):
+            np.testing.assert_allclose(result[label], expected)
+
+        self.assertEqual(result['unique'].tolist(), [6, 5])
+
+
+    def test_ft_statistics_percentiles(self):
+        """
+        Test that exact percentiles do not depend on the number of unique values being requested.
+        """
+
+        rng = np.random.default_rng(42)
+        block = rng.integers(0, 50, size=(101, 4)).astype(np.float64)
+        block[rng.random(block.shape) < .2] = np.nan
+
+        percentiles = [0, .1, .25, .5, .75, .9, 1]
+
+        partitioned = ft_statistics(block, percentiles)
+        sorted_ = ft_statistics(block, percentiles, unique=True)
+        expected = np.nanquantile(block, percentiles, axis=0)
+
+        for percentile, values in zip(percentiles, expected):
+            label = f'{percentile * 100:g}%'
+            np.testing.assert_array_equal(partitioned[label], sorted_[label])
+            np.testing.assert_allclose(partitioned[label], values)
+
+
+    def test_ft_parallel_statistics(self):
+        """
+        Test that the statistics calculated across processes are identical to the serial ones.
+        """
+
+        rng = np.random.default_rng(42)
+        block = rng.normal(size=(5000, 5))
+        block[rng.random(block.shape) < .1] = np.nan
+
+        options = {'percentiles': [.25, .5, .75], 'unique': True}
+
+        expected = ft_statistics(block, **options)
+        result = ft_parallel_statistics(block, 2, **options)
+
+        self.assertEqual(result.keys(), expected.keys())
+        for name, values in expected.items():
+            np.testing.assert_array_equal(result[name], values, err_msg=name)
+
+
+    def test_ft_grouped_statistics(self):
+        """
+        Test that the grouped statistics match the statistics of each group.
+        """
+
+        rng = np.random.default_rng(42)
+        block = rng.integers(0, 30, size=(500, 3)).astype(np.float64)
+        block[rng.random(block.shape) < .1] = np.nan
+        groups = rng.integers(-1, 4, size=500)
+
+        options = {'percentiles': [.25, .5, .75], 'unique': True}
+        result = ft_grouped_statistics(block, groups, **options)
+
+        for group in range(4):
+            expected = ft_statistics(block[groups == group], **options)
+
+            for name, values in expected.items():
+                np.testing.assert_allclose(result[name][group], values, err_msg=name)
+
+
+    def test_statistics_accumulator(self):
+        """
+        Test that merged chunks give the statistics of the whole block.
+        """
+
+        rng = np.random.default_rng(42)
+        block = rng.normal(1e4, 25, size=(1000, 3))
+        block[rng.random(block.shape) < .1] = np.nan
+        block[:, 2] = np.nan
+
+        first = StatisticsAccumulator(3)
+        for chunk in np.array_split(block[:400], 7):
+            first.update(chunk)
+
+        second = StatisticsAccumulator(3)
+        second.update(block[400:])
+        first.merge(second)
+
+        result = first.statistics()
+        expected = ft_statistics(block)
+
+        for name, values in expected.items():
+            np.testing.assert_allclose(result[name], values, rtol=1e-9, err_msg=name)
+
+
+    def test_statistics_accumulator_percentiles(self):
+        """
+        Test that the accumulator estimates percentiles with sketches.
+        """
+
+        block = np.arange(10_000, dtype=np.float64).reshape(-1, 2)
+
+        accumulator = StatisticsAccumulator(2, [.5])
+        for chunk in np.array_split(block, 9):
+            accumulator.update(chunk)
+
+        result = accumulator.statistics()['50%']
+        np.testing.assert_allclose(result, np.median(block, axis=0), rtol=.02)
+
 
 if __name__ == '__main__':
     unittest.main(verbosity=2)
@@ -0,0 +1,171 @@
+"""
+This module contains the tests for the optimizers and the schedules of the learning rate.
+"""
+# pylint:disable=duplicate-code
+
+import unittest
+import numpy as np
+
+from dslr.model.logreg_batch import LogRegBatch
+from dslr.model.logreg_minibatch import LogRegMiniBatch
+from dslr.model.logreg_stochastic import LogRegStochastic
+from dslr.model.optimizer import (
+    Adam,
+    CosineAnnealing,
+    InverseTimeDecay,
+    Momentum,
+    StepDecay,
+    get_optimizer,
+    get_schedule,
+)
+
+class TestOptimizer(unittest.TestCase):
+    """
+    This class contains the tests for the optimizers and the schedules of the learning rate.
+    """
+
+    def setUp(self):
+        rng = np.random.default_rng(42)
+        self.x = rng.normal(size=(200, 3))
+        labels = np.argmax(self.x @ rng.normal(size=(3, 4)) + rng.normal(size=(200, 4)), axis=1)
+        self.y = np.eye(4)[labels]
+
+        self.gradient = np.array([.5, -2., 0.]), np.array(1.)
+
+
+    def test_sgd(self):
+        """
+        Test that plain gradient descent updates the weights with the gradient as it is.
+        """
+
+        delta_weight, delta_bias = get_optimizer('sgd').direction(*self.gradient)
+
+        np.testing.assert_array_equal(delta_weight, self.gradient[0])
+        np.testing.assert_array_equal(delta_bias, self.gradient[1])
+
+
+    def test_momentum(self):
+        """
+        Test that momentum adds up the gradients, decayed by the momentum.
+        """
+
+        optimizer = get_optimizer('momentum')
+        optimizer.direction(*self.gradient)
+        delta_weight, delta_bias = optimizer.direction(*self.gradient)
+
+        np.testing.assert_allclose(delta_weight, 1.9 * self.gradient[0])
+        np.testing.assert_allclose(delta_bias, 1.9 * self.gradient[1])
+
+        optimizer = get_optimizer('nesterov')
+        delta_weight, _ = optimizer.direction(*self.gradient)
+
+        np.testing.assert_allclose(delta_weight, 1.9 * self.gradient[0])
+
+
+    def test_adaptive(self):
+        """
+        Test that the first update of AdaGrad and Adam has the same size for every weight.
+        """
+
+        for name in ('adagrad', 'adam'):
+            delta_weight, delta_bias = get_optimizer(name).direction(*self.gradient)
+
+            np.testing.assert_allclose(delta_weight, np.sign(self.gradient[0]), atol=1e-7)
+            np.testing.assert_allclose(delta_bias, 1, atol=1e-7)
+
+
+    def test_get_optimizer(self):
+        """
+        Test that an optimizer is copied without its state, so that fits never share it.
+        """
+
+        optimizer = Adam(beta1=.5)
+        optimizer.direction(*self.gradient)
+
+        fresh = get_optimizer(optimizer)
+
+        self.assertIsNot(fresh, optimizer)
+        self.assertEqual(fresh.beta1, .5)
+        self.assertEqual(fresh.state(), {})
+        self.assertNotEqual(optimizer.state(), {})
+
+        with self.assertRaises(ValueError):
+            get_optimizer('newton')
+
+
+    def test_schedules(self):
+        """
+        Test the factor of the learning rate of each schedule.
+        """
+
+        self.assertEqual(StepDecay()(24, 100), 1)
+        self.assertEqual(StepDecay()(25, 100), .5)
+        self.assertEqual(StepDecay(10, .1)(20, 100), .1 ** 2)
+
+        self.assertEqual(CosineAnnealing()(0, 100), 1)
+        self.assertAlmostEqual(CosineAnnealing()(50, 100), .5)
+        self.assertAlmostEqual(CosineAnnealing(.1)(100, 100), .1)
+
+        self.assertEqual(InverseTimeDecay()(0, 100), 1)
+        self.assertAlmostEqual(InverseTimeDecay()(100, 100), 1 / 11)
+
+        self.assertIsInstance(get_schedule('inverse-time'), InverseTimeDecay)
+        self.assertIsNone(get_schedule(None))
+
+        with self.assertRaises(ValueError):
+            get_schedule('linear')
+
+
+    def test_default(self):
+        """
+        Test that the models default to plain gradient descent with a constant learning rate.
+        """
+
+        model = LogRegBatch(epochs=50)
+        model.fit(self.x, self.y)
+
+        expected = LogRegBatch(epochs=50, optimizer=get_optimizer('sgd'),
+                               schedule=lambda epoch, epochs: 1)
+        expected.fit(self.x, self.y)
+
+        np.testing.assert_array_equal(model.weights, expected.weights)
+        np.testing.assert_array_equal(model.bias, expected.bias)
+
+
+    def test_convergence(self):
+        """
+        Test that the adaptive optimizers reach a lower loss than gradient descent
+        in as many epochs.
+        """
+
+        for model in (LogRegBatch, LogRegMiniBatch, LogRegStochastic):
+            y = self.y if model.fused else self.y[:, 0]
+
+            baseline = model(epochs=100)
+            baseline.fit(self.x, y)
+
+            for optimizer in ('momentum', 'nesterov', 'adam'):
+                accelerated = model(epochs=100, optimizer=optimizer, schedule='cosine')
+                accelerated.fit(self.x, y)
+
+                self.assertLess(np.mean(accelerated.loss(self.x, y)),
+                                np.mean(baseline.loss(self.x, y)), (model, optimizer))
+
+
+    def test_ovr(self):
+        """
+        Test that the models of each class start from an optimizer of their own.
+        """
+
+        optimizer = Momentum()
+        models = LogRegStochastic.fit_ovr(self.x, self.y, epochs=100, optimizer=optimizer)
+
+        expected = LogRegStochastic(epochs=100, optimizer='momentum')
+        expected.fit(self.x, self.y[:, 3])
+
+        np.testing.assert_array_equal(models[3].weights, expected.weights)
+        self.assertEqual(optimizer.state(), {})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -2,10 +2,16 @@
 Test the One-vs-Rest classifier.
 """
 
+import os
+import tempfile
 import unittest
+from unittest import mock
 import numpy as np
+import pandas as pd
 from dslr.model.ovr import OvrClassifier
 from dslr.model.logreg_batch import LogRegBatch
+from dslr.model.logreg_stochastic import LogRegStochastic
+from dslr.preprocessing import Preprocessing
 
 class TestOvrClassifier(unittest.TestCase):
     """
@@ -36,5 +42,213 @@ class TestOvrClassifier(unittest.TestCase):
         predictions = self.ovr.predict(self.x)
         self.assertEqual(predictions.shape, (2, 3))
 
+
+    def test_predict_batch(self):
+        """
+        Test predicting every row at once gives the per-row predictions.
+        """
+
+        self.ovr.fit(self.x, self.y)
+        predictions = self.ovr.predict_batch(self.x)
+
+        self.assertEqual(predictions.shape, (3, 2))
+        for value, prediction in zip(self.x, predictions):
+            expected = [model.predict(value) for model in self.ovr.models]
+            np.testing.assert_allclose(prediction, expected)
+            np.testing.assert_allclose(prediction, self.ovr.predict(value))
+
+
+    def test_predict_labels(self):
+        """
+        Test predicting the label of every row.
+        """
+
+        self.ovr.fit(self.x, self.y)
+        labels = self.ovr.predict_labels(self.x, ['A', 'B'])
+
+        expected = [['A', 'B'][np.argmax(self.ovr.predict(value))] for value in self.x]
+        np.testing.assert_array_equal(labels, expected)
+
+
+
+    def test_predict_batch_preprocessing(self):
+        """
+        Test that a classifier with a preprocessing predicts from the raw features.
+        """
+
+        raw = np.array([[10.0, np.nan], [30.0, 40.0], [np.nan, 60.0]])
+        preprocessing = Preprocessing.fit(pd.DataFrame(raw, columns=['a', 'b']))
+        x = preprocessing.transform(raw)
+
+        self.ovr.fit(x, self.y)
+        expected = self.ovr.predict_batch(x)
+
+        self.ovr.preprocessing = preprocessing
+        np.testing.assert_allclose(self.ovr.predict_batch(raw), expected)
+        np.testing.assert_allclose(self.ovr.predict(raw), expected.T)
+        np.testing.assert_allclose(self.ovr.predict(raw[0]), expected[0])
+
+
+    def test_predict_batch_fused_once(self):
+        """
+        Test that the preprocessing is fused into the weights once, until it changes.
+        """
+
+        raw = np.array([[10.0, 20.0], [30.0, 40.0], [50.0, 60.0]])
+        self.ovr.fit(self.x, self.y)
+        self.ovr.preprocessing = Preprocessing(['a', 'b'], np.zeros(2), np.array([50., 60.]))
+
+        with mock.patch.object(Preprocessing, 'fuse', autospec=True,
+                               side_effect=Preprocessing.fuse) as fuse:
+            expected = self.ovr.predict_batch(raw)
+            self.ovr.predict(raw[0])
+            np.testing.assert_array_equal(self.ovr.predict_batch(raw), expected)
+
+        fuse.assert_called_once()
+
+        self.ovr.preprocessing = Preprocessing(['a', 'b'], np.zeros(2), np.array([100., 30.]))
+        self.assertFalse(np.allclose(self.ovr.predict_batch(raw), expected))
+
+        self.ovr.preprocessing = None
+        expected = [model.predict(self.x[0]) for model in self.ovr.models]
+        np.testing.assert_allclose(self.ovr.predict_batch(self.x)[0], expected)
+
+
+    def test_partial_fit(self):
+        """
+        Test updating the model one chunk at a time.
+        """
+
+        for _ in range(2):
+            self.ovr.partial_fit(self.x[:2], self.y[:2])
+            self.ovr.partial_fit(self.x[2:], self.y[2:])
+
+        self.assertEqual(len(self.ovr.models), 2)
+        np.testing.assert_array_equal(self.ovr.models[0].stopped_epoch, 4)
+
+        expected = OvrClassifier(LogRegBatch)
+        for _ in range(2):
+            expected.partial_fit(self.x[:2], self.y[:2])
+            expected.partial_fit(self.x[2:], self.y[2:])
+
+        np.testing.assert_array_equal(self.ovr.predict_batch(self.x),
+                                      expected.predict_batch(self.x))
+
+
+    def test_partial_fit_per_class(self):
+        """
+        Test updating models which are not fused, one class at a time.
+        """
+
+        ovr = OvrClassifier(LogRegStochastic, epochs=3)
+        ovr.partial_fit(self.x, self.y)
+
+        expected = OvrClassifier(LogRegStochastic, epochs=3)
+        expected.fit(self.x, self.y)
+
+        np.testing.assert_allclose(ovr.predict_batch(self.x), expected.predict_batch(self.x))
+
+
+    def test_warm_start(self):
+        """
+        Test that the models start from the weights of another classifier,
+        rescaled to the preprocessing of this one.
+        """
+
+        raw = np.array([[10.0, 20.0], [30.0, 40.0], [50.0, 60.0]])
+        self.ovr.preprocessing = Preprocessing(['a', 'b'], np.zeros(2), np.array([50., 60.]))
+        self.ovr.fit(self.ovr.preprocessing.transform(raw), self.y)
+
+        for model in [LogRegBatch, LogRegStochastic]:
+            ovr = OvrClassifier(model, epochs=0)
+            ovr.preprocessing = Preprocessing(['a', 'b'], np.zeros(2), np.array([100., 30.]))
+            ovr.warm_start(self.ovr)
+            ovr.fit(ovr.preprocessing.transform(raw), self.y)
+
+            np.testing.assert_allclose(ovr.predict_batch(raw), self.ovr.predict_batch(raw))
+
+
+    def test_warm_start_partial_fit(self):
+        """
+        Test that updating the model one chunk at a time starts from the other classifier.
+        """
+
+        self.ovr.fit(self.x, self.y)
+
+        ovr = OvrClassifier(LogRegBatch)
+        ovr.warm_start(self.ovr)
+        ovr.partial_fit(self.x, self.y)
+
+        expected = OvrClassifier(LogRegBatch, epochs=1)
+        expected.warm_start(self.ovr)
+        expected.fit(self.x, self.y)
+
+        np.testing.assert_allclose(ovr.predict_batch(self.x), expected.predict_batch(self.x))
+
+
+    def test_warm_start_invalid(self):
+        """
+        Test that a classifier cannot start from a classifier of other classes or features.
+        """
+
+        self.ovr.fit(self.x, self.y)
+        self.ovr.preprocessing = Preprocessing(['a', 'b'], np.zeros(2), np.ones(2))
+
+        other = OvrClassifier(LogRegBatch)
+        other.classes = ['A', 'B']
+        with self.assertRaises(ValueError):
+            other.warm_start(self.ovr)
+
+        other = OvrClassifier(LogRegBatch)
+        other.preprocessing = Preprocessing(['a', 'c'], np.zeros(2), np.ones(2))
+        other.warm_start(self.ovr)
+        with self.assertRaises(ValueError):
+            other.fit(self.x, self.y)
+
+
+    def test_save_load(self):
+        """
+        Test that the models are saved and loaded with their preprocessing.
+        """
+
+        self.ovr.fit(self.x, self.y)
+        self.ovr.preprocessing = Preprocessing(['a', 'b'], np.array([1., 2.]), np.array([3., 4.]))
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'model.json')
+            self.ovr.save_models(path)
+
+            loaded = OvrClassifier(LogRegBatch)
+            loaded.load_models(path)
+
+        self.assertEqual(loaded.preprocessing.features, ['a', 'b']) # type: ignore
+        np.testing.assert_allclose(loaded.predict_batch(self.x), self.ovr.predict_batch(self.x))
+
+
+
+    def test_save_load_binary(self):
+        """
+        Test that the models are saved and loaded in the binary format.
+        """
+
+        self.ovr.fit(self.x, self.y)
+        self.ovr.classes = ['A', 'B']
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'model.npz')
+            self.ovr.save_models(path)
+
+            loaded = OvrClassifier(LogRegBatch)
+            loaded.load_models(path)
+
+            self.assertEqual(loaded.classes, ['A', 'B'])
+            self.assertIsNone(loaded.preprocessing)
+            np.testing.assert_array_equal(
+                loaded.predict_batch(self.x),
+                self.ovr.predict_batch(self.x)
+            )
+
+            del loaded
+
 if __name__ == '__main__':
     unittest.main()
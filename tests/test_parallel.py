@@ -0,0 +1,84 @@
+"""
+Test fitting the One-vs-Rest models in a pool of processes.
+"""
+# pylint:disable=duplicate-code
+
+import unittest
+from unittest import mock
+import numpy as np
+from dslr import parallel
+from dslr.model import pool
+from dslr.model.logreg_stochastic import LogRegStochastic
+from dslr.model.logreg_newton import LogRegNewton
+from dslr.model.ovr import OvrClassifier
+
+class TestParallel(unittest.TestCase):
+    """
+    Test fitting the One-vs-Rest models in a pool of processes.
+    """
+
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.x = rng.normal(size=(60, 3))
+        self.y = np.eye(3)[rng.integers(0, 3, 60)]
+
+
+    def test_fit_parallel(self):
+        """
+        Test that the models fitted in parallel are the models fitted one after another.
+        """
+
+        sequential = LogRegStochastic.fit_ovr(self.x, self.y, epochs=500)
+        models = LogRegStochastic.fit_ovr(self.x, self.y, n_jobs=2, epochs=500)
+
+        self.assertEqual(len(models), 3)
+        for model, expected in zip(models, sequential):
+            np.testing.assert_allclose(model.weights, expected.weights)
+            self.assertAlmostEqual(model.bias, expected.bias)
+            self.assertFalse(hasattr(model, 'x'))
+
+
+    def test_ovr(self):
+        """
+        Test that the classifier passes `n_jobs` to the models.
+        """
+
+        ovr = OvrClassifier(LogRegStochastic, n_jobs=2, epochs=500)
+
+        with mock.patch.object(pool, 'fit_parallel', wraps=pool.fit_parallel) as fit:
+            ovr.fit(self.x, self.y)
+
+        fit.assert_called_once()
+        self.assertEqual(ovr.predict_batch(self.x).shape, (60, 3))
+
+
+    def test_fused(self):
+        """
+        Test that fused models are fitted once, whatever `n_jobs`, with a warning.
+        """
+
+        with mock.patch.object(pool, 'fit_parallel') as fit, \
+             self.assertLogs(level='WARNING') as logs:
+            models = LogRegNewton.fit_ovr(self.x, self.y, n_jobs=2)
+
+        fit.assert_not_called()
+        self.assertIn('n_jobs is ignored', logs.output[0])
+        self.assertEqual(len(models), 3)
+
+
+    def test_resolve_jobs(self):
+        """
+        Test the number of processes.
+        """
+
+        with mock.patch.object(parallel, 'cpu_count', return_value=8):
+            self.assertEqual(parallel.resolve_jobs(3), 3)
+            self.assertEqual(parallel.resolve_jobs(-1), 8)
+            self.assertEqual(parallel.resolve_jobs(-2), 7)
+            self.assertEqual(parallel.resolve_jobs(-20), 1)
+
+        with self.assertRaises(ValueError):
+            parallel.resolve_jobs(0)
+
+if __name__ == '__main__':
+    unittest.main()
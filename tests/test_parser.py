@@ -8,7 +8,7 @@ import pandas as pd
 import pandas.testing as pd_testing
 
 from dslr.parser import Parser
-from dslr.hogwarts import HOGWARTS_COURSES
+from dslr.hogwarts import HOGWARTS_COURSES, HOGWARTS_HOUSES
 
 class TestParser(unittest.TestCase):
     """
@@ -81,6 +81,69 @@ class TestParser(unittest.TestCase):
         pd_testing.assert_frame_equal(df, pd.DataFrame({'a': [1.0], 'b': [2.0]}))
 
 
+    @patch('sys.argv', ['dslr', 'test.csv', '--no-cache'])
+    @patch('builtins.open', new_callable=mock_open,
+           read_data='Index,Hogwarts House,Best Hand,Arithmancy,Flying\n0,Ravenclaw,Left,1,2\n')
+    def test_parse_dataset_columns(self, _):
+        """
+        Test the case when only some columns are read, with the types of the schema.
+        """
+
+        df = self.parser.read_dataset(['Flying', 'Hogwarts House'], float_dtype='float32')
+
+        self.assertEqual(list(df.columns), ['Hogwarts House', 'Flying'])
+        self.assertEqual(df['Flying'].dtype, 'float32')
+        self.assertEqual(list(df['Hogwarts House'].cat.categories), HOGWARTS_HOUSES)
+
+
+    @patch('sys.argv', ['dslr', 'test.csv'])
+    @patch('builtins.open', new_callable=mock_open, read_data='a,b\n1.0,2.0\n3.0,4.0\n5.0,6.0\n')
+    def test_parse_dataset_chunks(self, _):
+        """
+        Test the case when the dataset is read in chunks.
+        """
+
+        chunks = list(self.parser.read_dataset_chunks(2))
+
+        self.assertEqual([len(chunk) for chunk in chunks], [2, 1])
+        pd_testing.assert_frame_equal(
+            pd.concat(chunks),
+            pd.DataFrame({'a': [1.0, 3.0, 5.0], 'b': [2.0, 4.0, 6.0]})
+        )
+
+
+    @patch('sys.argv', ['dslr', 'test.csv'])
+    @patch('builtins.open', side_effect=FileNotFoundError)
+    def test_parse_dataset_chunks_not_found(self, _):
+        """
+        Test the case when the file to read in chunks is not found.
+        """
+
+        with self.assertRaises(SystemExit) as cm:
+            list(self.parser.read_dataset_chunks(2))
+
+        self.assertEqual(cm.exception.code, 1)
+
+
+    def test_get_features(self):
+        """
+        Test getting the features, in the order asked for.
+        """
+
+        df = pd.DataFrame({
+            'Index': [0], 'Hogwarts House': [''], 'First Name': [''], 'Last Name': [''],
+            'Birthday': [''], 'Best Hand': [''], 'a': [1.0], 'b': [2.0],
+        })
+
+        self.assertEqual(list(Parser.get_features(df).columns), ['a', 'b'])
+        self.assertEqual(list(Parser.get_features(df, ['b', 'a']).columns), ['b', 'a'])
+
+        with self.assertRaises(SystemExit) as cm:
+            Parser.get_features(df, ['c'])
+
+        self.assertEqual(cm.exception.code, 1)
+
+
     @patch('sys.argv', ['dslr', 'test.csv'])
     def test_parse_course_arguments_none(self):
         """
@@ -0,0 +1,91 @@
+"""
+This module contains the tests for the prediction server.
+"""
+
+import asyncio
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from dslr.model.logreg_batch import LogRegBatch
+from dslr.model.ovr import OvrClassifier
+from dslr.preprocessing import Preprocessing
+from load_generator import generate_load, send_request
+from predict_server import PredictServer
+
+class TestPredictServer(unittest.IsolatedAsyncioTestCase):
+    """
+    This class contains the tests for the prediction server.
+    """
+
+    async def asyncSetUp(self):
+        features = pd.DataFrame({'a': [1., 3., 5., 7.], 'b': [2., np.nan, 6., 8.]})
+
+        self.ovr = OvrClassifier(LogRegBatch, epochs=1000)
+        self.ovr.classes = ['x', 'y']
+        self.ovr.preprocessing = Preprocessing.fit(features)
+        self.ovr.fit(self.ovr.preprocessing.transform(features.to_numpy()),
+                     np.array([[0, 1], [1, 0], [0, 1], [1, 0]]))
+
+        self.server = PredictServer(self.ovr, 8, max_wait=.001)
+        self.listening = await self.server.start('127.0.0.1', 0)
+        self.port = self.listening.sockets[0].getsockname()[1]
+
+
+    async def asyncTearDown(self):
+        self.listening.close()
+        await self.listening.wait_closed()
+        await self.server.batcher.stop()
+
+
+    async def request(self, method, path, body=None):
+        """
+        Send one request to the server.
+        """
+
+        reader, writer = await asyncio.open_connection('127.0.0.1', self.port)
+        try:
+            return await send_request(reader, writer, method, path, body)
+        finally:
+            writer.close()
+
+
+    async def test_predict(self):
+        """
+        Test predicting the house of a student, with missing features imputed.
+        """
+
+        status, response = await self.request('POST', '/predict', {'a': 3, 'b': None})
+
+        expected = self.ovr.predict_batch(np.array([[3, np.nan]]))[0]
+        self.assertEqual(status, 200)
+        self.assertEqual(response['house'], ['x', 'y'][int(np.argmax(expected))])
+        np.testing.assert_allclose(list(response['probabilities'].values()), expected)
+
+
+    async def test_errors(self):
+        """
+        Test that invalid requests are answered with an error.
+        """
+
+        self.assertEqual((await self.request('POST', '/predict', [1, 2]))[0], 400)
+        self.assertEqual((await self.request('POST', '/predict', {'a': 'one'}))[0], 400)
+        self.assertEqual((await self.request('GET', '/predict'))[0], 405)
+        self.assertEqual((await self.request('GET', '/unknown'))[0], 404)
+
+
+    async def test_load(self):
+        """
+        Test that concurrent requests are batched, and counted in the metrics.
+        """
+
+        rows = [{'a': 1, 'b': 2}, {'a': 5, 'b': None}]
+        result = await generate_load('127.0.0.1', self.port, rows, concurrency=8, total=200)
+
+        self.assertEqual(result['requests'], 200)
+        self.assertEqual(result['server']['requests'], 200)
+        self.assertLess(result['server']['batches'], 200)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,82 @@
+"""
+This module contains the tests for the Preprocessing class.
+"""
+
+import unittest
+
+import numpy as np
+import pandas as pd
+from sklearn.preprocessing import normalize
+
+from dslr.preprocessing import Preprocessing
+
+class TestPreprocessing(unittest.TestCase):
+    """
+    This class contains the tests for the Preprocessing class.
+    """
+
+    def setUp(self):
+        rng = np.random.default_rng(0)
+
+        values = rng.normal(scale=10, size=(50, 4))
+        values[rng.random(values.shape) < .2] = np.nan
+        values[:, 3] = 0
+
+        self.df = pd.DataFrame(values, columns=['a', 'b', 'c', 'd'])
+
+
+    def test_transform(self):
+        """
+        Test that the features are imputed with their mean, then max-normalized.
+        """
+
+        preprocessing = Preprocessing.fit(self.df)
+        expected = normalize(self.df.fillna(self.df.mean()), axis=0, norm='max')
+
+        self.assertEqual(preprocessing.features, ['a', 'b', 'c', 'd'])
+        np.testing.assert_allclose(preprocessing.transform(self.df.to_numpy()), expected)
+
+
+    def test_fit_chunks(self):
+        """
+        Test that the preprocessing of a dataset read in chunks is the one of the whole dataset.
+        """
+
+        preprocessing = Preprocessing.fit(self.df)
+        chunked = Preprocessing.fit_chunks([self.df[:20], self.df[20:21], self.df[21:]])
+
+        np.testing.assert_allclose(chunked.means, preprocessing.means)
+        np.testing.assert_array_equal(chunked.scale, preprocessing.scale)
+
+
+    def test_fuse(self):
+        """
+        Test that fused weights score imputed features like the weights score preprocessed ones.
+        """
+
+        preprocessing = Preprocessing.fit(self.df)
+        x = self.df.to_numpy()
+
+        weights, bias = np.arange(8.0).reshape(4, 2), np.array([1.0, -1.0])
+        fused_weights, fused_bias = preprocessing.fuse(weights, bias)
+
+        np.testing.assert_allclose(
+            preprocessing.impute(x) @ fused_weights + fused_bias,
+            preprocessing.transform(x) @ weights + bias
+        )
+
+
+    def test_to_dict(self):
+        """
+        Test that the preprocessing can be saved and loaded.
+        """
+
+        preprocessing = Preprocessing.fit(self.df)
+        loaded = Preprocessing.from_dict(preprocessing.to_dict())
+
+        self.assertEqual(loaded.features, preprocessing.features)
+        np.testing.assert_array_equal(loaded.means, preprocessing.means)
+        np.testing.assert_array_equal(loaded.scale, preprocessing.scale)
+
+if __name__ == '__main__':
+    unittest.main()
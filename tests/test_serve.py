@@ -0,0 +1,123 @@
+"""
+This module contains the tests for the daemon.
+"""
+
+import os
+import stat
+import tempfile
+import threading
+import unittest
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+
+from describe import describe
+from dslr.cache import CACHE_DIRECTORY_VARIABLE
+from dslr.client import ServerError, request
+from dslr.model.logreg_newton import LogRegNewton
+from dslr.model.ovr import OvrClassifier
+from dslr.parser import Parser
+from dslr.preprocessing import Preprocessing
+from serve import DslrServer
+
+DATASET = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                       'datasets', 'dataset_train.csv')
+
+class TestServe(unittest.TestCase):
+    """
+    This class contains the tests for the daemon.
+    """
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory() # pylint: disable=consider-using-with
+        self.socket = os.path.join(self.directory.name, 'dslr.sock')
+        self.model = os.path.join(self.directory.name, 'model.json')
+
+        # The daemon reads the datasets through the cache, kept out of the user's cache.
+        cache = os.path.join(self.directory.name, 'cache')
+        environment = mock.patch.dict(os.environ, {CACHE_DIRECTORY_VARIABLE: cache})
+        environment.start()
+        self.addCleanup(environment.stop)
+
+        self.df = pd.read_csv(DATASET, dtype=Parser.schema())
+
+        features = Parser.get_features(self.df)
+        ovr = OvrClassifier(LogRegNewton)
+        ovr.preprocessing = Preprocessing.fit(features)
+        ovr.fit(ovr.preprocessing.transform(features.to_numpy()), Parser.get_y(self.df))
+        ovr.save_models(self.model)
+
+        self.server = DslrServer(self.socket, 2 ** 30)
+        self.thread = threading.Thread(target=self.server.serve_forever)
+        self.thread.start()
+
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self.thread.join()
+
+        self.directory.cleanup()
+
+
+    def test_permissions(self):
+        """
+        Test that only the user can connect to the socket, and that the umask is restored.
+        """
+
+        self.assertEqual(stat.S_IMODE(os.stat(self.socket).st_mode), 0o600)
+
+        umask = os.umask(0)
+        os.umask(umask)
+        self.assertNotEqual(umask, 0o177)
+
+
+    def test_describe(self):
+        """
+        Test describing a dataset.
+        """
+
+        response = request('describe', self.socket, dataset=DATASET)
+        self.assertEqual(response['output'], str(describe(self.df)))
+
+
+    def test_predict(self):
+        """
+        Test predicting the houses of a dataset, with the dataset and model kept in memory.
+        """
+
+        for _ in range(2):
+            response = request('predict', self.socket, dataset=DATASET, model=self.model,
+                               model_type='newton')
+
+        self.assertEqual(response['index'], list(range(len(self.df))))
+        self.assertGreater(np.mean(np.array(response['houses']) == self.df['Hogwarts House']), .9)
+
+        stats = request('stats', self.socket)
+        self.assertEqual((stats['entries'], stats['hits'], stats['misses']), (2, 2, 2))
+
+
+    def test_accuracy(self):
+        """
+        Test computing the accuracy of a model.
+        """
+
+        response = request('accuracy', self.socket, dataset=DATASET, model=self.model,
+                           model_type='newton')
+        self.assertGreater(response['accuracy'], .9)
+
+
+    def test_error(self):
+        """
+        Test that errors are sent back to the client.
+        """
+
+        with self.assertRaises(ServerError):
+            request('accuracy', self.socket, dataset='missing.csv', model=self.model)
+
+        with self.assertRaises(ServerError):
+            request('unknown', self.socket)
+
+if __name__ == '__main__':
+    unittest.main()
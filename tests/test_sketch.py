@@ -0,0 +1,161 @@
+"""
+Test the mergeable sketches.
+"""
+
+import unittest
+
+import numpy as np
+
+from dslr.sketch import HyperLogLog, QuantileSketch
+
+
+class TestQuantileSketch(unittest.TestCase):
+    """
+    Test the KLL quantile sketch.
+    """
+
+    def setUp(self):
+        """
+        Set up the test data.
+        """
+
+        rng = np.random.default_rng(42)
+        self.values = rng.normal(size=100_000)
+        self.quantiles = np.linspace(0, 1, 21)
+
+
+    def rank_error(self, sketch: QuantileSketch) -> float:
+        """
+        Compute the largest rank error of the sketch over the tested quantiles.
+        """
+
+        estimates = sketch.quantiles(self.quantiles)
+        ranks = np.searchsorted(np.sort(self.values), estimates) / self.values.size
+
+        return float(np.max(np.abs(ranks - self.quantiles)))
+
+
+    def test_quantiles(self):
+        """
+        Test that the quantiles are within the documented error.
+        """
+
+        sketch = QuantileSketch()
+        for chunk in np.array_split(self.values, 13):
+            sketch.update(chunk)
+
+        self.assertEqual(sketch.count, self.values.size)
+        self.assertLess(self.rank_error(sketch), .013)
+
+
+    def test_bounded_memory(self):
+        """
+        Test that the number of kept values does not grow with the stream.
+        """
+
+        sketch = QuantileSketch(k=100)
+        sketch.update(self.values)
+
+        kept = sum(compactor.size for compactor in sketch.compactors)
+        self.assertLess(kept, 4 * sketch.k)
+
+
+    def test_merge(self):
+        """
+        Test that merged sketches are within the documented error.
+        """
+
+        sketches = [QuantileSketch(seed=seed) for seed in range(4)]
+        for sketch, chunk in zip(sketches, np.array_split(self.values, 4)):
+            sketch.update(chunk)
+
+        for sketch in sketches[1:]:
+            sketches[0].merge(sketch)
+
+        self.assertEqual(sketches[0].count, self.values.size)
+        self.assertLess(self.rank_error(sketches[0]), .013)
+
+
+    def test_nan(self):
+        """
+        Test that NaN values are ignored.
+        """
+
+        sketch = QuantileSketch()
+        self.assertTrue(np.isnan(sketch.quantiles([.5])[0]))
+
+        sketch.update(np.array([np.nan, 1.0, 2.0, 3.0, np.nan]))
+        self.assertEqual(sketch.count, 3)
+        self.assertEqual(sketch.quantiles([.5])[0], 2.0)
+
+
+class TestHyperLogLog(unittest.TestCase):
+    """
+    Test the HyperLogLog cardinality estimator.
+    """
+
+    def setUp(self):
+        """
+        Set up the test data.
+        """
+
+        rng = np.random.default_rng(42)
+        self.values = rng.normal(size=200_000).round(4)
+        self.unique = np.unique(self.values).size
+
+
+    def test_estimate(self):
+        """
+        Test that the estimate is within three standard errors.
+        """
+
+        estimator = HyperLogLog()
+        for chunk in np.array_split(self.values, 11):
+            estimator.update(chunk)
+
+        error = 1.04 / np.sqrt(2 ** estimator.precision)
+        self.assertAlmostEqual(estimator.estimate() / self.unique, 1, delta=3 * error)
+
+
+    def test_small_cardinality(self):
+        """
+        Test that small cardinalities are estimated almost exactly.
+        """
+
+        estimator = HyperLogLog()
+        estimator.update(np.array([1.0, 2.0, 2.0, 3.0, -0.0, 0.0, np.nan, np.nan]))
+
+        self.assertEqual(round(estimator.estimate()), 6)
+
+
+    def test_merge(self):
+        """
+        Test that merging gives the same registers as a single estimator.
+        """
+
+        estimators = [HyperLogLog() for _ in range(3)]
+        for estimator, chunk in zip(estimators, np.array_split(self.values, 3)):
+            estimator.update(chunk)
+        for estimator in estimators[1:]:
+            estimators[0].merge(estimator)
+
+        expected = HyperLogLog()
+        expected.update(self.values)
+
+        np.testing.assert_array_equal(estimators[0].registers, expected.registers)
+
+        with self.assertRaises(ValueError):
+            estimators[0].merge(HyperLogLog(12))
+
+
+    def test_precision(self):
+        """
+        Test that an out of range precision is rejected.
+        """
+
+        with self.assertRaises(ValueError):
+            HyperLogLog(4)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,116 @@
+"""
+This module contains the startup time regression tests of the scripts.
+
+Each script is imported with `python -X importtime`, which reports the
+time spent importing every module. The time spent outside of NumPy and
+pandas, which every script needs to read the dataset, must stay within a budget.
+"""
+
+import os
+import subprocess
+import sys
+import unittest
+from typing import Dict, Tuple
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SCRIPTS = [
+    'dslr.parser',
+    'describe',
+    'histogram',
+    'scatter_plot',
+    'pair_plot',
+    'logreg_train',
+    'logreg_predict',
+    'logreg_accuracy',
+]
+
+# The dependencies which are only imported when they are used.
+LAZY_MODULES = ['sklearn', 'scipy', 'matplotlib', 'seaborn']
+
+# The time, in seconds, a script may spend importing modules other than NumPy and pandas.
+STARTUP_BUDGET = 0.2
+
+
+def import_times(module: str) -> Dict[str, Tuple[float, int]]:
+    """
+    Import a module in a new interpreter, and measure the time spent importing each module.
+
+    Args:
+        module (str): The name of the module.
+
+    Returns:
+        Dict[str, Tuple[float, int]]: The cumulative import time of each module,
+            in seconds, and the depth it was imported at.
+    """
+
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True
+    )
+
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+
+        _, cumulative, name = line[len('import time:'):].split('|')
+        depth = len(name) - len(name.lstrip())
+        times[name.strip()] = (int(cumulative) / 1e6, depth)
+
+    return times
+
+
+class TestStartup(unittest.TestCase):
+    """
+    This class contains the startup time regression tests of the scripts.
+    """
+
+    def test_lazy_imports(self):
+        """
+        Test that importing a script does not import the dependencies it may not use.
+        """
+
+        for script in SCRIPTS:
+            with self.subTest(script=script):
+                times = import_times(script)
+
+                for module in LAZY_MODULES:
+                    self.assertNotIn(module, times)
+
+
+    def test_client(self):
+        """
+        Test that the client only imports the standard library.
+        """
+
+        times = import_times('client')
+
+        for module in ['numpy', 'pandas', *LAZY_MODULES]:
+            self.assertNotIn(module, times)
+
+
+    def test_budget(self):
+        """
+        Test that the time spent importing a script, aside from NumPy and pandas,
+        is within the budget.
+        """
+
+        for script in SCRIPTS:
+            with self.subTest(script=script):
+                times = import_times(script)
+                numpy, pandas = times['numpy'], times['pandas']
+
+                elapsed = times[script][0] - pandas[0]
+
+                # NumPy is part of the time of pandas, unless it was imported first.
+                if numpy[1] <= pandas[1]:
+                    elapsed -= numpy[0]
+
+                self.assertLess(elapsed, STARTUP_BUDGET)
+
+if __name__ == '__main__':
+    unittest.main()